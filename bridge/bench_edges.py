@@ -0,0 +1,100 @@
+"""
+Benchmark: vectorized edge engine vs a per-event Python loop
+Run: python bench_edges.py [events_per_league ...]
+
+Synthetic leagues with a Pinnacle line and three soft bookmakers (some
+prices missing) are scored with edge_engine.evaluate() - power de-vig,
+true edges for every soft price and cross-book surebets - and with the
+equivalent row-by-row Python loop. Reports events/s and µs per event.
+"""
+
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+import edge_engine
+
+BOOKMAKERS = ["bet9ja", "betking", "sportybet"]
+TARGET_EVENTS_PER_S = 10_000
+
+
+def synthetic_league(n_events: int, missing: float = 0.05):
+    """Sharp prices with a ~2.5% margin and soft prices scattered around them with a ~7% margin"""
+    sharp = np.empty((n_events, 3))
+    soft = np.empty((n_events, len(BOOKMAKERS), 3))
+    for e in range(n_events):
+        home = random.uniform(0.2, 0.7)
+        draw = random.uniform(0.18, 0.3)
+        probs = np.array([home, draw, max(0.05, 1 - home - draw)])
+        probs /= probs.sum()
+        sharp[e] = 1 / (probs * 1.025)
+        for b in range(len(BOOKMAKERS)):
+            soft[e, b] = 1 / (probs * 1.07 * np.random.uniform(0.93, 1.05, 3))
+    soft[np.random.random(soft.shape) < missing] = np.nan
+    return np.round(soft, 2), np.round(sharp, 2)
+
+
+def python_loop(soft, sharp):
+    """The same maths one event at a time"""
+    value, arbs = 0, 0
+    for e in range(len(sharp)):
+        implied = [1 / p for p in sharp[e]]
+        lo, hi = 0.5, 2.0
+        for _ in range(50):  # bisection on k for the power method
+            k = (lo + hi) / 2
+            if sum(q ** k for q in implied) > 1:
+                lo = k
+            else:
+                hi = k
+        fair = [q ** k for q in implied]
+        best = [0.0, 0.0, 0.0]
+        for b in range(len(BOOKMAKERS)):
+            for s in range(3):
+                price = soft[e][b][s]
+                if math.isnan(price):
+                    continue
+                if price * fair[s] - 1 > 0:
+                    value += 1
+                best[s] = max(best[s], price)
+        if all(best) and sum(1 / p for p in best) < 1:
+            arbs += 1
+    return value, arbs
+
+
+def measure(func, rounds):
+    func()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = func()
+    return (time.perf_counter() - start) / rounds, result
+
+
+def run(sizes):
+    print(f"{'events':>8} {'engine µs/event':>16} {'engine events/s':>16} {'loop events/s':>14} {'speedup':>8}")
+    worst = float("inf")
+    for n in sizes:
+        soft, sharp = synthetic_league(n)
+        soft_list, sharp_list = soft.tolist(), sharp.tolist()
+        rounds = max(3, 20_000 // n)
+
+        def engine():
+            batch = edge_engine.evaluate(soft, sharp, BOOKMAKERS, method="power")
+            return len(batch.value_bets()), len(batch.surebets())
+
+        engine_s, (value, arbs) = measure(engine, rounds)
+        loop_s, loop_result = measure(lambda: python_loop(soft_list, sharp_list), max(1, rounds // 10))
+        assert (value, arbs) == loop_result, f"engine {value, arbs} != loop {loop_result}"
+        rate = n / engine_s
+        worst = min(worst, rate)
+        print(f"{n:>8} {engine_s / n * 1e6:>16.2f} {rate:>16,.0f} {n / loop_s:>14,.0f} {loop_s / engine_s:>7.1f}x")
+    verdict = "✅" if worst >= TARGET_EVENTS_PER_S else "🔴"
+    print(f"\n{verdict} slowest batch: {worst:,.0f} events/s (target {TARGET_EVENTS_PER_S:,})")
+
+
+if __name__ == "__main__":
+    random.seed(7)
+    np.random.seed(7)
+    run([int(a) for a in sys.argv[1:]] or [20, 100, 500, 2000, 10000])
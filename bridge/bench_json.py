@@ -0,0 +1,134 @@
+"""
+Benchmark: dict-based scrape path vs the fast path (fastjson + MatchRecord + direct serialization)
+Run: python bench_json.py [capture.json ...]
+
+Each round takes a raw SportyBet feed body through decode -> per-event
+records -> normalize -> response bytes, the way one scrape + one
+/api/odds/sportybet request does. Without arguments a synthetic feed is
+generated; otherwise pass SportyBet capture files written with CAPTURE_DIR
+(see replay.py) or raw liveOrPrematchEvents bodies.
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+
+import fastjson
+from bench_markets import synthetic_sportybet
+from markets import decode_sportybet
+from records import MatchRecord
+
+
+def synthetic_feed(n_events=2000) -> bytes:
+    events = synthetic_sportybet(n_events)
+    for i, event in enumerate(events):
+        event["homeTeamName"] = f"Club {2 * i} United"
+        event["awayTeamName"] = f"Club {2 * i + 1} City"
+        event["scheduledTime"] = 1793000000000 + i * 3600000
+    tournaments = [{"id": f"sr:tournament:{t}", "events": events[t::4]} for t in range(4)]
+    return json.dumps({"bizCode": 10000, "data": tournaments}).encode()
+
+
+def load_bodies(paths):
+    bodies = []
+    for path in paths:
+        with open(path, "rb") as f:
+            raw = f.read()
+        record = json.loads(raw)
+        # Capture files wrap the decoded body; raw feed bodies are used as-is
+        bodies.append(record["body"].encode() if isinstance(record, dict) and "body" in record else raw)
+    return bodies
+
+
+def legacy_scrape(body: bytes) -> bytes:
+    """response.json() -> dict per event -> normalize copy -> jsonable_encoder -> json.dumps"""
+    feed = json.loads(body)
+    matches = []
+    for tournament in feed.get("data", []):
+        for event in tournament.get("events", []):
+            match = {
+                "id": event.get("id", event.get("eventId", "")),
+                "home_team": event.get("homeTeamName", event.get("home", {}).get("name", "")),
+                "away_team": event.get("awayTeamName", event.get("away", {}).get("name", "")),
+                "kickoff": event.get("scheduledTime", event.get("startTime", "")),
+                "odds": {},
+            }
+            match["markets"] = decode_sportybet(event.get("markets", []))
+            match["odds"] = match["markets"].get("1x2", {})
+            if match["home_team"] and match["odds"].get("home"):
+                matches.append(match)
+    normalized = [
+        {
+            "id": m.get("id"),
+            "home_team": m.get("home_team", ""),
+            "away_team": m.get("away_team", ""),
+            "kickoff": m.get("kickoff", ""),
+            "odds": m.get("odds", {}),
+        }
+        for m in matches
+    ]
+    payload = {"bookmaker": "sportybet", "league": "premierleague", "matches": normalized, "count": len(normalized)}
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_scrape(body: bytes) -> bytes:
+    """fastjson.loads -> MatchRecord per event -> shared by normalize -> fastjson.dumps"""
+    feed = fastjson.loads(body)
+    matches = []
+    for tournament in feed.get("data", []):
+        for event in tournament.get("events", []):
+            markets = decode_sportybet(event.get("markets") or [])
+            match = MatchRecord(
+                event.get("id") or event.get("eventId", ""),
+                event.get("homeTeamName") or (event.get("home") or {}).get("name", ""),
+                event.get("awayTeamName") or (event.get("away") or {}).get("name", ""),
+                event.get("scheduledTime") or event.get("startTime", ""),
+                markets.get("1x2", {}),
+                markets,
+            )
+            if match.home_team and match.odds.get("home"):
+                matches.append(match)
+    payload = {"bookmaker": "sportybet", "league": "premierleague", "matches": matches, "count": len(matches)}
+    return fastjson.dumps(payload)
+
+
+def measure(label, func, bodies, rounds):
+    func(bodies[0])  # warm the decoder memo tables
+    start = time.process_time()
+    for _ in range(rounds):
+        for body in bodies:
+            func(body)
+    cpu_ms = (time.process_time() - start) * 1000 / (rounds * len(bodies))
+
+    tracemalloc.start()
+    for body in bodies:
+        func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_kib = peak / 1024 / len(bodies)
+
+    print(f"{label} {cpu_ms:>8.1f} ms CPU/scrape   {peak_kib:>10,.0f} KiB peak/scrape")
+    return cpu_ms, peak_kib
+
+
+def run(bodies, rounds=10):
+    size_kib = sum(len(b) for b in bodies) / 1024 / len(bodies)
+    print(f"📦 {len(bodies)} feed(s), {size_kib:,.0f} KiB each, {rounds} rounds, orjson={'yes' if fastjson.HAS_ORJSON else 'no'}\n")
+
+    legacy_out = json.loads(legacy_scrape(bodies[0]))
+    fast_out = json.loads(fast_scrape(bodies[0]))
+    assert legacy_out == fast_out, "fast path output differs from the dict path"
+
+    legacy_cpu, legacy_mem = measure("🐢 dicts + json + jsonable_encoder:", legacy_scrape, bodies, rounds)
+    fast_cpu, fast_mem = measure("⚡ fastjson + MatchRecord:         ", fast_scrape, bodies, rounds)
+    print(f"\n   CPU:  {legacy_cpu / fast_cpu:.1f}x faster")
+    print(f"   Peak: {100 * (1 - fast_mem / legacy_mem):.0f}% less memory")
+
+
+if __name__ == "__main__":
+    random.seed(7)
+    run(load_bodies(sys.argv[1:]) if len(sys.argv) > 1 else [synthetic_feed()])
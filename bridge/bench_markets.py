@@ -0,0 +1,120 @@
+"""
+Benchmark: naive split-per-key market parsing vs the table-driven decoder (markets.py)
+Run: python bench_markets.py [bet9ja_payload.json] [sportybet_payload.json]
+
+Without arguments synthetic feeds are generated. With recorded payloads, the
+first file is a Bet9ja GetEventsInGroupV2 response and the second a SportyBet
+liveOrPrematchEvents response.
+"""
+
+import json
+import random
+import sys
+import time
+
+from markets import decode_bet9ja, decode_sportybet
+
+NAIVE_SIDES = {"1": "home", "X": "draw", "2": "away", "O": "over", "U": "under", "Y": "yes", "N": "no"}
+
+
+def naive_bet9ja(odds):
+    """Straightforward per-key split parser, kept for comparison"""
+    parsed = {}
+    for key, raw in odds.items():
+        parts = key.split("_")
+        if len(parts) != 3 or parts[0] != "S":
+            continue
+        family, side = parts[1], parts[2]
+        if family == "1X2":
+            market = "1x2"
+        elif family.startswith("OU@"):
+            market = "ou_" + family.split("@")[1]
+        elif family == "GGNG":
+            market = "gg_ng"
+        elif family == "DC":
+            market, side = "dc", side.lower()
+        else:
+            continue
+        try:
+            parsed.setdefault(market, {})[NAIVE_SIDES.get(side, side)] = float(raw)
+        except ValueError:
+            continue
+    return parsed
+
+
+def synthetic_bet9ja(n_events=2000):
+    events = []
+    for i in range(n_events):
+        odds = {
+            "S_1X2_1": "2.10", "S_1X2_X": "3.30", "S_1X2_2": "3.50",
+            "S_DC_1X": "1.30", "S_DC_12": "1.35", "S_DC_X2": "1.70",
+            "S_GGNG_Y": "1.75", "S_GGNG_N": "1.95",
+            "S_OE_OD": "1.90", "S_OE_EV": "1.90",
+            # Noise keys the feed carries that nobody decodes
+            "S_HND@1_1": "4.10", "S_CS_10": "8.50", "S_HTFT_11": "3.90",
+        }
+        for line in ("0.5", "1.5", "2.5", "3.5", "4.5"):
+            odds[f"S_OU@{line}_O"] = f"{random.uniform(1.1, 4):.2f}"
+            odds[f"S_OU@{line}_U"] = f"{random.uniform(1.1, 4):.2f}"
+        events.append({"ID": i, "DS": f"Home {i} - Away {i}", "O": odds})
+    return events
+
+
+def synthetic_sportybet(n_events=2000):
+    def outcomes(ids):
+        return [{"id": o, "odds": f"{random.uniform(1.1, 4):.2f}", "desc": o} for o in ids]
+
+    events = []
+    for i in range(n_events):
+        markets = [
+            {"id": "1", "specifier": "", "outcomes": outcomes(["1", "2", "3"])},
+            {"id": "10", "specifier": "", "outcomes": outcomes(["9", "10", "11"])},
+            {"id": "29", "specifier": "", "outcomes": outcomes(["74", "76"])},
+            {"id": "60", "specifier": "", "outcomes": outcomes(["1", "2", "3"])},
+        ]
+        for line in ("1.5", "2.5", "3.5"):
+            markets.append({"id": "18", "specifier": f"total={line}", "outcomes": outcomes(["12", "13"])})
+        events.append({"eventId": f"sr:match:{i}", "markets": markets})
+    return events
+
+
+def load_payloads(bet9ja_path, sportybet_path):
+    with open(bet9ja_path) as f:
+        bet9ja = json.load(f).get("D", {}).get("E", [])
+    with open(sportybet_path) as f:
+        data = json.load(f).get("data", [])
+    sportybet = [e for t in data for e in t.get("events", [])]
+    return bet9ja, sportybet
+
+
+def timed(label, func, events, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for event in events:
+            func(event)
+    elapsed = time.perf_counter() - start
+    rate = len(events) * rounds / elapsed
+    print(f"{label} {rate:>12,.0f} events/s")
+    return rate
+
+
+def run(bet9ja, sportybet, rounds=10):
+    print(f"📦 {len(bet9ja)} Bet9ja events, {len(sportybet)} SportyBet events, {rounds} rounds\n")
+
+    naive = timed("🐢 Bet9ja naive split:   ", lambda e: naive_bet9ja(e.get("O", {})), bet9ja, rounds)
+    table = timed("⚡ Bet9ja table decoder: ", lambda e: decode_bet9ja(e.get("O", {})), bet9ja, rounds)
+    print(f"   Speedup:                {table / naive:.1f}x")
+
+    timed("⚡ SportyBet decoder:    ", lambda e: decode_sportybet(e.get("markets", [])), sportybet, rounds)
+
+    if bet9ja:
+        sample = decode_bet9ja(bet9ja[0].get("O", {}))
+        print(f"\n   Markets per Bet9ja event: {len(sample)} ({', '.join(sorted(sample))})")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3:
+        bet9ja, sportybet = load_payloads(sys.argv[1], sys.argv[2])
+    else:
+        bet9ja, sportybet = synthetic_bet9ja(), synthetic_sportybet()
+    run(bet9ja, sportybet)
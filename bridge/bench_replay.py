@@ -0,0 +1,313 @@
+"""
+Benchmark suite: offline scraper throughput, allocations and route latency from replayed upstream responses
+Run: python bench_replay.py [--captures DIR] [--latency 0.05] [--jitter 0.01] [--error-rate 0.0]
+                            [--requests 30] [--baseline bench_baseline.json] [--save-baseline]
+
+Record real traffic first with `CAPTURE_DIR=captures uvicorn main:app` and hit
+a few /api/odds routes; without --captures, synthetic fixtures are generated.
+Results are compared against the baseline file (and can replace it with
+--save-baseline). Higher is better for events/s, lower for everything else.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("SCHEDULER_ENABLED", "false")
+
+import httpx
+
+import main
+from health import percentile
+from markets import decode_bet9ja, decode_sportybet
+from replay import list_captures, replay_factory, write_capture
+
+LEAGUE = "premierleague"
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+ROUTES = {
+    "bet9ja": f"/api/odds/bet9ja/{LEAGUE}?refresh=true",
+    "sportybet": f"/api/odds/sportybet/{LEAGUE}?refresh=true",
+    "betking": f"/api/odds/betking/{LEAGUE}?refresh=true",
+    "all": f"/api/odds/all/{LEAGUE}",
+    "all_multi": f"/api/odds/all?leagues={LEAGUE},laliga",
+}
+
+
+def write_synthetic_captures(directory, n_events=300, seed=7):
+    """Bet9ja, SportyBet and OddsAPI fixtures describing the same fixtures with bookmaker spellings"""
+    rng = random.Random(seed)
+    start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    price = lambda lo, hi: f"{rng.uniform(lo, hi):.2f}"
+
+    bet9ja_events, sporty_events, sharp_events = [], [], []
+    for i in range(n_events):
+        home, away = f"Club {2 * i} United", f"Club {2 * i + 1} City"
+        kickoff = start + timedelta(hours=i % 72)
+        odds = {
+            "S_1X2_1": price(1.5, 4), "S_1X2_X": price(3, 4), "S_1X2_2": price(1.5, 5),
+            "S_DC_1X": price(1.1, 1.6), "S_DC_12": price(1.1, 1.5), "S_DC_X2": price(1.2, 2),
+            "S_GGNG_Y": price(1.5, 2.2), "S_GGNG_N": price(1.5, 2.2),
+            "S_1X21_11": price(2, 5), "S_1X21_X1": price(1.8, 2.4), "S_1X21_21": price(2, 6),
+            "S_OE_OD": price(1.8, 2), "S_OE_EV": price(1.8, 2),
+            "S_HND@1_1": price(3, 6), "S_CS_10": price(6, 12),
+        }
+        for line in ("0.5", "1.5", "2.5", "3.5", "4.5"):
+            odds[f"S_OU@{line}_O"] = price(1.1, 4)
+            odds[f"S_OU@{line}_U"] = price(1.1, 4)
+        bet9ja_events.append({
+            "ID": 500000 + i,
+            "DS": f"{home.replace('United', 'Utd')} - {away}",
+            "START": kickoff.strftime("%Y-%m-%d %H:%M:%S"),
+            "O": odds,
+        })
+
+        outcomes = lambda ids: [{"id": o, "odds": price(1.1, 4), "desc": o} for o in ids]
+        markets = [
+            {"id": "1", "specifier": "", "outcomes": [
+                {"id": "1", "odds": price(1.5, 4), "desc": "Home"},
+                {"id": "2", "odds": price(3, 4), "desc": "Draw"},
+                {"id": "3", "odds": price(1.5, 5), "desc": "Away"},
+            ]},
+            {"id": "10", "specifier": "", "outcomes": outcomes(["9", "10", "11"])},
+            {"id": "29", "specifier": "", "outcomes": outcomes(["74", "76"])},
+            {"id": "60", "specifier": "", "outcomes": outcomes(["1", "2", "3"])},
+        ]
+        for line in ("1.5", "2.5", "3.5"):
+            markets.append({"id": "18", "specifier": f"total={line}", "outcomes": outcomes(["12", "13"])})
+        sporty_events.append({
+            "eventId": f"sr:match:{900000 + i}",
+            "homeTeamName": home,
+            "awayTeamName": away,
+            "estimateStartTime": int(kickoff.timestamp() * 1000),
+            "scheduledTime": int(kickoff.timestamp() * 1000),
+            "markets": markets,
+        })
+
+        sharp_events.append({
+            "id": f"evt{i}",
+            "home_team": home,
+            "away_team": away,
+            "commence_time": kickoff.isoformat().replace("+00:00", "Z"),
+            "bookmakers": [{"key": "pinnacle", "markets": [{"key": "h2h", "outcomes": [
+                {"name": home, "price": float(price(1.5, 4))},
+                {"name": away, "price": float(price(1.5, 5))},
+                {"name": "Draw", "price": float(price(3, 4))},
+            ]}]}],
+        })
+
+    write_capture(
+        directory, "bet9ja", "GET",
+        "https://sports.bet9ja.com/desktop/feapi/PalimpsestAjax/GetEventsInGroupV2"
+        "?GROUPID=170880&DISP=0&GROUPMARKETID=1&upcoming=true",
+        {"D": {"E": bet9ja_events}},
+    )
+    write_capture(
+        directory, "sportybet", "GET", f"{main.SPORTYBET_EVENTS_URL}?sportId={main.SPORTYBET_SPORT_ID}",
+        {"bizCode": 10000, "data": [
+            {"id": "sr:tournament:17", "name": "Premier League", "events": sporty_events},
+            {"id": "sr:tournament:8", "name": "LaLiga", "events": sporty_events[: n_events // 3]},
+        ]},
+    )
+    write_capture(
+        directory, "oddsapi", "GET",
+        f"{main.ODDS_API_BASE}/sports/soccer_epl/odds?regions=us,uk&markets=h2h&oddsFormat=decimal&bookmakers=pinnacle",
+        sharp_events,
+    )
+
+
+def load_feed_events(directory):
+    """Decoded event lists per bookmaker from the capture files"""
+    bet9ja, sportybet = [], []
+    for host in ("bet9ja", "sportybet"):
+        host_dir = os.path.join(directory, host)
+        if not os.path.isdir(host_dir):
+            continue
+        for name in os.listdir(host_dir):
+            with open(os.path.join(host_dir, name)) as f:
+                body = json.loads(json.load(f).get("body") or "{}")
+            if host == "bet9ja":
+                bet9ja.extend(body.get("D", {}).get("E", []))
+            else:
+                sportybet.extend(e for t in body.get("data", []) for e in t.get("events", []))
+    return bet9ja, sportybet
+
+
+def bench_parsers(bet9ja, sportybet, rounds=20):
+    results = {}
+    for name, events, decode, field in (
+        ("bet9ja", bet9ja, decode_bet9ja, "O"),
+        ("sportybet", sportybet, decode_sportybet, "markets"),
+    ):
+        if not events:
+            continue
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for event in events:
+                decode(event.get(field) or {})
+        results[f"parse_{name}_events_per_s"] = len(events) * rounds / (time.perf_counter() - start)
+    return results
+
+
+def reset_caches():
+    main.odds_snapshots.clear()
+    main.sportybet_snapshots.clear()
+
+
+async def bench_scrapers(rounds=10):
+    """End-to-end scraper throughput (fetch -> decode -> parse -> resolve -> board) and allocations"""
+    results = {}
+    for name, scrape in (("bet9ja", main.scrape_bet9ja_json), ("sportybet", main.scrape_sportybet_json)):
+        await scrape(LEAGUE)  # warm sharp cache, resolver and board
+        events = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            reset_caches()
+            events += len(await scrape(LEAGUE))
+        elapsed = time.perf_counter() - start
+        results[f"scrape_{name}_events_per_s"] = events / elapsed if elapsed else 0.0
+
+        reset_caches()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        matches = await scrape(LEAGUE)
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        allocated = sum(s.count_diff for s in after.compare_to(before, "filename") if s.count_diff > 0)
+        results[f"scrape_{name}_peak_kib"] = peak / 1024
+        results[f"scrape_{name}_retained_blocks_per_event"] = allocated / max(1, len(matches))
+    return results
+
+
+async def bench_routes(requests):
+    """p50/p99 end-to-end latency per /api/odds route through the ASGI app"""
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for name, path in ROUTES.items():
+            for mode in ("cold", "warm"):
+                if mode == "warm" and "refresh=true" in path:
+                    continue
+                samples, errors = [], 0
+                for _ in range(requests):
+                    if mode == "cold":
+                        reset_caches()
+                    start = time.perf_counter()
+                    response = await client.get(path)
+                    samples.append((time.perf_counter() - start) * 1000)
+                    if response.status_code != 200:
+                        errors += 1
+                samples.sort()
+                label = f"route_{name}" if mode == "cold" else f"route_{name}_warm"
+                results[f"{label}_p50_ms"] = percentile(samples, 50)
+                results[f"{label}_p99_ms"] = percentile(samples, 99)
+                if errors:
+                    print(f"   ⚠️ {name} ({mode}): {errors}/{requests} non-200 responses")
+    return results
+
+
+def lower_is_better(metric):
+    return not metric.endswith("_per_s")
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\n{'metric':<48}{'current':>12}{'baseline':>12}{'change':>10}")
+    for metric, value in results.items():
+        base = baseline.get(metric)
+        if base in (None, 0):
+            print(f"{metric:<48}{value:>12.2f}{'-':>12}{'':>10}")
+            continue
+        change = (value - base) / base * 100
+        worse = change > threshold if lower_is_better(metric) else change < -threshold
+        flag = " 🔴" if worse else ""
+        print(f"{metric:<48}{value:>12.2f}{base:>12.2f}{change:>+9.1f}%{flag}")
+        if worse:
+            regressions.append(metric)
+    return regressions
+
+
+async def run(args):
+    captures = args.captures
+    if not captures:
+        captures = tempfile.mkdtemp(prefix="bridge-bench-")
+        write_synthetic_captures(captures, n_events=args.events)
+        print(f"📦 Synthetic captures in {captures}")
+    for host, keys in list_captures(captures).items():
+        print(f"   {host}: {len(keys)} capture(s)")
+
+    # Never write benchmark traffic to the database (the warm-up would connect it)
+    main.SUPABASE_URL = None
+    main.pg_store = None
+    main.supabase_client = None
+    # Replayed upstreams don't need pacing; the adaptive rate limiter would dominate the timings
+    for host in main.http_clients.stats()["hosts"]:
+        main.http_clients.set_limiter(host, None)
+
+    results = {}
+    bet9ja, sportybet = load_feed_events(captures)
+    print(f"\n⚙️  Parsers ({len(bet9ja)} Bet9ja / {len(sportybet)} SportyBet events)")
+    results.update(bench_parsers(bet9ja, sportybet))
+
+    # Throughput and allocations without simulated network latency
+    main.http_clients.transport_factory = replay_factory(captures, seed=1)
+    async with main.lifespan(main.app):
+        print("⚙️  Scrapers")
+        results.update(await bench_scrapers())
+
+    # Route latency with simulated upstream latency/errors
+    main.http_clients.transport_factory = replay_factory(
+        captures, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, error_status=args.error_status, seed=1,
+    )
+    async with main.lifespan(main.app):
+        print(f"⚙️  Routes ({args.requests} requests each, upstream latency {args.latency * 1000:.0f}ms)")
+        results.update(await bench_routes(args.requests))
+
+    results = {k: round(v, 3) for k, v in results.items() if v is not None}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("metrics", {})
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+                "python": sys.version.split()[0],
+                "settings": {"events": args.events, "latency": args.latency, "requests": args.requests},
+                "metrics": results,
+            }, f, indent=2, sort_keys=True)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\n🔴 {len(regressions)} metric(s) regressed more than {args.threshold:.0f}%: {', '.join(regressions)}")
+        return 1 if args.fail_on_regression else 0
+    print("\n✅ No regressions against baseline" if baseline else "\nℹ️ No baseline to compare against")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--captures", help="Directory written with CAPTURE_DIR (default: synthetic fixtures)")
+    parser.add_argument("--events", type=int, default=300, help="Events per synthetic feed")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated upstream latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01, help="Latency jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream requests that fail")
+    parser.add_argument("--error-status", type=int, default=None, help="Fail with this HTTP status instead of a connection error")
+    parser.add_argument("--requests", type=int, default=30, help="Requests per route")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=15.0, help="Regression threshold in percent")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    sys.exit(asyncio.run(run(parser.parse_args())))
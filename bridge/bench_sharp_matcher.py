@@ -0,0 +1,126 @@
+"""
+Benchmark: legacy linear sharp-odds scan vs SharpOddsIndex
+Run: python bench_sharp_matcher.py [oddsapi_payload.json] [soft_matches.json]
+
+Without arguments a synthetic league is generated. With recorded payloads,
+the first file is an OddsAPI /odds response and the second a bridge
+/api/odds/{bookie}/{league} response (or its `matches` list).
+"""
+
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from sharp_matcher import SharpOddsIndex
+
+
+def legacy_match(events, home_team, away_team):
+    """The original fetch_sharp_odds matching loop, kept for comparison"""
+    home_team = home_team.lower()
+    away_team = away_team.lower()
+    for event in events:
+        ev_home = event.get('home_team', '').lower()
+        ev_away = event.get('away_team', '').lower()
+        if (home_team in ev_home or ev_home in home_team) and \
+           (away_team in ev_away or ev_away in away_team):
+            for bookmaker in event.get('bookmakers', []):
+                if bookmaker.get('key') == 'pinnacle':
+                    for market in bookmaker.get('markets', []):
+                        if market.get('key') == 'h2h':
+                            sharp = {"home": None, "draw": None, "away": None}
+                            for outcome in market.get('outcomes', []):
+                                name = outcome.get('name', '').lower()
+                                if ev_home in name: sharp['home'] = outcome.get('price')
+                                elif ev_away in name: sharp['away'] = outcome.get('price')
+                                elif 'draw' in name: sharp['draw'] = outcome.get('price')
+                            return sharp
+    return {"home": None, "draw": None, "away": None}
+
+
+def synthetic_payload(n_events=200):
+    """OddsAPI-shaped events plus soft-book spellings of the same fixtures"""
+    clubs = [f"Club {i} United" for i in range(n_events * 2)]
+    start = datetime.now(timezone.utc)
+    events, soft = [], []
+    for i in range(n_events):
+        home, away = clubs[2 * i], clubs[2 * i + 1]
+        kickoff = (start + timedelta(hours=i)).isoformat()
+        events.append({
+            "home_team": home,
+            "away_team": away,
+            "commence_time": kickoff,
+            "bookmakers": [{"key": "pinnacle", "markets": [{"key": "h2h", "outcomes": [
+                {"name": home, "price": round(random.uniform(1.5, 4), 2)},
+                {"name": away, "price": round(random.uniform(1.5, 4), 2)},
+                {"name": "Draw", "price": round(random.uniform(3, 4), 2)},
+            ]}]}],
+        })
+        soft.append({
+            "home_team": home.replace("United", "Utd"),
+            "away_team": away.replace("United", "Utd"),
+            "kickoff": kickoff,
+        })
+    # Real-world spelling gaps the legacy matcher misses
+    events.append({
+        "home_team": "Manchester United", "away_team": "Tottenham Hotspur",
+        "commence_time": start.isoformat(),
+        "bookmakers": [{"key": "pinnacle", "markets": [{"key": "h2h", "outcomes": [
+            {"name": "Manchester United", "price": 2.1},
+            {"name": "Tottenham Hotspur", "price": 3.4},
+            {"name": "Draw", "price": 3.6},
+        ]}]}],
+    })
+    soft.append({"home_team": "Man Utd", "away_team": "Spurs", "kickoff": start.isoformat()})
+    return events, soft
+
+
+def load_payloads(events_path, soft_path):
+    with open(events_path) as f:
+        events = json.load(f)
+    with open(soft_path) as f:
+        soft = json.load(f)
+    if isinstance(soft, dict):
+        soft = soft.get("matches", [])
+    return events, soft
+
+
+def run(events, soft, rounds=20):
+    print(f"📦 {len(events)} sharp events, {len(soft)} soft matches, {rounds} rounds")
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        legacy = [legacy_match(events, m["home_team"], m["away_team"]) for m in soft]
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = SharpOddsIndex(events)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        # Fresh memo each round so we measure the probe, not the memo
+        index._memo.clear()
+        indexed = [index.lookup(m["home_team"], m["away_team"], m.get("kickoff")) for m in soft]
+    indexed_s = time.perf_counter() - start
+
+    lookups = len(soft) * rounds
+    legacy_hits = sum(1 for r in legacy if r["home"] is not None)
+    indexed_hits = sum(1 for prices, _ in indexed if prices["home"] is not None)
+    qualities = [q for _, q in indexed if q > 0]
+
+    print(f"\n🐢 Legacy scan:   {lookups / legacy_s:>12,.0f} lookups/s   matched {legacy_hits}/{len(soft)}")
+    print(f"⚡ Indexed probe: {lookups / indexed_s:>12,.0f} lookups/s   matched {indexed_hits}/{len(soft)}")
+    print(f"   Index build:   {build_ms:.2f} ms (once per cache refresh)")
+    if qualities:
+        print(f"   Match quality: min {min(qualities):.2f}, mean {sum(qualities) / len(qualities):.2f}")
+    print(f"   Speedup:       {legacy_s / indexed_s:.1f}x")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 3:
+        events, soft = load_payloads(sys.argv[1], sys.argv[2])
+    else:
+        events, soft = synthetic_payload()
+    run(events, soft)
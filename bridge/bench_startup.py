@@ -0,0 +1,114 @@
+"""
+Benchmark: cold-start time - importing main and the first successful request
+Run: python bench_startup.py [--runs 5] [--top 10]
+
+Every run is a fresh interpreter, as after a deploy or restart:
+
+- import: `import main` alone (-X importtime), and which of main's imports cost the most
+- first /health: uvicorn started on a free port, polled until liveness answers 200
+- first /ready: polled until the warm-up (database, caches, pools) has finished
+
+The bridge's own environment is passed through (set SUPABASE_URL etc. to
+include the database warm-up); the scheduler is off unless SCHEDULER_ENABLED
+is set explicitly, so runs don't scrape bookmakers.
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TIMEOUT = 60.0
+
+
+def child_env():
+    env = dict(os.environ)
+    env.setdefault("SCHEDULER_ENABLED", "false")
+    return env
+
+
+def time_import(top):
+    """Wall time of `import main` in a fresh interpreter, and the slowest modules main imports directly"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=HERE, env=child_env(), capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Each nesting level indents the name by two more spaces; main itself is at depth 0
+        if cumulative.strip().isdigit() and len(name) - len(name.lstrip()) == 3:
+            modules.append((int(cumulative) / 1000, name.strip()))
+    return elapsed, sorted(modules, reverse=True)[:top]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_first_requests():
+    """Seconds from process start to the first 200 from /health, then from /ready"""
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=HERE, env=child_env(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    timings = {}
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1.0) as client:
+            for path in ("/health", "/ready"):
+                while path not in timings:
+                    if time.perf_counter() - started > TIMEOUT:
+                        raise SystemExit(f"❌ {path} did not answer 200 within {TIMEOUT:.0f}s")
+                    if server.poll() is not None:
+                        raise SystemExit(f"❌ uvicorn exited with code {server.returncode}")
+                    try:
+                        if client.get(path).status_code == 200:
+                            timings[path] = time.perf_counter() - started
+                            continue
+                    except httpx.TransportError:
+                        pass
+                    time.sleep(0.01)
+    finally:
+        server.terminate()
+        server.wait()
+    return timings["/health"], timings["/ready"]
+
+
+def run(runs, top):
+    imports, health, ready = [], [], []
+    slowest = []
+    for _ in range(runs):
+        elapsed, slowest = time_import(top)
+        imports.append(elapsed)
+        first_health, first_ready = time_first_requests()
+        health.append(first_health)
+        ready.append(first_ready)
+
+    print(f"{'':<24} {'median':>9} {'min':>9} {'max':>9}")
+    for label, samples in (("import main", imports), ("first /health (200)", health), ("first /ready (200)", ready)):
+        print(f"{label:<24} {statistics.median(samples):>8.3f}s {min(samples):>8.3f}s {max(samples):>8.3f}s")
+    print("\n🐢 Slowest imports in main (last run, cumulative):")
+    for ms, name in slowest:
+        print(f"   {ms:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    run(args.runs, args.top)
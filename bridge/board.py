@@ -0,0 +1,246 @@
+"""
+Vantedge Naija Bridge - Merged Odds Board
+Every bookmaker's price per canonical event/selection plus the best price, maintained incrementally
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+Markets = Dict[str, Dict[str, float]]
+Best = Tuple[float, str]
+
+
+class BoardEvent:
+    """Prices for one canonical event across bookmakers"""
+
+    __slots__ = ("event_id", "league", "home_team", "away_team", "kickoff_ts", "prices", "best", "offered", "updated_at")
+
+    def __init__(self, event_id: str, league: str, home_team: str, away_team: str, kickoff_ts: Optional[float]):
+        self.event_id = event_id
+        self.league = league
+        self.home_team = home_team
+        self.away_team = away_team
+        self.kickoff_ts = kickoff_ts
+        # market -> selection -> bookmaker -> price
+        self.prices: Dict[str, Dict[str, Dict[str, float]]] = {}
+        # market -> selection -> (best price, bookmaker)
+        self.best: Dict[str, Dict[str, Best]] = {}
+        # bookmaker -> {(market, selection)} it currently prices
+        self.offered: Dict[str, Set[Tuple[str, str]]] = {}
+        self.updated_at = time.time()
+
+    def _recompute(self, market: str, selection: str):
+        quotes = self.prices.get(market, {}).get(selection)
+        if not quotes:
+            self.prices.get(market, {}).pop(selection, None)
+            self.best.get(market, {}).pop(selection, None)
+            return
+        bookmaker, price = max(quotes.items(), key=lambda kv: kv[1])
+        self.best.setdefault(market, {})[selection] = (price, bookmaker)
+
+    def apply(self, bookmaker: str, markets: Markets) -> Dict[str, Dict[str, Best]]:
+        """
+        Replace one bookmaker's prices. Only selections that bookmaker touched
+        are re-examined; a full max() over bookmakers runs only when the
+        current best price was withdrawn or shortened.
+        """
+        changed: Dict[str, Dict[str, Best]] = {}
+        previous = self.offered.get(bookmaker, set())
+        current: Set[Tuple[str, str]] = set()
+
+        for market, selections in markets.items():
+            market_prices = self.prices.setdefault(market, {})
+            market_best = self.best.setdefault(market, {})
+            for selection, price in selections.items():
+                if not price:
+                    continue
+                current.add((market, selection))
+                quotes = market_prices.setdefault(selection, {})
+                if quotes.get(bookmaker) == price:
+                    continue
+                quotes[bookmaker] = price
+                best = market_best.get(selection)
+                if best is None or price > best[0]:
+                    market_best[selection] = (price, bookmaker)
+                elif best[1] == bookmaker and price < best[0]:
+                    self._recompute(market, selection)
+                else:
+                    continue
+                if market_best.get(selection) != best:
+                    changed.setdefault(market, {})[selection] = market_best[selection]
+
+        # Selections this bookmaker no longer offers
+        for market, selection in previous - current:
+            quotes = self.prices.get(market, {}).get(selection)
+            if not quotes or quotes.pop(bookmaker, None) is None:
+                continue
+            best = self.best.get(market, {}).get(selection)
+            if best and best[1] == bookmaker:
+                self._recompute(market, selection)
+                new_best = self.best.get(market, {}).get(selection)
+                if new_best:
+                    changed.setdefault(market, {})[selection] = new_best
+
+        self.offered[bookmaker] = current
+        self.updated_at = time.time()
+        return changed
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "event_id": self.event_id,
+            "league": self.league,
+            "home_team": self.home_team,
+            "away_team": self.away_team,
+            "kickoff": (
+                datetime.fromtimestamp(self.kickoff_ts, timezone.utc).isoformat()
+                if self.kickoff_ts is not None else None
+            ),
+            "bookmakers": sorted(self.offered),
+            "markets": {
+                market: {
+                    selection: {
+                        "best": self.best[market][selection][0],
+                        "best_bookmaker": self.best[market][selection][1],
+                        "prices": dict(quotes),
+                    }
+                    for selection, quotes in selections.items()
+                    if quotes and selection in self.best.get(market, {})
+                }
+                for market, selections in self.prices.items()
+                if selections
+            },
+            "updated_at": datetime.fromtimestamp(self.updated_at, timezone.utc).isoformat(),
+        }
+
+
+class OddsBoard:
+    """
+    In-memory merged board keyed by canonical event id.
+
+    `update()` is called as each bookmaker's scrape lands and returns only the
+    best prices that moved, so consumers can react to changes without diffing
+    the whole board. Events are dropped `forget_after` seconds past kickoff.
+    """
+
+    def __init__(self, forget_after: float = 3 * 3600):
+        self.forget_after = forget_after
+        self._events: Dict[str, BoardEvent] = {}
+        self._by_league: Dict[str, Set[str]] = {}
+        self._calls_since_prune = 0
+        self.updates = 0
+        self.best_changes = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def update(
+        self,
+        event_id: str,
+        league: str,
+        home_team: str,
+        away_team: str,
+        kickoff_ts: Optional[float],
+        bookmaker: str,
+        markets: Markets,
+    ) -> Dict[str, Dict[str, Best]]:
+        self._maybe_prune()
+        event = self._events.get(event_id)
+        if event is None:
+            event = self._events[event_id] = BoardEvent(event_id, league, home_team, away_team, kickoff_ts)
+            self._by_league.setdefault(league, set()).add(event_id)
+        elif event.kickoff_ts is None:
+            event.kickoff_ts = kickoff_ts
+        changed = event.apply(bookmaker, markets)
+        self.updates += 1
+        self.best_changes += sum(len(sels) for sels in changed.values())
+        return changed
+
+    def get(self, event_id: str) -> Optional[Dict[str, Any]]:
+        event = self._events.get(event_id)
+        return event.as_dict() if event else None
+
+    def league(self, league: str) -> List[Dict[str, Any]]:
+        events = [self._events[eid] for eid in self._by_league.get(league, ()) if eid in self._events]
+        events.sort(key=lambda e: (e.kickoff_ts is None, e.kickoff_ts or 0))
+        return [e.as_dict() for e in events]
+
+    def price_matrix(
+        self, league: str, market: str = "1x2", selections: Sequence[str] = ("home", "draw", "away")
+    ) -> Tuple[List[BoardEvent], List[str], "np.ndarray"]:
+        """
+        A league's prices for one market as an (events, bookmakers, selections)
+        array, NaN where a bookmaker has no price, for the edge engine.
+        """
+        import numpy as np  # deferred: only the edge engine needs it
+
+        events = [self._events[eid] for eid in self._by_league.get(league, ()) if eid in self._events]
+        bookmakers = sorted({b for e in events for b in e.offered})
+        column = {b: i for i, b in enumerate(bookmakers)}
+        prices = np.full((len(events), len(bookmakers), len(selections)), np.nan)
+        for row, event in enumerate(events):
+            market_prices = event.prices.get(market, {})
+            for s, selection in enumerate(selections):
+                for bookmaker, price in market_prices.get(selection, {}).items():
+                    prices[row, column[bookmaker], s] = price
+        return events, bookmakers, prices
+
+    def dump(self) -> Dict[str, Any]:
+        """Every event's prices as plain JSON, for followers to `load()` (see shared_store.SharedReplica)"""
+        return {
+            "updates": self.updates,
+            "best_changes": self.best_changes,
+            "events": [
+                {
+                    "event_id": e.event_id,
+                    "league": e.league,
+                    "home_team": e.home_team,
+                    "away_team": e.away_team,
+                    "kickoff_ts": e.kickoff_ts,
+                    "prices": e.prices,
+                    "updated_at": e.updated_at,
+                }
+                for e in self._events.values()
+            ],
+        }
+
+    def load(self, data: Dict[str, Any]):
+        """Replace the board with a `dump()`; best prices and offered selections are rebuilt from the prices"""
+        self._events = {}
+        self._by_league = {}
+        for row in data.get("events", ()):
+            event = BoardEvent(row["event_id"], row["league"], row["home_team"], row["away_team"], row["kickoff_ts"])
+            event.prices = row["prices"]
+            for market, selections in event.prices.items():
+                for selection, quotes in selections.items():
+                    if not quotes:
+                        continue
+                    event._recompute(market, selection)
+                    for bookmaker in quotes:
+                        event.offered.setdefault(bookmaker, set()).add((market, selection))
+            event.updated_at = row["updated_at"]
+            self._events[event.event_id] = event
+            self._by_league.setdefault(event.league, set()).add(event.event_id)
+        self.updates = data.get("updates", 0)
+        self.best_changes = data.get("best_changes", 0)
+
+    def _maybe_prune(self):
+        self._calls_since_prune += 1
+        if self._calls_since_prune < 500:
+            return
+        self._calls_since_prune = 0
+        cutoff = time.time() - self.forget_after
+        for event_id in [eid for eid, ev in self._events.items() if ev.kickoff_ts is not None and ev.kickoff_ts < cutoff]:
+            event = self._events.pop(event_id)
+            self._by_league.get(event.league, set()).discard(event_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "events": len(self._events),
+            "leagues": {league: len(ids) for league, ids in self._by_league.items()},
+            "updates": self.updates,
+            "best_changes": self.best_changes,
+        }
@@ -0,0 +1,224 @@
+"""
+Vantedge Naija Bridge - Warm-Restart Checkpoints
+Append-only local log of the in-memory odds state, compacted in place and reloaded at startup
+"""
+
+import asyncio
+import logging
+import os
+import struct
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import fastjson
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VNBCKPT1"
+FRAME = struct.Struct(">II")  # body length, CRC32 of the body
+
+# key -> (version, value): a key is rewritten only when its version changes
+Collector = Callable[[], Dict[str, Tuple[Any, Any]]]
+
+
+class CheckpointLog:
+    """
+    Keyed records in one append-only file.
+
+    Each frame is length + CRC32 + zlib-compressed JSON `{"k": key, "v": value}`;
+    a later frame for a key supersedes earlier ones and `"v": null` deletes it.
+    A frame torn by a crash fails its length or CRC check and is cut off at
+    load. Once superseded frames outweigh the live ones `compact_ratio` times,
+    the live frames are rewritten to a new file that replaces the old one
+    atomically (write + rename), so a crash mid-compaction loses nothing.
+    """
+
+    def __init__(self, path: str, compress_level: int = 1, compact_ratio: float = 2.0, min_compact_bytes: int = 1 << 20):
+        self.path = path
+        self.compress_level = compress_level
+        self.compact_ratio = compact_ratio
+        self.min_compact_bytes = min_compact_bytes
+        self._frames: Dict[str, bytes] = {}
+        self._size = 0
+        self.compactions = 0
+        self.torn_bytes = 0
+
+    @property
+    def live_bytes(self) -> int:
+        return len(MAGIC) + sum(len(frame) for frame in self._frames.values())
+
+    def _encode(self, key: str, value: Any) -> bytes:
+        body = zlib.compress(fastjson.dumps({"k": key, "v": value}), self.compress_level)
+        return FRAME.pack(len(body), zlib.crc32(body)) + body
+
+    def load(self) -> Dict[str, Any]:
+        """Latest value per key; drops a torn tail and starts over on a foreign file"""
+        self._frames = {}
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        if not data.startswith(MAGIC):
+            if data:
+                logger.warning(f"⚠️ {self.path} is not a checkpoint log, starting a new one")
+            self._rewrite()
+            return {}
+
+        values: Dict[str, Any] = {}
+        offset = len(MAGIC)
+        while offset + FRAME.size <= len(data):
+            length, crc = FRAME.unpack_from(data, offset)
+            end = offset + FRAME.size + length
+            body = data[offset + FRAME.size:end]
+            if end > len(data) or zlib.crc32(body) != crc:
+                break
+            record = fastjson.loads(zlib.decompress(body))
+            key, value = record["k"], record["v"]
+            if value is None:
+                values.pop(key, None)
+                self._frames.pop(key, None)
+            else:
+                values[key] = value
+                self._frames[key] = data[offset:end]
+            offset = end
+
+        self._size = offset
+        if offset < len(data):
+            self.torn_bytes = len(data) - offset
+            logger.warning(f"⚠️ Dropping {self.torn_bytes} torn bytes at the end of {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+        return values
+
+    def write(self, values: Dict[str, Any], removed: Iterable[str] = ()):
+        """Append new values and deletions, then compact if the file has grown too sparse"""
+        frames = [(key, self._encode(key, value)) for key, value in values.items()]
+        frames += [(key, self._encode(key, None)) for key in removed if key in self._frames]
+        if not frames:
+            return
+        with open(self.path, "ab") as f:
+            for key, frame in frames:
+                f.write(frame)
+                self._size += len(frame)
+                if key in values:
+                    self._frames[key] = frame
+                else:
+                    self._frames.pop(key, None)
+            f.flush()
+            os.fsync(f.fileno())
+        if self._size > self.min_compact_bytes and self._size > self.compact_ratio * self.live_bytes:
+            self._rewrite()
+            self.compactions += 1
+
+    def _rewrite(self):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            for frame in self._frames.values():
+                f.write(frame)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._size = self.live_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "keys": len(self._frames),
+            "file_bytes": self._size,
+            "live_bytes": self.live_bytes,
+            "compactions": self.compactions,
+            "torn_bytes": self.torn_bytes,
+        }
+
+
+class Checkpointer:
+    """
+    Every `interval` seconds, writes the records `collect()` reports whose
+    version (e.g. fetched_at) changed since the last checkpoint, and deletes
+    the ones that disappeared. Encoding and file I/O run in a worker thread.
+    """
+
+    def __init__(self, log: CheckpointLog, collect: Collector, interval: float = 30.0):
+        self.log = log
+        self.collect = collect
+        self.interval = interval
+        self._versions: Dict[str, Any] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.checkpoints = 0
+        self.records_written = 0
+        self.last_checkpoint_at: Optional[float] = None
+        self.last_checkpoint_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    async def restore(self, apply: Callable[[Dict[str, Any]], Any]):
+        """
+        Read the log back (in a worker thread) and hand it to `apply`. What `apply`
+        restored is not rewritten until its version changes; what it skipped is
+        deleted at the next checkpoint.
+        """
+        values = await asyncio.to_thread(self.log.load)
+        result = apply(values)
+        self._versions = {key: version for key, (version, _) in self.collect().items()}
+        for key in values.keys() - self._versions.keys():
+            self._versions[key] = None
+        return result
+
+    async def checkpoint(self) -> int:
+        started = time.perf_counter()
+        current = self.collect()
+        changed = {key: value for key, (version, value) in current.items() if self._versions.get(key) != version}
+        removed = [key for key in self._versions if key not in current]
+        if changed or removed:
+            await asyncio.to_thread(self.log.write, changed, removed)
+        self._versions = {key: version for key, (version, _) in current.items()}
+        self.checkpoints += 1
+        self.records_written += len(changed)
+        self.last_checkpoint_at = time.time()
+        self.last_checkpoint_ms = round((time.perf_counter() - started) * 1000, 1)
+        return len(changed)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.checkpoint()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"⚠️ Checkpoint to {self.log.path} failed: {e}")
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="checkpoint")
+            logger.info(f"✅ Checkpointing odds state to {self.log.path} every {self.interval:g}s")
+
+    async def stop(self):
+        """Stop the periodic task and write a final checkpoint"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            await self.checkpoint()
+        except Exception as e:
+            logger.warning(f"⚠️ Final checkpoint to {self.log.path} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_s": self.interval,
+            "checkpoints": self.checkpoints,
+            "records_written": self.records_written,
+            "last_checkpoint_at": self.last_checkpoint_at,
+            "last_checkpoint_ms": self.last_checkpoint_ms,
+            "last_error": self.last_error,
+            **self.log.stats(),
+        }
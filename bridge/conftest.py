@@ -0,0 +1,3 @@
+# test_bridge.py and test_sportybet_api.py are manual scripts against a running
+# bridge / the live SportyBet API, not unit tests
+collect_ignore = ["test_bridge.py", "test_sportybet_api.py"]
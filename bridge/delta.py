@@ -0,0 +1,139 @@
+"""
+Vantedge Naija Bridge - Delta Detection
+Remembers the last written prices per (bookmaker, match) so unchanged rows skip the database
+"""
+
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+Prices = Dict[str, Optional[float]]
+
+
+class OddsDelta:
+    """Price changes for one (bookmaker, match) since the last write"""
+
+    __slots__ = ("bookmaker", "match_id", "changes", "is_new", "unwritten")
+
+    def __init__(
+        self,
+        bookmaker: str,
+        match_id: str,
+        changes: Dict[str, Tuple[Optional[float], Optional[float]]],
+        is_new: bool,
+        unwritten: bool = False,
+    ):
+        self.bookmaker = bookmaker
+        self.match_id = match_id
+        self.changes = changes
+        self.is_new = is_new
+        # The previous emit was never written, so this one must write every price
+        self.unwritten = unwritten
+
+    @property
+    def full(self) -> bool:
+        """Write every price, not just `changes` (new match, or nothing written yet)"""
+        return self.is_new or self.unwritten
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "bookmaker": self.bookmaker,
+            "match_id": self.match_id,
+            "is_new": self.is_new,
+            "changes": {sel: {"old": old, "new": new} for sel, (old, new) in self.changes.items()},
+        }
+
+
+class DeltaTracker:
+    """
+    Per-(bookmaker, match) fingerprint of the last emitted prices.
+
+    `diff()` returns an OddsDelta when anything moved (or the match is new) and
+    None when the prices are identical. A row that has been quiet for
+    `refresh_after` seconds is re-emitted anyway so downstream freshness checks
+    (cleanup_stale_odds deletes rows not updated for 10 minutes) keep passing.
+    A delta that could not be written is handed back with `mark_unwritten()`.
+    """
+
+    def __init__(self, refresh_after: float = 300.0, forget_after: float = 6 * 3600):
+        self.refresh_after = refresh_after
+        self.forget_after = forget_after
+        # key -> (prices, last_emitted_at, last_seen_at)
+        self._last: Dict[Tuple[str, str], Tuple[Prices, float, float]] = {}
+        self._unwritten: Set[Tuple[str, str]] = set()
+        self._calls_since_prune = 0
+
+        self.seen = 0
+        self.emitted = 0
+        self.suppressed = 0
+        self.refreshed = 0
+        self.rewritten = 0
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def diff(self, bookmaker: str, match_id: str, prices: Prices) -> Optional[OddsDelta]:
+        now = time.time()
+        key = (bookmaker, match_id)
+        self.seen += 1
+        self._maybe_prune(now)
+
+        previous = self._last.get(key)
+        if previous is None:
+            self._last[key] = (dict(prices), now, now)
+            self.emitted += 1
+            return OddsDelta(bookmaker, match_id, {sel: (None, new) for sel, new in prices.items()}, True)
+
+        old_prices, emitted_at, _ = previous
+        changes = {
+            sel: (old_prices.get(sel), new)
+            for sel, new in prices.items()
+            if old_prices.get(sel) != new
+        }
+        unwritten = key in self._unwritten
+        if not changes and not unwritten and now - emitted_at < self.refresh_after:
+            self._last[key] = (old_prices, emitted_at, now)
+            self.suppressed += 1
+            return None
+
+        if unwritten:
+            self._unwritten.discard(key)
+            self.rewritten += 1
+        elif not changes:
+            self.refreshed += 1
+        self._last[key] = (dict(prices), now, now)
+        self.emitted += 1
+        return OddsDelta(bookmaker, match_id, changes, False, unwritten)
+
+    def forget(self, bookmaker: str, match_id: str):
+        """Drop a fingerprint so the next diff re-emits (e.g. after a failed write)"""
+        self._last.pop((bookmaker, match_id), None)
+        self._unwritten.discard((bookmaker, match_id))
+
+    def mark_unwritten(self, bookmaker: str, match_id: str):
+        """
+        The emitted prices were not written (writes disabled): keep them for
+        change detection, but have the next diff emit the match in full
+        """
+        if (bookmaker, match_id) in self._last:
+            self._unwritten.add((bookmaker, match_id))
+
+    def _maybe_prune(self, now: float):
+        self._calls_since_prune += 1
+        if self._calls_since_prune < 1000:
+            return
+        self._calls_since_prune = 0
+        cutoff = now - self.forget_after
+        for key in [k for k, (_, _, seen) in self._last.items() if seen < cutoff]:
+            del self._last[key]
+            self._unwritten.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tracked": len(self._last),
+            "seen": self.seen,
+            "emitted": self.emitted,
+            "suppressed": self.suppressed,
+            "refreshed": self.refreshed,
+            "rewritten": self.rewritten,
+            "suppression_ratio": round(self.suppressed / self.seen, 4) if self.seen else 0.0,
+        }
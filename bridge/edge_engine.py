@@ -0,0 +1,153 @@
+"""
+Vantedge Naija Bridge - Edge Engine
+Vectorized de-vig, true edges and cross-bookmaker surebets over a whole league at once
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+SELECTIONS_1X2 = ("home", "draw", "away")
+DEVIG_METHODS = ("multiplicative", "power")
+
+
+def implied_probabilities(odds: np.ndarray) -> np.ndarray:
+    """1/odds, NaN where a price is missing (NaN, 0) or not a real price (<= 1)"""
+    odds = np.asarray(odds, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(odds > 1.0, 1.0 / odds, np.nan)
+
+
+def overround(odds: np.ndarray) -> np.ndarray:
+    """Bookmaker margin per row (sum of implied probabilities - 1); NaN if any selection is missing"""
+    return implied_probabilities(odds).sum(axis=-1) - 1.0
+
+
+def devig_multiplicative(odds: np.ndarray) -> np.ndarray:
+    """Fair probabilities by scaling every implied probability by the same factor"""
+    implied = implied_probabilities(odds)
+    return implied / implied.sum(axis=-1, keepdims=True)
+
+
+def devig_power(odds: np.ndarray, iterations: int = 20, tolerance: float = 1e-10) -> np.ndarray:
+    """
+    Fair probabilities p_i = q_i ** k with k solved per row so they sum to 1.
+    Shrinks longshots more than favourites (favourite-longshot bias), which
+    suits Pinnacle lines better than the multiplicative method. k is found
+    with Newton's method, all rows at once; it converges in a handful of steps.
+    """
+    implied = implied_probabilities(odds)
+    log_q = np.log(implied)
+    k = np.ones(implied.shape[:-1] + (1,))
+    for _ in range(iterations):
+        powered = np.exp(k * log_q)
+        excess = powered.sum(axis=-1, keepdims=True) - 1.0
+        # d/dk sum(q^k) = sum(q^k ln q) < 0, so Newton steps k upward for an overround
+        slope = (powered * log_q).sum(axis=-1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = k - excess / slope
+        if not np.nanmax(np.abs(excess), initial=0.0) > tolerance:
+            break
+    return np.exp(k * log_q)
+
+
+def devig(odds: np.ndarray, method: str = "power") -> np.ndarray:
+    if method == "multiplicative":
+        return devig_multiplicative(odds)
+    if method == "power":
+        return devig_power(odds)
+    raise ValueError(f"Unknown de-vig method {method!r}; use one of {DEVIG_METHODS}")
+
+
+class EdgeBatch:
+    """
+    Result of one `evaluate()` call for E events x B bookmakers x S selections.
+
+    fair:         (E, S) de-vigged sharp probabilities (NaN rows: no complete sharp line)
+    edges:        (E, B, S) expected value per unit stake, soft_price * fair - 1
+    best_price:   (E, S) highest soft price per selection
+    best_book:    (E, S) index of the bookmaker offering it (-1 if nobody does)
+    arb_margin:   (E,) 1 - sum(1 / best_price); > 0 is a guaranteed return
+    stakes:       (E, S) share of the bankroll per selection that equalizes the payout
+    """
+
+    __slots__ = ("bookmakers", "selections", "fair", "edges", "best_price", "best_book", "arb_margin", "stakes")
+
+    def __init__(self, bookmakers: Sequence[str], selections: Sequence[str], fair, edges, best_price, best_book, arb_margin, stakes):
+        self.bookmakers = list(bookmakers)
+        self.selections = list(selections)
+        self.fair = fair
+        self.edges = edges
+        self.best_price = best_price
+        self.best_book = best_book
+        self.arb_margin = arb_margin
+        self.stakes = stakes
+
+    def value_bets(self, min_edge: float = 0.0) -> List[Dict[str, Any]]:
+        """Every (event, bookmaker, selection) whose true edge is above `min_edge` (a fraction), best first"""
+        with np.errstate(invalid="ignore"):
+            hits = np.argwhere(self.edges > min_edge)
+        order = np.argsort(-self.edges[tuple(hits.T)], kind="stable") if len(hits) else []
+        return [
+            {
+                "event": int(e),
+                "bookmaker": self.bookmakers[b],
+                "selection": self.selections[s],
+                "edge": float(self.edges[e, b, s]),
+                "fair_probability": float(self.fair[e, s]),
+            }
+            for e, b, s in hits[order]
+        ]
+
+    def surebets(self, min_margin: float = 0.0) -> List[Dict[str, Any]]:
+        """Events where backing the best price of every selection, across bookmakers, locks in a profit"""
+        with np.errstate(invalid="ignore"):
+            hits = np.flatnonzero(self.arb_margin > min_margin)
+        hits = hits[np.argsort(-self.arb_margin[hits], kind="stable")]
+        return [
+            {
+                "event": int(e),
+                "margin": float(self.arb_margin[e]),
+                "legs": [
+                    {
+                        "selection": selection,
+                        "bookmaker": self.bookmakers[self.best_book[e, s]],
+                        "price": float(self.best_price[e, s]),
+                        "stake": float(self.stakes[e, s]),
+                    }
+                    for s, selection in enumerate(self.selections)
+                ],
+            }
+            for e in hits
+        ]
+
+
+def evaluate(soft: np.ndarray, sharp: Optional[np.ndarray], bookmakers: Sequence[str], selections: Sequence[str] = SELECTIONS_1X2, method: str = "power") -> EdgeBatch:
+    """
+    Score a whole league in one pass.
+
+    soft:  (E, B, S) soft bookmaker prices, NaN where a bookmaker has no price (B >= 1)
+    sharp: (E, S) sharp (Pinnacle) prices, NaN where unmatched; None skips edges
+    """
+    soft = np.asarray(soft, dtype=np.float64)
+    events, _, n_selections = soft.shape
+    if sharp is None:
+        fair = np.full((events, n_selections), np.nan)
+    else:
+        fair = devig(sharp, method)
+    with np.errstate(invalid="ignore"):
+        edges = soft * fair[:, None, :] - 1.0
+
+    # Cross-book surebets: best price per selection among the soft books
+    priced = np.where(soft > 1.0, soft, -np.inf)
+    best_book = priced.argmax(axis=1)
+    best_price = np.take_along_axis(priced, best_book[:, None, :], axis=1)[:, 0, :]
+    missing = ~np.isfinite(best_price)
+    best_price = np.where(missing, np.nan, best_price)
+    best_book = np.where(missing, -1, best_book)
+    inverse = 1.0 / best_price
+    book_sum = inverse.sum(axis=1)
+    arb_margin = 1.0 - book_sum
+    stakes = inverse / book_sum[:, None]
+
+    return EdgeBatch(bookmakers, selections, fair, edges, best_price, best_book, arb_margin, stakes)
@@ -0,0 +1,228 @@
+"""
+Vantedge Naija Bridge - Canonical Event Resolution
+Maps each bookmaker's native event ids to one cross-bookmaker event id through a persisted alias index
+"""
+
+import re
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sharp_matcher import (
+    MIN_MATCH_QUALITY,
+    name_similarity,
+    kickoff_timestamp,
+    normalize_team,
+    team_tokens,
+)
+
+# Two listings of the same pairing further apart than this are different fixtures
+KICKOFF_TOLERANCE_SECONDS = 3 * 3600
+
+_SLUG = re.compile(r"[^A-Za-z0-9]+")
+
+
+def _slug(normalized: str) -> str:
+    return _SLUG.sub("", normalized.title()) or "Unknown"
+
+
+def make_event_id(home: str, away: str, kickoff_ts: Optional[float]) -> str:
+    """HomeTeam_AwayTeam_<kickoff date, UTC> from normalized names (scrape date when kickoff is unknown)"""
+    day = datetime.fromtimestamp(kickoff_ts, timezone.utc) if kickoff_ts is not None else datetime.now(timezone.utc)
+    return f"{_slug(home)}_{_slug(away)}_{day.strftime('%Y%m%d')}"
+
+
+class CanonicalEvent:
+    """One real-world fixture, whichever bookmaker listed it first"""
+
+    __slots__ = ("event_id", "home_team", "away_team", "home_tokens", "away_tokens", "kickoff_ts", "league", "last_seen")
+
+    def __init__(self, event_id: str, home_team: str, away_team: str, kickoff_ts: Optional[float], league: Optional[str]):
+        self.event_id = event_id
+        self.home_team = home_team
+        self.away_team = away_team
+        self.home_tokens = team_tokens(home_team)
+        self.away_tokens = team_tokens(away_team)
+        self.kickoff_ts = kickoff_ts
+        self.league = league
+        self.last_seen = time.time()
+
+
+class EventResolver:
+    """
+    Resolves (bookmaker, native id) to a canonical event id.
+
+    A known alias is an O(1) dict probe. An unseen native id is matched against
+    known events by normalized team pair (then shortened names, as in
+    SharpOddsIndex) with kickoffs within `kickoff_tolerance`; failing that a new
+    canonical event is created. New aliases collect until `drain_aliases()` so
+    the caller can persist them (event_aliases table) and reload with `load()`.
+    """
+
+    def __init__(
+        self,
+        kickoff_tolerance: float = KICKOFF_TOLERANCE_SECONDS,
+        forget_after: float = 6 * 3600,
+    ):
+        self.kickoff_tolerance = kickoff_tolerance
+        self.forget_after = forget_after
+        self._new_aliases: List[Dict[str, Any]] = []
+
+        self.events: Dict[str, CanonicalEvent] = {}
+        self._aliases: Dict[Tuple[str, str], str] = {}
+        self._by_pair: Dict[Tuple[str, str], List[str]] = {}
+        self._home_tokens: Dict[str, List[str]] = {}
+        self._calls_since_prune = 0
+
+        self.alias_hits = 0
+        self.matched = 0
+        self.created = 0
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def _register(self, event: CanonicalEvent):
+        self.events[event.event_id] = event
+        self._by_pair.setdefault((event.home_team, event.away_team), []).append(event.event_id)
+        for token in event.home_tokens:
+            self._home_tokens.setdefault(token, []).append(event.event_id)
+
+    def _kickoff_ok(self, event: CanonicalEvent, kickoff_ts: Optional[float]) -> bool:
+        if kickoff_ts is None or event.kickoff_ts is None:
+            return True
+        return abs(event.kickoff_ts - kickoff_ts) <= self.kickoff_tolerance
+
+    def _match(self, home: str, away: str, kickoff_ts: Optional[float]) -> Optional[CanonicalEvent]:
+        for event_id in self._by_pair.get((home, away), ()):
+            event = self.events.get(event_id)
+            if event and self._kickoff_ok(event, kickoff_ts):
+                return event
+
+        home_tokens = team_tokens(home)
+        away_tokens = team_tokens(away)
+        best, best_score = None, 0.0
+        candidates = {eid for t in home_tokens for eid in self._home_tokens.get(t, ())}
+        for event_id in candidates:
+            event = self.events.get(event_id)
+            if event is None or not self._kickoff_ok(event, kickoff_ts):
+                continue
+            score = (
+                name_similarity(home_tokens, event.home_tokens)
+                * name_similarity(away_tokens, event.away_tokens)
+            )
+            # A shortened name only merges listings whose kickoffs are both known (and agree)
+            if score < 1.0 and (kickoff_ts is None or event.kickoff_ts is None):
+                continue
+            if score > best_score:
+                best, best_score = event, score
+        return best if best_score >= MIN_MATCH_QUALITY else None
+
+    def resolve(
+        self,
+        bookmaker: str,
+        native_id: Any,
+        home_team: str,
+        away_team: str,
+        kickoff: Any = None,
+        league: Optional[str] = None,
+    ) -> str:
+        """Canonical event id for one bookmaker listing"""
+        native = str(native_id or "")
+        key = (bookmaker.lower(), native)
+        if native:
+            event_id = self._aliases.get(key)
+            if event_id is not None and event_id in self.events:
+                self.alias_hits += 1
+                self.events[event_id].last_seen = time.time()
+                return event_id
+
+        self._maybe_prune()
+        kickoff_ts = kickoff_timestamp(kickoff)
+        home = normalize_team(home_team)
+        away = normalize_team(away_team)
+
+        event = self._match(home, away, kickoff_ts)
+        if event is not None:
+            self.matched += 1
+            if event.kickoff_ts is None:
+                event.kickoff_ts = kickoff_ts
+        else:
+            event_id = make_event_id(home, away, kickoff_ts)
+            # Same slug on another day's fixture (or a clashing spelling) - keep ids unique
+            if event_id in self.events:
+                event_id = f"{event_id}_{int(kickoff_ts or time.time()) % 100000}"
+            event = CanonicalEvent(event_id, home, away, kickoff_ts, league)
+            self._register(event)
+            self.created += 1
+        event.last_seen = time.time()
+
+        if native:
+            self._aliases[key] = event.event_id
+            self._new_aliases.append({
+                "bookmaker": key[0],
+                "native_id": native,
+                "event_id": event.event_id,
+                "home_team": event.home_team,
+                "away_team": event.away_team,
+                "league": event.league,
+                "kickoff_time": (
+                    datetime.fromtimestamp(event.kickoff_ts, timezone.utc).isoformat()
+                    if event.kickoff_ts is not None else None
+                ),
+            })
+        return event.event_id
+
+    def drain_aliases(self) -> List[Dict[str, Any]]:
+        """event_aliases rows created since the last drain"""
+        rows, self._new_aliases = self._new_aliases, []
+        return rows
+
+    def load(self, rows: List[Dict[str, Any]]) -> int:
+        """Rebuild the alias index from persisted event_aliases rows"""
+        loaded = 0
+        for row in rows or []:
+            event_id = row.get("event_id")
+            native = str(row.get("native_id") or "")
+            if not event_id or not native:
+                continue
+            if event_id not in self.events:
+                self._register(CanonicalEvent(
+                    event_id,
+                    row.get("home_team") or "",
+                    row.get("away_team") or "",
+                    kickoff_timestamp(row.get("kickoff_time")),
+                    row.get("league"),
+                ))
+            self._aliases[(str(row.get("bookmaker", "")).lower(), native)] = event_id
+            loaded += 1
+        return loaded
+
+    def _maybe_prune(self):
+        self._calls_since_prune += 1
+        if self._calls_since_prune < 1000:
+            return
+        self._calls_since_prune = 0
+        now = time.time()
+        stale = {
+            eid for eid, ev in self.events.items()
+            if (ev.kickoff_ts is not None and ev.kickoff_ts < now - self.forget_after)
+            or ev.last_seen < now - 2 * self.forget_after
+        }
+        if not stale:
+            return
+        for eid in stale:
+            del self.events[eid]
+        self._aliases = {k: v for k, v in self._aliases.items() if v not in stale}
+        self._by_pair = {k: [e for e in v if e not in stale] for k, v in self._by_pair.items()}
+        self._by_pair = {k: v for k, v in self._by_pair.items() if v}
+        self._home_tokens = {k: [e for e in v if e not in stale] for k, v in self._home_tokens.items()}
+        self._home_tokens = {k: v for k, v in self._home_tokens.items() if v}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "events": len(self.events),
+            "aliases": len(self._aliases),
+            "alias_hits": self.alias_hits,
+            "matched": self.matched,
+            "created": self.created,
+        }
@@ -0,0 +1,77 @@
+"""
+Vantedge Naija Bridge - Concurrent Fan-out
+Runs several scrapes at once with a per-source deadline and an overall request deadline
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+SourceFunc = Callable[[], Awaitable[Any]]
+
+
+async def _run_source(name: str, func: SourceFunc, timeout: float) -> Dict[str, Any]:
+    """Run a single source under its own deadline and time it"""
+    start = time.perf_counter()
+    try:
+        data = await asyncio.wait_for(func(), timeout=timeout)
+        return {
+            "status": "ok",
+            "elapsed_ms": int((time.perf_counter() - start) * 1000),
+            "data": data,
+        }
+    except asyncio.TimeoutError:
+        logger.warning(f"⏱️ {name} missed its {timeout}s deadline")
+        return {
+            "status": "timeout",
+            "elapsed_ms": int((time.perf_counter() - start) * 1000),
+            "error": f"Deadline of {timeout}s exceeded",
+        }
+    except Exception as e:
+        logger.error(f"Failed to fetch {name}: {e}")
+        return {
+            "status": "failed",
+            "elapsed_ms": int((time.perf_counter() - start) * 1000),
+            "error": str(e),
+        }
+
+
+async def fan_out(
+    sources: Dict[str, SourceFunc],
+    source_timeout: float,
+    overall_timeout: float,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Start every source concurrently and collect what finished in time.
+
+    Each source gets `source_timeout` seconds; anything still running when
+    `overall_timeout` expires is cancelled and reported as a timeout, so the
+    caller always gets a (possibly partial) answer within the overall deadline.
+    """
+    start = time.perf_counter()
+    tasks = {
+        name: asyncio.create_task(_run_source(name, func, source_timeout))
+        for name, func in sources.items()
+    }
+
+    done, pending = await asyncio.wait(tasks.values(), timeout=overall_timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    elapsed_ms = int((time.perf_counter() - start) * 1000)
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, task in tasks.items():
+        if task in done:
+            results[name] = task.result()
+        else:
+            results[name] = {
+                "status": "timeout",
+                "elapsed_ms": elapsed_ms,
+                "error": f"Request deadline of {overall_timeout}s exceeded",
+            }
+    return results
@@ -0,0 +1,73 @@
+"""
+Vantedge Naija Bridge - Fast JSON
+orjson when it is installed, the standard library otherwise, plus a response class that skips FastAPI's encoder
+"""
+
+import functools
+import json
+import logging
+from typing import Any, Callable, Union
+
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:  # optional dependency
+    orjson = None
+    HAS_ORJSON = False
+
+
+def _default(obj: Any) -> Any:
+    """Records (see records.py) serialize through to_dict(); anything else becomes a string"""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    return str(obj)
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Decode a JSON body straight from bytes"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode to UTF-8 JSON bytes"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered by `dumps` - records are written out without an intermediate dict tree"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route whose dict/list results are sent as FastJSONResponse, bypassing
+    jsonable_encoder. The decorated function itself is unchanged, so other
+    code can keep calling it and get plain Python objects back.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        original = endpoint
+
+        @functools.wraps(original)
+        async def endpoint(*args, **kw):
+            result = await original(*args, **kw)
+            return result if isinstance(result, Response) else self.wrap_result(result)
+
+        super().__init__(path, endpoint, **kwargs)
+
+    def wrap_result(self, result: Any) -> Response:
+        return FastJSONResponse(result)
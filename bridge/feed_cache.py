@@ -0,0 +1,114 @@
+"""
+Vantedge Naija Bridge - Feed Snapshot Cache
+Downloads a whole-sport feed once and serves every league from the parsed snapshot
+"""
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
+
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class FeedSnapshot(Generic[T]):
+    """A parsed feed plus when it was fetched"""
+
+    __slots__ = ("key", "value", "fetched_at", "fetch_ms")
+
+    def __init__(self, key: str, value: T, fetched_at: float, fetch_ms: int):
+        self.key = key
+        self.value = value
+        self.fetched_at = fetched_at
+        self.fetch_ms = fetch_ms
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.fetched_at
+
+
+class FeedSnapshotCache(Generic[T]):
+    """
+    Keeps the latest parsed snapshot per feed key (e.g. a SportyBet sport id).
+
+    Requests inside the freshness window are answered from the snapshot;
+    when it expires the next caller triggers one download and everyone
+    arriving meanwhile waits on that same download (single-flight).
+    """
+
+    def __init__(self, name: str, ttl: float = 30.0):
+        self.name = name
+        self.ttl = ttl
+        self._snapshots: Dict[str, FeedSnapshot[T]] = {}
+        self._flight = SingleFlight()
+
+        self.hits = 0
+        self.downloads = 0
+        self.download_failures = 0
+
+    def peek(self, key: str) -> Optional[FeedSnapshot[T]]:
+        return self._snapshots.get(key)
+
+    def clear(self):
+        """Drop every snapshot so the next get() downloads"""
+        self._snapshots.clear()
+
+    async def _download(self, key: str, loader: Callable[[str], Awaitable[T]]) -> FeedSnapshot[T]:
+        self.downloads += 1
+        start = time.perf_counter()
+        try:
+            value = await loader(key)
+        except Exception:
+            self.download_failures += 1
+            raise
+        snapshot = FeedSnapshot(key, value, time.time(), int((time.perf_counter() - start) * 1000))
+        self._snapshots[key] = snapshot
+        return snapshot
+
+    async def get(self, key: str, loader: Callable[[str], Awaitable[T]]) -> FeedSnapshot[T]:
+        """Fresh snapshot for key, downloading at most once across concurrent callers"""
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None and snapshot.age() < self.ttl:
+            self.hits += 1
+            return snapshot
+        return await self._flight.do(key, lambda: self._download(key, loader))
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "downloads": self.downloads,
+            "download_failures": self.download_failures,
+            "coalesced_downloads": self._flight.coalesced,
+            "snapshots": {
+                key: {"age_s": round(s.age(now), 1), "fetch_ms": s.fetch_ms}
+                for key, s in self._snapshots.items()
+            },
+        }
+
+
+class TournamentIndex:
+    """SportyBet tournaments indexed by id, with a squashed-name fallback"""
+
+    __slots__ = ("by_id", "by_name")
+
+    def __init__(self, tournaments: List[Dict]):
+        self.by_id: Dict[str, Dict] = {}
+        self.by_name: List[tuple] = []
+        for tournament in tournaments:
+            t_id = tournament.get("id", "")
+            if t_id:
+                self.by_id[t_id] = tournament
+            self.by_name.append((tournament.get("name", "").lower().replace(" ", ""), tournament))
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+    def select(self, target_ids: List[str], league: str) -> List[Dict]:
+        """Tournaments for a league: strict id match when ids are known, else loose name match"""
+        if target_ids:
+            return [self.by_id[t_id] for t_id in target_ids if t_id in self.by_id]
+        return [t for name, t in self.by_name if league in name]
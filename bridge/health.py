@@ -0,0 +1,196 @@
+"""
+Vantedge Naija Bridge - Scraper Health Aggregator
+Tracks rolling per-bookmaker scrape health in process and flushes one summary row per interval
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(ordered: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class BookmakerHealth:
+    """Rolling window of scrape outcomes for one bookmaker"""
+
+    def __init__(self, bookmaker: str, window: int):
+        self.bookmaker = bookmaker
+        # (timestamp, ok, latency_ms, records)
+        self.samples: Deque[Tuple[float, bool, int, int]] = deque(maxlen=window)
+        self.last_status = "healthy"
+        self.last_error: Optional[str] = None
+        self.last_success_at: Optional[float] = None
+        self.total_attempts = 0
+        self.total_errors = 0
+
+        # Since last flush
+        self.pending_attempts = 0
+        self.pending_successes = 0
+        self.pending_errors = 0
+        self.pending_records = 0
+        self.pending_latencies: List[int] = []
+
+    def record(self, status: str, latency_ms: int, records: int, error_count: int, error_msg: Optional[str]):
+        ok = status == "healthy"
+        now = time.time()
+        self.samples.append((now, ok, latency_ms, records))
+        self.last_status = status
+        self.total_attempts += 1
+        self.pending_attempts += 1
+        self.pending_records += records
+        if ok:
+            self.last_success_at = now
+            self.pending_successes += 1
+            self.pending_latencies.append(latency_ms)
+        else:
+            self.total_errors += max(1, error_count)
+            self.pending_errors += max(1, error_count)
+            if error_msg:
+                self.last_error = error_msg
+
+    def summary(self) -> Dict[str, Any]:
+        """Live aggregate over the rolling window"""
+        latencies = sorted(lat for _, ok, lat, _ in self.samples if ok)
+        attempts = len(self.samples)
+        successes = sum(1 for _, ok, _, _ in self.samples if ok)
+        return {
+            "status": self.last_status,
+            "window_attempts": attempts,
+            "success_rate": round(successes / attempts * 100, 1) if attempts else None,
+            "latency_p50_ms": percentile(latencies, 50),
+            "latency_p95_ms": percentile(latencies, 95),
+            "latency_p99_ms": percentile(latencies, 99),
+            "records_last": self.samples[-1][3] if self.samples else 0,
+            "total_attempts": self.total_attempts,
+            "total_errors": self.total_errors,
+            "last_error": self.last_error,
+            "last_successful_scrape": (
+                datetime.fromtimestamp(self.last_success_at, timezone.utc).isoformat()
+                if self.last_success_at else None
+            ),
+        }
+
+    def drain_row(self) -> Optional[Dict[str, Any]]:
+        """Summarize activity since the last flush into one scraper_health row"""
+        if not self.pending_attempts:
+            return None
+        success_rate = self.pending_successes / self.pending_attempts * 100
+        if success_rate == 100:
+            status = "healthy"
+        elif success_rate == 0:
+            status = self.last_status if self.last_status != "healthy" else "down"
+        else:
+            status = "degraded"
+        latencies = sorted(self.pending_latencies)
+        row = {
+            "bookmaker": self.bookmaker,
+            "scraper_type": "python-bridge",
+            "status": status,
+            "latency_ms": int(percentile(latencies, 50) or 0),
+            "success_rate": round(success_rate, 2),
+            "records_scraped": self.pending_records,
+            "error_count": self.pending_errors,
+            "error_message": self.last_error if self.pending_errors else None,
+            "last_successful_scrape": (
+                datetime.fromtimestamp(self.last_success_at, timezone.utc).isoformat()
+                if self.last_success_at else None
+            ),
+        }
+        self.pending_attempts = 0
+        self.pending_successes = 0
+        self.pending_errors = 0
+        self.pending_records = 0
+        self.pending_latencies = []
+        return row
+
+
+class HealthAggregator:
+    """
+    In-process replacement for one-row-per-scrape health logging.
+
+    `record()` is a cheap in-memory update on the hot path. A background task
+    writes one summarized `scraper_health` row per active bookmaker every
+    `flush_interval` seconds through `flush_func` (run in a worker thread).
+    """
+
+    def __init__(
+        self,
+        flush_func: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+        flush_interval: float = 60.0,
+        window: int = 200,
+    ):
+        self.flush_func = flush_func
+        self.flush_interval = flush_interval
+        self.window = window
+        self._bookmakers: Dict[str, BookmakerHealth] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self.rows_flushed = 0
+        self.flush_failures = 0
+
+    def record(
+        self,
+        bookmaker: str,
+        status: str,
+        latency_ms: int = 0,
+        records: int = 0,
+        error_count: int = 0,
+        error_msg: Optional[str] = None,
+    ):
+        health = self._bookmakers.get(bookmaker)
+        if health is None:
+            health = self._bookmakers[bookmaker] = BookmakerHealth(bookmaker, self.window)
+        health.record(status, latency_ms, records, error_count, error_msg)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: h.summary() for name, h in self._bookmakers.items()}
+
+    async def flush(self):
+        rows = [row for row in (h.drain_row() for h in self._bookmakers.values()) if row]
+        if not rows or not self.flush_func:
+            return
+        try:
+            if asyncio.iscoroutinefunction(self.flush_func):
+                await self.flush_func(rows)
+            else:
+                await asyncio.to_thread(self.flush_func, rows)
+            self.rows_flushed += len(rows)
+        except Exception as e:
+            self.flush_failures += 1
+            logger.error(f"Failed to flush scraper health: {e}")
+
+    async def _run(self):
+        # Woken early by stop(); a flush in progress always runs to completion
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="health-aggregator")
+
+    async def stop(self, timeout: float = 30.0):
+        if self._task:
+            self._stopping.set()
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"Scraper health flush still running after {timeout:g}s, abandoned")
+            except Exception as e:
+                logger.error(f"Scraper health aggregator failed: {e}")
+            self._task = None
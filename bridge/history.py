@@ -0,0 +1,142 @@
+"""
+Vantedge Naija Bridge - Odds History Sink
+Flattens scrapes into per-selection odds_snapshots rows and bulk-inserts them
+"""
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sharp_matcher import extract_pinnacle_h2h, kickoff_timestamp
+from write_pipeline import BatchWriter
+
+logger = logging.getLogger(__name__)
+
+SPORT = "soccer"
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts is not None else None
+
+
+class OddsHistorySink:
+    """
+    Append-only writer for `odds_snapshots`.
+
+    Rows are queued on a BatchWriter with large batches and flushed through a
+    single multi-row insert per batch. Rows without a usable kickoff are
+    skipped because `kickoff_time` is NOT NULL. Pinnacle prices are written
+    only when they moved since the last refresh recorded them.
+    """
+
+    def __init__(self, writer: BatchWriter, forget_after: float = 6 * 3600):
+        self.writer = writer
+        self.forget_after = forget_after
+        self.rows_skipped = 0
+        self.sharp_unchanged = 0
+        # OddsAPI match id -> (last recorded 1X2 prices, kickoff timestamp)
+        self._last_sharp: Dict[str, Tuple[Dict[str, float], Optional[float]]] = {}
+
+    @property
+    def running(self) -> bool:
+        return self.writer.running
+
+    def flatten(
+        self,
+        match_id: str,
+        match_name: str,
+        league: str,
+        kickoff: Any,
+        bookmaker: str,
+        markets: Dict[str, Dict[str, Optional[float]]],
+        is_sharp: bool = False,
+        scraped_at: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """One row per (market, selection) with a price"""
+        kickoff_iso = _iso(kickoff_timestamp(kickoff))
+        if kickoff_iso is None:
+            self.rows_skipped += sum(1 for sels in markets.values() for v in sels.values() if v)
+            return []
+        scraped_at = scraped_at or datetime.now(timezone.utc).isoformat()
+        return [
+            {
+                "match_id": match_id,
+                "match_name": match_name,
+                "sport": SPORT,
+                "league": league,
+                "kickoff_time": kickoff_iso,
+                "bookmaker": bookmaker,
+                "market": market,
+                "selection": selection,
+                "odds": price,
+                "is_sharp": is_sharp,
+                "scraped_at": scraped_at,
+            }
+            for market, selections in markets.items()
+            for selection, price in selections.items()
+            if price
+        ]
+
+    async def record_match(
+        self,
+        match_id: str,
+        match_name: str,
+        league: str,
+        kickoff: Any,
+        bookmaker: str,
+        markets: Dict[str, Dict[str, Optional[float]]],
+    ) -> int:
+        """Queue a soft-book match's prices"""
+        if not self.running:
+            return 0
+        rows = self.flatten(match_id, match_name, league, kickoff, bookmaker, markets)
+        return await self.writer.put_many(rows)
+
+    async def record_sharp(self, events: List[Dict], league: str) -> int:
+        """Queue the Pinnacle 1X2 prices from an OddsAPI response that moved since last recorded (is_sharp=true)"""
+        if not self.running:
+            return 0
+        self._prune_sharp()
+        scraped_at = datetime.now(timezone.utc).isoformat()
+        rows: List[Dict[str, Any]] = []
+        recorded: Dict[str, Tuple[Dict[str, float], Optional[float]]] = {}
+        for event in events:
+            prices = extract_pinnacle_h2h(event)
+            if not prices:
+                continue
+            event_id = event.get("id") or f"{event.get('home_team')}_{event.get('away_team')}_{event.get('commence_time')}"
+            match_id = f"oddsapi:{event_id}"
+            last = self._last_sharp.get(match_id)
+            moved = {sel: price for sel, price in prices.items() if last is None or last[0].get(sel) != price}
+            if not moved:
+                self.sharp_unchanged += 1
+                continue
+            rows.extend(self.flatten(
+                match_id,
+                f"{event.get('home_team')} vs {event.get('away_team')}",
+                league,
+                event.get("commence_time"),
+                "pinnacle",
+                {"1x2": moved},
+                is_sharp=True,
+                scraped_at=scraped_at,
+            ))
+            recorded[match_id] = (prices, kickoff_timestamp(event.get("commence_time")))
+        queued = await self.writer.put_many(rows)
+        # Rows the full queue dropped are retried on the next refresh
+        if queued == len(rows):
+            self._last_sharp.update(recorded)
+        return queued
+
+    def _prune_sharp(self):
+        cutoff = time.time() - self.forget_after
+        for match_id in [m for m, (_, kickoff) in self._last_sharp.items() if kickoff is not None and kickoff < cutoff]:
+            del self._last_sharp[match_id]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.writer.stats(),
+            "rows_skipped_no_kickoff": self.rows_skipped,
+            "sharp_unchanged_skipped": self.sharp_unchanged,
+        }
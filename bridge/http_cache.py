@@ -0,0 +1,209 @@
+"""
+Vantedge Naija Bridge - HTTP Caching
+Content-hash ETags, conditional GET, freshness-based Cache-Control and gzip/brotli negotiation for JSON routes
+"""
+
+import gzip
+import hashlib
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+import fastjson
+from fastjson import FastJSONRoute
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:  # optional dependency
+    brotli = None
+    HAS_BROTLI = False
+
+# Keys that change on every response without the odds changing; left out of the ETag
+VOLATILE_FIELDS = frozenset({"timestamp", "cached", "age_s", "stale_after", "stale", "timing", "retry_in_s"})
+
+# Keys that, when truthy anywhere in a payload, make it uncacheable: a fan-out with
+# failed or timed-out bookmakers, a scraper's fallback data, a stale or circuit-open snapshot
+UNCACHEABLE_FLAGS = frozenset({"partial", "degraded", "stale", "error"})
+
+
+def _strip_volatile(obj: Dict[str, Any], stale_after: List[float], flags: List[str]) -> Dict[str, Any]:
+    """
+    Copy of a payload without volatile keys, descending into nested dicts only
+    (e.g. /api/odds/all's per-bookmaker payloads). Match lists are shared, not copied.
+    Each `stale_after` and truthy uncacheable flag seen on the way is collected for Cache-Control.
+    """
+    out = {}
+    for key, value in obj.items():
+        if key in UNCACHEABLE_FLAGS and value:
+            flags.append(key)
+        if key in VOLATILE_FIELDS:
+            if key == "stale_after" and isinstance(value, str):
+                try:
+                    stale_after.append(datetime.fromisoformat(value).timestamp())
+                except ValueError:
+                    pass
+            continue
+        out[key] = _strip_volatile(value, stale_after, flags) if isinstance(value, dict) else value
+    return out
+
+
+def content_etag(content: Any) -> Tuple[str, int, Optional[float]]:
+    """
+    Weak ETag of the payload minus volatile fields, the size of that stable
+    body, and the earliest snapshot expiry found in it. The expiry is None
+    (not cacheable) for live scrapes and for partial, failed or fallback bodies.
+    """
+    stale_after: List[float] = []
+    flags: List[str] = []
+    stable = _strip_volatile(content, stale_after, flags) if isinstance(content, dict) else content
+    body = fastjson.dumps(stable)
+    digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+    return f'W/"{digest}"', len(body), min(stale_after) if stale_after and not flags else None
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison (RFC 9110 13.1.2): any listed tag equal to ours, or *"""
+    ours = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == ours:
+            return True
+    return False
+
+
+def negotiate_encoding(accept_encoding: str) -> str:
+    """Best encoding the client accepts: br (if installed), then gzip, else identity"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name] = q
+    wildcard = accepted.get("*", 0.0)
+    for encoding in (("br", "gzip") if HAS_BROTLI else ("gzip",)):
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return "identity"
+
+
+class _PendingJSON(Response):
+    """Endpoint result held unrendered until the request's validators have been checked"""
+
+    def __init__(self, content: Any):
+        super().__init__()
+        self.content = content
+
+
+class HTTPCache:
+    """
+    Turns JSON route results into cacheable responses:
+
+    - `ETag` hashed from the payload without volatile fields, so an unchanged
+      snapshot keeps its tag even though `timestamp`/`age_s` move on
+    - `If-None-Match` hit -> 304 with no body (and no render or compression)
+    - `Cache-Control: max-age` = seconds until the snapshot goes stale; `no-cache`
+      once stale, and for live scrapes and partial, failed or fallback bodies,
+      which are only reused after revalidating their ETag
+    - br/gzip bodies above `min_compress_size` bytes, with `Vary: Accept-Encoding`
+
+    Per-route counters back /metrics. Attach with
+    `APIRouter(route_class=cache.route_class)`.
+    """
+
+    def __init__(
+        self,
+        min_compress_size: int = 512,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+    ):
+        self.min_compress_size = min_compress_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.responses: Dict[Tuple[str, int], int] = defaultdict(int)
+        self.bytes_sent: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.bytes_uncompressed: Dict[str, int] = defaultdict(int)
+        cache = self
+
+        class CachedJSONRoute(FastJSONRoute):
+            def wrap_result(self, result: Any) -> Response:
+                return _PendingJSON(result)
+
+            def get_route_handler(self) -> Callable:
+                handler = super().get_route_handler()
+                path = self.path
+
+                async def app(request: Request) -> Response:
+                    response = await handler(request)
+                    if isinstance(response, _PendingJSON):
+                        return cache.respond(request, response.content, path)
+                    return response
+
+                return app
+
+        self.route_class = CachedJSONRoute
+
+    def cache_control(self, stale_after: Optional[float]) -> str:
+        max_age = 0 if stale_after is None else stale_after - time.time()
+        if max_age < 1:
+            return "no-cache"
+        return f"public, max-age={int(max_age)}"
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def respond(self, request: Request, content: Any, route: str) -> Response:
+        etag, stable_size, stale_after = content_etag(content)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": self.cache_control(stale_after),
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, etag):
+            self.responses[(route, 304)] += 1
+            # The body we skipped is at least the stable part of the payload
+            self.bytes_uncompressed[route] += stable_size
+            return Response(status_code=304, headers=headers)
+
+        body = fastjson.dumps(content)
+        self.responses[(route, 200)] += 1
+        self.bytes_uncompressed[route] += len(body)
+        encoding = "identity"
+        if len(body) >= self.min_compress_size:
+            encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+            if encoding != "identity":
+                body = self.compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+        self.bytes_sent[(route, encoding)] += len(body)
+        return Response(body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        routes = {}
+        for (route, status), count in self.responses.items():
+            entry = routes.setdefault(route, {"200": 0, "304": 0, "bytes_sent": 0, "bytes_uncompressed": 0})
+            entry[str(status)] += count
+        for (route, _), sent in self.bytes_sent.items():
+            routes.setdefault(route, {"200": 0, "304": 0, "bytes_sent": 0, "bytes_uncompressed": 0})["bytes_sent"] += sent
+        for route, entry in routes.items():
+            entry["bytes_uncompressed"] = self.bytes_uncompressed[route]
+            total = entry["200"] + entry["304"]
+            entry["not_modified_ratio"] = round(entry["304"] / total, 4) if total else 0.0
+            entry["bytes_saved"] = entry["bytes_uncompressed"] - entry["bytes_sent"]
+        return {"brotli": HAS_BROTLI, "routes": routes}
@@ -0,0 +1,229 @@
+"""
+Vantedge Naija Bridge - Pooled HTTP Client Registry
+One long-lived HTTP/2 client per upstream host with per-host concurrency limits
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Upstream hosts the bridge talks to
+DEFAULT_HOSTS = {
+    "sportybet": "https://www.sportybet.com",
+    "bet9ja": "https://sports.bet9ja.com",
+    "oddsapi": "https://api.the-odds-api.com",
+}
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After in seconds (the HTTP-date form is ignored)"""
+    value = response.headers.get("retry-after")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+class HostPool:
+    """A pooled client plus the semaphore and counters for one upstream host"""
+
+    def __init__(self, name: str, base_url: str, concurrency: int, latency_window: int = 200):
+        self.name = name
+        self.base_url = base_url
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.concurrency = concurrency
+        self.client: Optional[httpx.AsyncClient] = None
+        # Optional AdaptiveRateLimiter (see resilience.py)
+        self.limiter = None
+
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=latency_window)
+
+    def latency_percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return round(ordered[idx], 1)
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Open/idle connection counts read from the httpx connection pool"""
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return {}
+        idle = sum(1 for c in connections if c.is_idle())
+        return {"open": len(connections), "idle": idle}
+
+
+class ClientRegistry:
+    """
+    Registry of pooled `httpx.AsyncClient`s keyed by upstream name.
+
+    Clients are created once (in the FastAPI lifespan, or lazily on first use)
+    and reused for every scrape so DNS, TCP, TLS and HTTP/2 setup is paid once
+    per connection instead of once per request.
+    """
+
+    def __init__(
+        self,
+        hosts: Optional[Dict[str, str]] = None,
+        max_connections: int = 20,
+        max_keepalive: int = 10,
+        keepalive_expiry: float = 60.0,
+        per_host_concurrency: int = 8,
+        timeout: float = 30.0,
+        http2: bool = True,
+        transport_factory: Optional[Callable[[str], httpx.AsyncBaseTransport]] = None,
+        on_response: Optional[Callable[[str, Optional[int], float], None]] = None,
+        proxy_router=None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = http2
+        self.per_host_concurrency = per_host_concurrency
+        self.transport_factory = transport_factory
+        # Called with (host, status code or None on error, seconds) after every request
+        self.on_response = on_response
+        # Optional ProxyRouter (see proxy_router.py); hosts it routes go through the proxy pool
+        self.proxy_router = proxy_router
+        self._hosts: Dict[str, HostPool] = {}
+        for name, base_url in (hosts or DEFAULT_HOSTS).items():
+            self.register(name, base_url)
+
+    def register(self, name: str, base_url: str, concurrency: Optional[int] = None):
+        """Register an upstream host (the client itself is created on open/first use)"""
+        self._hosts[name] = HostPool(name, base_url, concurrency or self.per_host_concurrency)
+
+    def set_limiter(self, name: str, limiter):
+        """Pace requests to a host with a token bucket that adapts to its responses"""
+        self._hosts[name].limiter = limiter
+
+    def _create_client(self, host: HostPool) -> httpx.AsyncClient:
+        kwargs: Dict[str, Any] = {
+            "base_url": host.base_url,
+            "timeout": self.timeout,
+            "limits": self.limits,
+        }
+        if self.transport_factory:
+            kwargs["transport"] = self.transport_factory(host.name)
+        else:
+            kwargs["http2"] = self.http2
+        return httpx.AsyncClient(**kwargs)
+
+    async def open(self):
+        """Create clients for every registered host"""
+        for host in self._hosts.values():
+            if host.client is None or host.client.is_closed:
+                host.client = self._create_client(host)
+        logger.info(f"✅ HTTP client registry ready ({', '.join(self._hosts)})")
+
+    async def aclose(self):
+        """Close every pooled client"""
+        for host in self._hosts.values():
+            if host.client is not None and not host.client.is_closed:
+                await host.client.aclose()
+            host.client = None
+        logger.info("🛑 HTTP client registry closed")
+
+    async def warm(self, timeout: float = 5.0) -> Dict[str, Optional[float]]:
+        """
+        Open one connection per host (DNS, TCP, TLS, HTTP/2 settings) with a
+        HEAD request, all hosts at once, so the first scrape finds a warm
+        keep-alive connection. Returns milliseconds per host, None where it failed.
+        """
+        async def connect(host: HostPool) -> Optional[float]:
+            start = time.perf_counter()
+            try:
+                await self.client(host.name).head("/", timeout=timeout)
+            except httpx.HTTPError as e:
+                logger.warning(f"⚠️ Could not pre-connect to {host.name}: {e!r}")
+                return None
+            return round((time.perf_counter() - start) * 1000, 1)
+
+        hosts = list(self._hosts.values())
+        timings = await asyncio.gather(*(connect(host) for host in hosts))
+        return {host.name: ms for host, ms in zip(hosts, timings)}
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        """Pooled client for an upstream host"""
+        host = self._hosts[name]
+        if host.client is None or host.client.is_closed:
+            host.client = self._create_client(host)
+        return host.client
+
+    async def request(self, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the host's pooled client, bounded by its semaphore.
+        Hosts handled by the proxy router go out through a pool proxy instead,
+        falling back to the direct client when no proxy is eligible.
+        """
+        host = self._hosts[name]
+        router = self.proxy_router
+        if host.limiter is not None:
+            # Raises RateLimited rather than queueing past the limiter's wait budget
+            await host.limiter.acquire()
+        async with host.semaphore:
+            host.in_flight += 1
+            host.requests += 1
+            start = time.perf_counter()
+            status = None
+            try:
+                response = None
+                if router is not None and router.routes(name):
+                    response = await router.request(name, host.base_url, method, url, **kwargs)
+                if response is None:
+                    response = await self.client(name).request(method, url, **kwargs)
+                status = response.status_code
+                if host.limiter is not None:
+                    host.limiter.on_response(status, time.perf_counter() - start, _retry_after(response))
+                return response
+            except Exception:
+                host.errors += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                host.latencies_ms.append(elapsed * 1000)
+                host.in_flight -= 1
+                if self.on_response:
+                    self.on_response(name, status, elapsed)
+
+    async def get(self, name: str, url: str, **kwargs) -> httpx.Response:
+        return await self.request(name, "GET", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-host pool and latency stats"""
+        return {
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+            },
+            "hosts": {
+                name: {
+                    "base_url": host.base_url,
+                    "open": host.client is not None and not host.client.is_closed,
+                    "concurrency": host.concurrency,
+                    "in_flight": host.in_flight,
+                    "requests": host.requests,
+                    "errors": host.errors,
+                    "latency_p50_ms": host.latency_percentile(50),
+                    "latency_p99_ms": host.latency_percentile(99),
+                    "connections": host.connection_stats(),
+                    "rate_limit": host.limiter.stats() if host.limiter is not None else None,
+                }
+                for name, host in self._hosts.items()
+            },
+        }
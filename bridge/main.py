@@ -3,19 +3,80 @@ Vantedge Naija Bridge - FastAPI Service
 Scrapes Nigerian bookmakers using NaijaBet-Api library
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable, Union
 import os
+import asyncio
 import logging
-import httpx
+import time
 import random
+import tempfile
+
+from write_pipeline import BatchWriter
+from fanout import fan_out
+from http_pool import ClientRegistry
+from sharp_matcher import SharpOddsIndex, kickoff_timestamp
+from sharp_cache import SharpOddsCache
+from feed_cache import FeedSnapshotCache, TournamentIndex
+from scheduler import OddsSnapshotStore, PollScheduler
+from delta import DeltaTracker
+from history import OddsHistorySink
+from health import HealthAggregator
+from markets import decode_bet9ja, decode_sportybet, flatten_markets
+from events import EventResolver
+from board import OddsBoard
+from metrics import LoopLagMonitor, MetricsRegistry
+from replay import capture_factory
+from stream import OddsBroadcaster
+from proxy_router import ProxyRouter
+from resilience import AdaptiveRateLimiter, CircuitBreaker, CircuitOpenError, RateLimited
+from records import MatchRecord
+from shared_store import FileSnapshotBackend, LeaderElection, SharedReplica, open_backend
+import fastjson
+from http_cache import HTTPCache
+from opportunities import OpportunityIndex
+from pg_store import PostgresStore
+from startup import LazyModule, Readiness
+from checkpoint import CheckpointLog, Checkpointer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Heavy dependencies are imported on first use, or by the warm-up after the
+# app is already listening - not on the cold-start path (see startup.py)
+np = LazyModule("numpy")
+edge_engine = LazyModule("edge_engine")
+
+# Warm-up progress behind /ready (liveness stays on /health)
+readiness = Readiness()
+
+# Bookmaker-local kickoff strings (e.g. Bet9ja's "dd/mm HH:MM") are West Africa Time, which has no DST
+BOOKMAKER_TZ = timezone(timedelta(hours=1))
+LOCAL_KICKOFF_FORMATS = ("%d/%m/%Y %H:%M", "%d/%m/%y %H:%M", "%d.%m.%Y %H:%M", "%d/%m %H:%M")
+
+
+def _parse_local_kickoff(value: str) -> Optional[datetime]:
+    for fmt in LOCAL_KICKOFF_FORMATS:
+        try:
+            dt = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if "%Y" not in fmt and "%y" not in fmt:
+            # No year: pick the one that puts the kickoff nearest to today
+            now = datetime.now(BOOKMAKER_TZ)
+            dt = min(
+                (dt.replace(year=year) for year in (now.year - 1, now.year, now.year + 1)),
+                key=lambda d: abs(d.replace(tzinfo=BOOKMAKER_TZ) - now),
+            )
+        return dt.replace(tzinfo=BOOKMAKER_TZ)
+    return None
+
+
 def parse_kickoff(kickoff_val: Any) -> Optional[str]:
     """Parses kickoff time to ISO 8601 string or returns None."""
     if kickoff_val is None:
@@ -36,8 +97,18 @@ def parse_kickoff(kickoff_val: Any) -> Optional[str]:
                     return datetime.fromtimestamp(ts / 1000, timezone.utc).isoformat()
                 return datetime.fromtimestamp(ts, timezone.utc).isoformat()
             
-            # If it's a string, return as is (valid for ISO strings)
-            return kickoff_val
+            # ISO strings pass through once they are known to parse; anything
+            # else would fail the database cast for the whole batch
+            try:
+                datetime.fromisoformat(kickoff_val.replace("Z", "+00:00"))
+                return kickoff_val
+            except ValueError:
+                pass
+            local = _parse_local_kickoff(kickoff_val)
+            if local is not None:
+                return local.astimezone(timezone.utc).isoformat()
+            logger.warning(f"Unrecognised kickoff '{kickoff_val}', storing without one")
+            return None
             
         # If it's a number
         if isinstance(kickoff_val, (int, float)):
@@ -60,46 +131,66 @@ async def log_scraper_health(
     error_count: int = 0,
     error_msg: str = None
 ):
-    """Log scraper health status to Supabase"""
-    if not supabase_client: return
+    """Record scraper health in the in-process aggregator (flushed to Supabase periodically)"""
+    health_aggregator.record(bookmaker, status, latitude_ms, records_count, error_count, error_msg)
+    # The same outcome drives the scraper's circuit breaker
+    breaker = scraper_breakers.get(bookmaker)
+    if breaker is not None:
+        if status == "healthy":
+            breaker.record_success()
+        elif error_count:
+            breaker.record_failure(error_msg)
 
+# Supabase client, created during warm-up in the lifespan (see _connect_supabase)
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+supabase_client = None
+
+
+def _connect_supabase():
+    """
+    Import supabase and create the client (runs in a worker thread). create_client
+    only checks the key's shape, so one cheap read of scraper_health (a table
+    every deployment has) proves the key is accepted; a wrong URL or key fails
+    here, at startup, with the reason in /ready.
+    """
+    global supabase_client
+    from supabase import create_client
+
+    client = create_client(supabase_url=SUPABASE_URL, supabase_key=SUPABASE_KEY)
     try:
-        data = {
-            "bookmaker": bookmaker,
-            "scraper_type": "python-bridge",
-            "status": status,
-            "latency_ms": latitude_ms,
-            "records_scraped": records_count,
-            "error_count": error_count,
-            "error_message": error_msg,
-            "last_successful_scrape": datetime.now(timezone.utc).isoformat() if status == "healthy" else None
-        }
-        
-        supabase_client.from_("scraper_health").insert(data).execute()
+        client.from_("scraper_health").select("id").limit(1).execute()
     except Exception as e:
-        logger.error(f"Failed to log health for {bookmaker}: {e}")
-
-# Initialize Supabase client
-try:
-    from supabase import create_client, Client
-    SUPABASE_URL = os.getenv("SUPABASE_URL")
-    SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-    
-    if SUPABASE_URL and SUPABASE_KEY:
-        # Create client with minimal options to avoid compatibility issues
-        supabase_client: Optional[Client] = create_client(
-            supabase_url=SUPABASE_URL,
-            supabase_key=SUPABASE_KEY
-        )
-        logger.info("✅ Supabase client initialized")
-    else:
-        supabase_client = None
-        logger.warning("⚠️ Supabase credentials not configured")
-except Exception as e:
-    supabase_client = None
-    logger.warning(f"⚠️ Supabase initialization failed: {e}")
-    import traceback
-    logger.error(traceback.format_exc())
+        raise RuntimeError(f"Supabase rejected the connection check ({SUPABASE_URL}): {e}") from e
+    supabase_client = client
+    logger.info("✅ Supabase client initialized")
+
+# Optional direct Postgres connection for the background writers (see pg_store.py)
+DATABASE_URL = os.getenv("DATABASE_URL")
+pg_store = PostgresStore(
+    DATABASE_URL,
+    min_size=int(os.getenv("PG_POOL_MIN_SIZE", 1)),
+    max_size=int(os.getenv("PG_POOL_SIZE", 5)),
+    statement_cache_size=int(os.getenv("PG_STATEMENT_CACHE_SIZE", 100)),
+) if DATABASE_URL else None
+
+
+def database_available() -> bool:
+    return supabase_client is not None or (pg_store is not None and pg_store.available)
+
+
+def _direct_or_rest(method: str, rest_flush):
+    """Writer flush through the asyncpg pool when it is open, PostgREST otherwise or if the direct write fails"""
+    async def flush(rows: List[Dict]):
+        if pg_store is not None and pg_store.available:
+            try:
+                return await getattr(pg_store, method)(rows)
+            except Exception as e:
+                if supabase_client is None:
+                    raise
+                logger.warning(f"⚠️ Direct Postgres {method} failed, retrying over PostgREST: {e}")
+        return await asyncio.to_thread(rest_flush, rows)
+    return flush
 
 # JSON API scraper - The "Career" Method
 SCRAPER_AVAILABLE = True
@@ -108,16 +199,440 @@ logger.info("✅ Using JSON API scraper (Direct Interception)")
 # OddsAPI configuration for sharp bookmaker odds
 ODDS_API_KEY = os.getenv("ODDS_API_KEY", "9162d5a3703bba14dd84f046841ffa5a")
 ODDS_API_BASE = "https://api.the-odds-api.com/v4"
+# Sharp matches below this quality are dropped: a wrong fixture's prices would publish fake edges
+SHARP_MIN_MATCH_QUALITY = float(os.getenv("SHARP_MIN_MATCH_QUALITY", 0.8))
+
+# Prometheus-style metrics served at /metrics (see metrics.py)
+metrics = MetricsRegistry()
+STAGE_SECONDS = metrics.histogram(
+    "bridge_stage_seconds",
+    "Time spent per scrape stage (fetch, decode, parse, resolve, sharp, sync, total)",
+    ("bookmaker", "league", "stage"),
+)
+UPSTREAM_SECONDS = metrics.histogram(
+    "bridge_upstream_request_seconds", "Upstream HTTP request latency", ("host",)
+)
+UPSTREAM_RESPONSES = metrics.counter(
+    "bridge_upstream_responses_total", "Upstream HTTP responses by status code (error = no response)", ("host", "status")
+)
+LOOP_LAG_SECONDS = metrics.histogram(
+    "bridge_event_loop_lag_seconds", "How late periodic event-loop wakeups fire",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+loop_lag_monitor = LoopLagMonitor(LOOP_LAG_SECONDS.labels(), interval=float(os.getenv("LOOP_LAG_INTERVAL", 0.5)))
+
+
+def _record_upstream(host: str, status: Optional[int], elapsed: float):
+    UPSTREAM_SECONDS.labels(host).observe(elapsed)
+    UPSTREAM_RESPONSES.labels(host, status if status is not None else "error").inc()
+
+
+# Cache for sharp odds (to avoid hitting API limits) - see sharp_cache.py
+sharp_odds_cache = SharpOddsCache(
+    base_ttl=float(os.getenv("SHARP_ODDS_TTL", 900)),
+    min_ttl=float(os.getenv("SHARP_ODDS_MIN_TTL", 120)),
+    max_stale=float(os.getenv("SHARP_ODDS_MAX_STALE", 3600)),
+    max_entries=int(os.getenv("SHARP_ODDS_MAX_LEAGUES", 32)),
+)
+
+
+def _flush_value_bets(rows: List[Dict]):
+    """Upsert a batch of value bet rows with a single set-based RPC call"""
+    supabase_client.rpc("upsert_value_bets", {"p_rows": rows}).execute()
+
+
+# Last written prices per (bookmaker, match) - unchanged rows skip the database (see delta.py)
+delta_tracker = DeltaTracker(
+    refresh_after=float(os.getenv("DELTA_REFRESH_AFTER", 300))
+)
+
+
+def _forget_failed_value_bets(rows: List[Dict]):
+    """Make rows from a failed flush count as changed on the next scrape"""
+    for row in rows:
+        delta_tracker.forget(row["p_soft_bookie"], row["p_event_id"])
+
+
+# Background write pipeline for value_opportunities (see write_pipeline.py)
+value_bet_writer = BatchWriter(
+    "value_bets",
+    _direct_or_rest("upsert_value_bets", _flush_value_bets),
+    on_failure=_forget_failed_value_bets,
+    split_failed=True,
+    batch_size=int(os.getenv("SUPABASE_WRITE_BATCH_SIZE", 50)),
+    flush_interval=float(os.getenv("SUPABASE_WRITE_FLUSH_INTERVAL", 1.0)),
+    max_queue=int(os.getenv("SUPABASE_WRITE_MAX_QUEUE", 5000)),
+)
+
+
+def _flush_market_odds(rows: List[Dict]):
+    """Upsert a batch of per-market selection rows with a single set-based RPC call"""
+    supabase_client.rpc("upsert_market_odds", {"p_rows": rows}).execute()
+
+
+# Background write pipeline for value_opportunity_markets (every market beyond 1X2)
+market_odds_writer = BatchWriter(
+    "market_odds",
+    _direct_or_rest("upsert_market_odds", _flush_market_odds),
+    on_failure=_forget_failed_value_bets,
+    split_failed=True,
+    batch_size=int(os.getenv("MARKET_ODDS_BATCH_SIZE", 200)),
+    flush_interval=float(os.getenv("SUPABASE_WRITE_FLUSH_INTERVAL", 1.0)),
+    max_queue=int(os.getenv("MARKET_ODDS_MAX_QUEUE", 20000)),
+)
+
+
+# Shared pooled HTTP clients, one per upstream host (see http_pool.py)
+http_clients = ClientRegistry(
+    max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", 20)),
+    max_keepalive=int(os.getenv("HTTP_MAX_KEEPALIVE", 10)),
+    keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 60.0)),
+    per_host_concurrency=int(os.getenv("HTTP_HOST_CONCURRENCY", 8)),
+    on_response=_record_upstream,
+)
+
+# AIMD token bucket per upstream host: 429s and slow responses back off, fast successes speed up
+for _host in ("sportybet", "bet9ja", "oddsapi"):
+    http_clients.set_limiter(_host, AdaptiveRateLimiter(
+        _host,
+        rate=float(os.getenv("HTTP_RATE_LIMIT", 5)),
+        burst=int(os.getenv("HTTP_RATE_LIMIT_BURST", 5)),
+        min_rate=float(os.getenv("HTTP_RATE_LIMIT_MIN", 0.2)),
+        max_rate=float(os.getenv("HTTP_RATE_LIMIT_MAX", 20)),
+        latency_target=float(os.getenv("HTTP_LATENCY_TARGET", 5.0)),
+        max_wait=float(os.getenv("HTTP_RATE_LIMIT_MAX_WAIT", 10.0)),
+    ))
+
+# Record every raw upstream response to disk for offline replay (see replay.py, bench_replay.py)
+CAPTURE_DIR = os.getenv("CAPTURE_DIR")
+if CAPTURE_DIR:
+    http_clients.transport_factory = capture_factory(CAPTURE_DIR, http_clients.limits, http_clients.http2)
+    logger.info(f"📼 Capturing upstream responses to {CAPTURE_DIR}")
+
+
+def _flush_proxy_logs(rows: List[Dict]):
+    """Append a batch of proxy_logs rows with one multi-row insert"""
+    supabase_client.from_("proxy_logs").insert(rows).execute()
+
+
+def _flush_proxy_state(rows: List[Dict]):
+    """Upsert proxy_pool counters/status, keeping only the latest row per proxy"""
+    latest = {row["id"]: row for row in rows}
+    supabase_client.from_("proxy_pool").upsert(list(latest.values()), on_conflict="id").execute()
+
+
+proxy_log_writer = BatchWriter(
+    "proxy_logs",
+    _direct_or_rest("copy_proxy_logs", _flush_proxy_logs),
+    batch_size=int(os.getenv("PROXY_LOG_BATCH_SIZE", 200)),
+    flush_interval=float(os.getenv("PROXY_LOG_FLUSH_INTERVAL", 5.0)),
+    max_queue=int(os.getenv("PROXY_LOG_MAX_QUEUE", 10000)),
+)
+
+proxy_state_writer = BatchWriter(
+    "proxy_pool",
+    _direct_or_rest("upsert_proxy_state", _flush_proxy_state),
+    batch_size=100,
+    flush_interval=5.0,
+)
+
+# Scraper requests go out through proxy_pool exits when the pool has usable proxies (see proxy_router.py)
+proxy_router = ProxyRouter(
+    hosts=[h.strip() for h in os.getenv("PROXY_HOSTS", "sportybet,bet9ja").split(",") if h.strip()],
+    max_connections=int(os.getenv("PROXY_MAX_CONNECTIONS", 4)),
+    keepalive_expiry=http_clients.limits.keepalive_expiry,
+    timeout=http_clients.timeout,
+    http2=http_clients.http2,
+    scheme=os.getenv("PROXY_SCHEME", "http"),
+    username=os.getenv("PROXY_USERNAME"),
+    password=os.getenv("PROXY_PASSWORD"),
+    cooldown=float(os.getenv("PROXY_COOLDOWN", 300)),
+    max_cooldown=float(os.getenv("PROXY_MAX_COOLDOWN", 3600)),
+    ban_after=int(os.getenv("PROXY_BAN_AFTER", 6)),
+    direct_fallback=os.getenv("PROXY_DIRECT_FALLBACK", "true").lower() == "true",
+    identity=lambda: get_mobile_headers(),
+    log_writer=proxy_log_writer,
+    state_writer=proxy_state_writer,
+)
+http_clients.proxy_router = proxy_router
+
+
+async def _load_proxy_pool() -> List[Dict]:
+    if pg_store is not None and pg_store.available:
+        return await pg_store.fetch("SELECT * FROM public.proxy_pool")
+    response = await asyncio.to_thread(
+        lambda: supabase_client.from_("proxy_pool").select("*").execute()
+    )
+    return response.data or []
+
+
+def _flush_odds_history(rows: List[Dict]):
+    """Append a batch of odds_snapshots rows with one multi-row insert"""
+    supabase_client.from_("odds_snapshots").insert(rows).execute()
+
+
+# Append-only odds history (odds_snapshots) - large batches, see history.py
+odds_history = OddsHistorySink(BatchWriter(
+    "odds_history",
+    _direct_or_rest("copy_odds_snapshots", _flush_odds_history),
+    batch_size=int(os.getenv("ODDS_HISTORY_BATCH_SIZE", 500)),
+    flush_interval=float(os.getenv("ODDS_HISTORY_FLUSH_INTERVAL", 5.0)),
+    max_queue=int(os.getenv("ODDS_HISTORY_MAX_QUEUE", 20000)),
+))
+
+
+def _flush_scraper_health(rows: List[Dict]):
+    """Insert one summarized scraper_health row per bookmaker"""
+    supabase_client.from_("scraper_health").insert(rows).execute()
+
+
+# Rolling per-bookmaker health, summarized into scraper_health every interval (see health.py)
+health_aggregator = HealthAggregator(
+    _direct_or_rest("insert_scraper_health", _flush_scraper_health),
+    flush_interval=float(os.getenv("HEALTH_FLUSH_INTERVAL", 60)),
+    window=int(os.getenv("HEALTH_WINDOW", 200)),
+)
+
+
+# Canonical cross-bookmaker events and their persisted native-id aliases (see events.py)
+event_resolver = EventResolver(
+    kickoff_tolerance=float(os.getenv("EVENT_KICKOFF_TOLERANCE", 3 * 3600))
+)
+
+# Every bookmaker's price per canonical event, best price per selection (see board.py)
+odds_board = OddsBoard()
+
+# Current 1X2 value opportunities by league/market/bookmaker, ordered by edge (see opportunities.py)
+opportunity_index = OpportunityIndex(max_age=float(os.getenv("OPPORTUNITY_MAX_AGE", 3600)))
+
+# Push stream of price deltas and value edges for /stream/odds (see stream.py)
+odds_stream = OddsBroadcaster(
+    max_queue=int(os.getenv("STREAM_CLIENT_BUFFER", 256)),
+    max_subscribers=int(os.getenv("STREAM_MAX_SUBSCRIBERS", 5000)),
+    heartbeat=float(os.getenv("STREAM_HEARTBEAT", 15)),
+)
+
+
+def _flush_event_aliases(rows: List[Dict]):
+    """Upsert new (bookmaker, native id) -> event id aliases"""
+    supabase_client.from_("event_aliases").upsert(rows, on_conflict="bookmaker,native_id").execute()
+
+
+event_alias_writer = BatchWriter(
+    "event_aliases",
+    _direct_or_rest("upsert_event_aliases", _flush_event_aliases),
+    batch_size=200,
+    flush_interval=2.0,
+)
+
+
+async def _load_event_aliases():
+    """Reload aliases for fixtures that haven't finished yet so ids survive restarts"""
+    cutoff = datetime.fromtimestamp(
+        datetime.now(timezone.utc).timestamp() - event_resolver.forget_after, timezone.utc
+    ).isoformat()
+    try:
+        if pg_store is not None and pg_store.available:
+            rows = await pg_store.fetch(
+                "SELECT * FROM public.event_aliases WHERE kickoff_time >= $1", datetime.fromisoformat(cutoff)
+            )
+        else:
+            response = await asyncio.to_thread(
+                lambda: supabase_client.from_("event_aliases").select("*").gte("kickoff_time", cutoff).execute()
+            )
+            rows = response.data or []
+        loaded = event_resolver.load(rows)
+        logger.info(f"✅ Loaded {loaded} event aliases ({len(event_resolver)} events)")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not load event aliases: {e}")
+
+
+async def _warm_http_pools():
+    """Pre-connect to every upstream so the first scrape skips DNS/TCP/TLS setup"""
+    timings = await http_clients.warm()
+    if not any(ms is not None for ms in timings.values()):
+        raise RuntimeError("no upstream host reachable")
+    logger.info(f"✅ Upstream connections warm: {timings}")
+
+
+# How long scraping waits for the database warm-up, and the cap on its retry backoff
+DATABASE_WARM_UP_WAIT = float(os.getenv("DATABASE_WARM_UP_WAIT", 30))
+DATABASE_RETRY_MAX_BACKOFF = float(os.getenv("DATABASE_RETRY_MAX_BACKOFF", 60))
+
+
+async def _warm_database():
+    """
+    Create the Supabase client and open the asyncpg pool side by side, then
+    start the writers and reload persisted state (event aliases, proxy pool).
+    Raises while neither connection is up, so readiness retries it with backoff.
+    """
+    steps = []
+    if SUPABASE_URL and SUPABASE_KEY and supabase_client is None:
+        steps.append(asyncio.to_thread(_connect_supabase))
+    if pg_store is not None and not pg_store.available:
+        steps.append(pg_store.start())
+    errors = [r for r in await asyncio.gather(*steps, return_exceptions=True) if isinstance(r, Exception)]
+    if not database_available():
+        reason = errors[0] if errors else (pg_store.last_error if pg_store else None)
+        raise RuntimeError(f"no database connection ({reason})" if reason else "no database connection")
+    if errors:
+        logger.warning(f"⚠️ Supabase client unavailable, writing through Postgres only: {errors[0]}")
+    await event_alias_writer.start()
+    await value_bet_writer.start()
+    await market_odds_writer.start()
+    await odds_history.writer.start()
+    await health_aggregator.start()
+    await proxy_log_writer.start()
+    await proxy_state_writer.start()
+    await asyncio.gather(
+        _load_event_aliases(),
+        proxy_router.start(_load_proxy_pool, interval=float(os.getenv("PROXY_RELOAD_INTERVAL", 300))),
+    )
+
+
+async def _warm_sharp_odds():
+    """Fill the sharp odds cache for every league the scheduler polls (leader only: followers never scrape)"""
+    if leader_election and not leader_election.try_acquire():
+        return
+    leagues = sorted({league for _, league in odds_scheduler.jobs})
+    await asyncio.gather(*(sharp_odds_cache.get(league, _load_sharp_odds) for league in leagues))
+    logger.info(f"✅ Sharp odds cache warm for {len(leagues)} leagues")
+
+
+async def _start_checkpointing():
+    restored = await checkpointer.restore(_apply_checkpoint)
+    logger.info(f"♻️ Restored from {CHECKPOINT_PATH}: {restored}")
+    await checkpointer.start()
+
+
+async def _restore_checkpoint():
+    """Reload the last checkpoint and keep checkpointing - in the scrape leader, which owns the snapshots"""
+    if leader_election and not leader_election.try_acquire():
+        # Followers serve the leader's snapshots; a worker that takes over restores then
+        leader_election.on_elected(_start_checkpointing)
+        return
+    await _start_checkpointing()
+
+
+async def _load_edge_engine():
+    await asyncio.to_thread(edge_engine.load)
+
+
+def _plan_warm_up() -> Dict[str, Tuple[Callable[[], Awaitable[Any]], bool]]:
+    """Register every warm-up component with `readiness`; returns the steps to run as name -> (step, required)"""
+    steps = {"edge_engine": (_load_edge_engine, False)}
+    if checkpointer is not None:
+        steps["checkpoint"] = (_restore_checkpoint, False)
+    else:
+        readiness.skip("checkpoint", "CHECKPOINT_PATH is not set")
+    if http_clients.transport_factory is None:
+        steps["http_pools"] = (_warm_http_pools, False)
+    else:
+        readiness.skip("http_pools", "upstream responses are captured/replayed")
+    if (SUPABASE_URL and SUPABASE_KEY) or pg_store is not None:
+        steps["database"] = (_warm_database, True)
+    else:
+        readiness.skip("database", "SUPABASE_URL/SUPABASE_SERVICE_ROLE_KEY and DATABASE_URL are not set")
+    if SCHEDULER_ENABLED and ODDS_API_KEY and odds_scheduler.jobs:
+        steps["sharp_odds"] = (_warm_sharp_odds, False)
+    else:
+        readiness.skip("sharp_odds", "scheduler disabled")
+    for name, (_, required) in steps.items():
+        readiness.add(name, required)
+    return steps
+
+
+async def _warm_up(steps: Dict[str, Tuple[Callable[[], Awaitable[Any]], bool]]):
+    """Restore the checkpoint, run every other warm-up step concurrently, then start scraping"""
+    if "checkpoint" in steps:
+        # First, so the sharp odds warm-up finds checkpointed leagues already cached
+        step, required = steps.pop("checkpoint")
+        await readiness.run("checkpoint", step, required)
+    database = None
+    if "database" in steps:
+        # Retried with backoff until it connects: a database that is down at boot
+        # keeps /ready at 503 instead of leaving the process without writers for good
+        step, required = steps.pop("database")
+        database = asyncio.create_task(
+            readiness.run("database", step, required, retry=True, max_backoff=DATABASE_RETRY_MAX_BACKOFF),
+            name="warm-up-database",
+        )
+    try:
+        await asyncio.gather(*(readiness.run(name, step, required) for name, (step, required) in steps.items()))
+        if database is not None:
+            # Scheduled scrapes start once the writers are up, so no early delta goes
+            # unwritten - unless the database is still retrying, then scrape regardless
+            await asyncio.wait({database}, timeout=DATABASE_WARM_UP_WAIT)
+        if leader_election:
+            # Every worker competes for the lock; a follower takes over when the leader exits.
+            # Runs with the scheduler off too: checkpointing and view publishing are leader-only
+            leader_election.on_elected(_start_publishing_views)
+            if SCHEDULER_ENABLED:
+                leader_election.on_elected(odds_scheduler.start)
+            await leader_election.start()
+        elif SCHEDULER_ENABLED:
+            await odds_scheduler.start()
+        if database is not None:
+            await database
+    finally:
+        if database is not None and not database.done():
+            database.cancel()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the HTTP pools and hand the rest of start-up (database, caches, heavy
+    imports, scheduler) to a background warm-up, so the port opens at once:
+    /health answers immediately, /ready once the warm-up is done. Drain everything on shutdown.
+    """
+    await http_clients.open()
+    await loop_lag_monitor.start()
+    warm_up = asyncio.create_task(_warm_up(_plan_warm_up()), name="warm-up")
+    yield
+    if not warm_up.done():
+        warm_up.cancel()
+    try:
+        await warm_up
+    except asyncio.CancelledError:
+        pass
+    for replica in (board_replica, opportunity_replica):
+        if replica is not None:
+            # Final publish while this worker still holds the leader lock
+            await replica.stop()
+    if leader_election:
+        await leader_election.stop()
+    await odds_scheduler.stop()
+    if checkpointer is not None:
+        await checkpointer.stop()
+    await proxy_router.aclose()
+    await proxy_log_writer.stop()
+    await proxy_state_writer.stop()
+    await value_bet_writer.stop()
+    await market_odds_writer.stop()
+    await odds_history.writer.stop()
+    await health_aggregator.stop()
+    await event_alias_writer.stop()
+    await loop_lag_monitor.stop()
+    await http_clients.aclose()
+    if pg_store is not None:
+        await pg_store.close()
 
-# Cache for sharp odds (to avoid hitting API limits)
-sharp_odds_cache: Dict[str, Dict] = {}
 
 # Initialize FastAPI
 app = FastAPI(
     title="Vantedge Naija Bridge",
     description="Odds scraping service for Nigerian bookmakers",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Odds routes return MatchRecords, written straight to JSON bytes (see fastjson.py),
+# with content ETags, 304s, freshness-based Cache-Control and br/gzip (see http_cache.py)
+odds_http_cache = HTTPCache(
+    min_compress_size=int(os.getenv("HTTP_COMPRESS_MIN_SIZE", 512)),
 )
+odds_router = APIRouter(route_class=odds_http_cache.route_class)
 
 # CORS Configuration
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
@@ -127,6 +642,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # League mapping
@@ -152,9 +668,19 @@ async def root():
         "naijabet_api": "mock_data" if SCRAPER_AVAILABLE else "not_available",
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
+            "metrics": "/metrics",
+            "pool_stats": "/api/pool/stats",
+            "cache_stats": "/api/cache/stats",
+            "scheduler_stats": "/api/scheduler/stats",
+            "board": "/api/board/{league}",
+            "stream": "/stream/odds?leagues={league}&bookmakers={bookie}&min_edge={pct}",
+            "board_event": "/api/board/event/{event_id}",
             "bet9ja": "/api/odds/bet9ja/{league}",
             "betking": "/api/odds/betking/{league}",
-            "sportybet": "/api/odds/sportybet/{league}"
+            "sportybet": "/api/odds/sportybet/{league}",
+            "all": "/api/odds/all/{league}",
+            "all_multi": "/api/odds/all?leagues={league},{league}"
         },
         "supported_leagues": list(LEAGUE_MAP.keys())
     }
@@ -167,10 +693,158 @@ async def health_check():
         "status": "healthy",
         "service": "naija-bridge",
         "timestamp": datetime.now().isoformat(),
-        "scraper_available": SCRAPER_AVAILABLE
+        "scraper_available": SCRAPER_AVAILABLE,
+        "scrapers": health_aggregator.snapshot(),
+        "writers": {
+            "value_bets": value_bet_writer.stats(),
+            "market_odds": market_odds_writer.stats(),
+            "event_aliases": event_alias_writer.stats(),
+            "odds_history": odds_history.stats(),
+            "proxy_logs": proxy_log_writer.stats()
+        },
+        "database": {
+            "backend": "postgres" if pg_store is not None and pg_store.available else ("postgrest" if supabase_client else None),
+            "postgres": pg_store.stats() if pg_store is not None else None,
+        },
+        "proxies": proxy_router.stats(),
+        "deltas": delta_tracker.stats(),
+        "events": event_resolver.stats(),
+        "stream": odds_stream.stats(),
+        "opportunities": opportunity_index.stats(),
+        "worker": leader_election.stats() if leader_election else {"role": "single", "pid": os.getpid()},
+        "shared_views": {r.document.key: r.stats() for r in (board_replica, opportunity_replica) if r is not None},
+        "ready": readiness.ready,
+        "breakers": {name: breaker.stats() for name, breaker in scraper_breakers.items()}
+    }
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 200 once warm-up is done, 503 while it runs or if a required step (the database) failed"""
+    return JSONResponse(readiness.stats(), status_code=200 if readiness.ready else 503)
+
+
+@app.get("/api/pool/stats")
+async def pool_stats():
+    """Connection pool and latency stats for each upstream host"""
+    return http_clients.stats()
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Hit/miss/refresh counters for the sharp odds cache and bookmaker feed snapshots"""
+    return {
+        "sharp_odds": sharp_odds_cache.stats(),
+        "sportybet_feed": sportybet_snapshots.stats(),
+        "http": odds_http_cache.stats(),
+        "checkpoint": checkpointer.stats() if checkpointer else None
+    }
+
+
+def _background_writers() -> Dict[str, BatchWriter]:
+    return {
+        "value_bets": value_bet_writer,
+        "market_odds": market_odds_writer,
+        "odds_history": odds_history.writer,
+        "event_aliases": event_alias_writer,
+        "proxy_logs": proxy_log_writer,
+        "proxy_pool": proxy_state_writer,
     }
 
 
+def _cache_lookups():
+    sharp = sharp_odds_cache.stats()
+    feed = sportybet_snapshots.stats()
+    yield {"cache": "sharp_odds", "result": "hit"}, sharp["hits"]
+    yield {"cache": "sharp_odds", "result": "stale"}, sharp["stale_hits"]
+    yield {"cache": "sharp_odds", "result": "miss"}, sharp["misses"]
+    yield {"cache": "sportybet_feed", "result": "hit"}, feed["hits"]
+    yield {"cache": "sportybet_feed", "result": "miss"}, feed["downloads"]
+
+
+def _cache_hit_ratios():
+    sharp = sharp_odds_cache.stats()
+    feed = sportybet_snapshots.stats()
+    feed_lookups = feed["hits"] + feed["downloads"]
+    yield {"cache": "sharp_odds"}, sharp["hit_ratio"]
+    yield {"cache": "sportybet_feed"}, round(feed["hits"] / feed_lookups, 4) if feed_lookups else 0.0
+    yield {"cache": "delta_suppression"}, delta_tracker.stats()["suppression_ratio"]
+
+
+def _writer_depths():
+    for name, writer in _background_writers().items():
+        yield {"writer": name}, writer.depth
+
+
+def _writer_rows():
+    for name, writer in _background_writers().items():
+        yield {"writer": name, "outcome": "flushed"}, writer.rows_flushed
+        yield {"writer": name, "outcome": "dropped"}, writer.rows_dropped
+        yield {"writer": name, "outcome": "failed"}, writer.rows_failed
+
+
+metrics.counter_func("bridge_cache_lookups_total", "Cache lookups by cache and result", _cache_lookups)
+metrics.gauge_func("bridge_cache_hit_ratio", "Cache hit ratio (stale hits count as hits)", _cache_hit_ratios)
+metrics.gauge_func("bridge_writer_queue_depth", "Rows waiting in each background writer queue", _writer_depths)
+metrics.counter_func("bridge_writer_rows_total", "Rows handled by each background writer", _writer_rows)
+metrics.gauge_func(
+    "bridge_event_loop_lag_last_seconds", "Most recent event-loop lag sample",
+    lambda: [({}, loop_lag_monitor.last_lag)],
+)
+metrics.gauge_func(
+    "bridge_stream_subscribers", "Connected /stream/odds subscribers",
+    lambda: [({}, len(odds_stream))],
+)
+metrics.counter_func(
+    "bridge_stream_dropped_subscribers_total", "Stream subscribers dropped for falling behind",
+    lambda: [({}, odds_stream.dropped_subscribers)],
+)
+metrics.gauge_func(
+    "bridge_circuit_state", "Scraper circuit breaker state (0 closed, 1 half-open, 2 open)",
+    lambda: [
+        ({"scraper": name}, {"closed": 0, "half_open": 1, "open": 2}[breaker.state])
+        for name, breaker in scraper_breakers.items()
+    ],
+)
+metrics.gauge_func(
+    "bridge_upstream_rate_limit", "Current adaptive request rate per upstream host (req/s)",
+    lambda: [
+        ({"host": host}, stats["rate_limit"]["rate"])
+        for host, stats in http_clients.stats()["hosts"].items() if stats["rate_limit"]
+    ],
+)
+metrics.counter_func(
+    "bridge_http_responses_total", "Odds route responses by status (200 full body, 304 not modified)",
+    lambda: [({"route": route, "status": str(status)}, count) for (route, status), count in odds_http_cache.responses.items()],
+)
+metrics.counter_func(
+    "bridge_http_response_bytes_total", "Odds route body bytes on the wire by content encoding",
+    lambda: [({"route": route, "encoding": encoding}, sent) for (route, encoding), sent in odds_http_cache.bytes_sent.items()],
+)
+metrics.counter_func(
+    "bridge_http_uncompressed_bytes_total", "Odds route body bytes before compression, including bodies a 304 avoided",
+    lambda: [({"route": route}, size) for route, size in odds_http_cache.bytes_uncompressed.items()],
+)
+metrics.gauge_func(
+    "bridge_http_not_modified_ratio", "Share of odds route responses answered with 304",
+    lambda: [({"route": route}, entry["not_modified_ratio"]) for route, entry in odds_http_cache.stats()["routes"].items()],
+)
+metrics.gauge_func(
+    "bridge_opportunities", "Entries in the in-memory opportunity index",
+    lambda: [({}, len(opportunity_index))],
+)
+metrics.gauge_func(
+    "bridge_board_events", "Canonical events on the merged odds board",
+    lambda: [({}, len(odds_board))],
+)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """Prometheus text exposition of stage timings, upstream status codes, caches, queues and loop lag"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 async def scrape_bet9ja_simple(league: str) -> List[Dict]:
     """Simple HTTP scraper for Bet9ja (demo/placeholder)"""
     # This is a placeholder - returns mock data
@@ -213,132 +887,252 @@ def get_mobile_headers() -> Dict[str, str]:
 
 
 
-async def get_sharp_odds_for_league(league: str) -> List[Dict]:
-    """Retrieve all sharp odds for a league (cached)"""
-    # Map league to OddsAPI sport key
-    sport_map = {
-        "premierleague": "soccer_epl",
-        "laliga": "soccer_spain_la_liga",
-        "seriea": "soccer_italy_serie_a",
-        "bundesliga": "soccer_germany_bundesliga",
-        "ligue1": "soccer_france_ligue_one",
-        "npfl": "soccer_epl",
-        "ucl": "soccer_uefa_champs_league",
+SHARP_SPORT_MAP = {
+    "premierleague": "soccer_epl",
+    "laliga": "soccer_spain_la_liga",
+    "seriea": "soccer_italy_serie_a",
+    "bundesliga": "soccer_germany_bundesliga",
+    "ligue1": "soccer_france_ligue_one",
+    "npfl": "soccer_epl",
+    "ucl": "soccer_uefa_champs_league",
+}
+
+
+async def _load_sharp_odds(league: str) -> Optional[List[Dict]]:
+    """Fetch a league's Pinnacle odds from OddsAPI; None on failure so the cache keeps stale data"""
+    if not ODDS_API_KEY:
+        return []
+
+    sport_key = SHARP_SPORT_MAP.get(league.lower(), "soccer_epl")
+    url = f"{ODDS_API_BASE}/sports/{sport_key}/odds"
+    params = {
+        "apiKey": ODDS_API_KEY,
+        "regions": "us,uk",
+        "markets": "h2h",
+        "oddsFormat": "decimal",
+        "bookmakers": "pinnacle"
     }
     
-    sport_key = sport_map.get(league.lower(), "soccer_epl")
+    response = await http_clients.get("oddsapi", url, params=params, timeout=10.0)
+    
+    if response.status_code == 200:
+        data = fastjson.loads(response.content)
+        logger.info(f"✅ Refreshed sharp odds cache for {league}")
+        await odds_history.record_sharp(data, league)
+        return data
     
-    # Check cache (15 minutes TTL)
-    if league in sharp_odds_cache:
-        cached = sharp_odds_cache[league]
-        if datetime.now().timestamp() - cached.get('timestamp', 0) < 900:
-            return cached.get('matches', [])
+    logger.warning(f"OddsAPI error {response.status_code}")
+    return None
 
-    if not ODDS_API_KEY:
-        return []
 
+async def get_sharp_odds_for_league(league: str) -> List[Dict]:
+    """Retrieve all sharp odds for a league (cached, stale-while-revalidate)"""
     try:
-        url = f"{ODDS_API_BASE}/sports/{sport_key}/odds"
-        params = {
-            "apiKey": ODDS_API_KEY,
-            "regions": "us,uk",
-            "markets": "h2h",
-            "oddsFormat": "decimal",
-            "bookmakers": "pinnacle"
-        }
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                # Update cache
-                sharp_odds_cache[league] = {
-                    "timestamp": datetime.now().timestamp(),
-                    "matches": data
-                }
-                logger.info(f"✅ Refreshed sharp odds cache for {league}")
-                return data
-            else:
-                logger.warning(f"OddsAPI error {response.status_code}")
-                return []
+        entry = await sharp_odds_cache.get(league, _load_sharp_odds)
+        return entry.events if entry else []
     except Exception as e:
         logger.error(f"❌ Sharp odds fetch error: {e}")
         return []
 
 
-async def fetch_sharp_odds(home_team: str, away_team: str, league: str) -> Dict:
+async def get_sharp_index_for_league(league: str) -> SharpOddsIndex:
+    """Matcher index over the league's cached sharp odds (built once per cache refresh)"""
+    entry = await sharp_odds_cache.get(league, _load_sharp_odds)
+    return entry.index if entry else SharpOddsIndex([])
+
+
+async def fetch_sharp_odds(home_team: str, away_team: str, league: str, kickoff: Any = None) -> Dict:
     """
     Fetch sharp bookmaker odds from OddsAPI (Pinnacle)
-    Uses the league-level cache to prevent 429 errors
+    Uses the league-level cache to prevent 429 errors and the precomputed
+    SharpOddsIndex for matching; `quality` is the match-quality score (0-1).
+    Prices are None when the match is below SHARP_MIN_MATCH_QUALITY.
     """
     try:
-        events = await get_sharp_odds_for_league(league)
-        home_team = home_team.lower()
-        away_team = away_team.lower()
-
-        # Find matching event
-        for event in events:
-            ev_home = event.get('home_team', '').lower()
-            ev_away = event.get('away_team', '').lower()
-            
-            # Fuzzy match
-            if (home_team in ev_home or ev_home in home_team) and \
-               (away_team in ev_away or ev_away in away_team):
-                
-                # Extract Pinnacle odds
-                for bookmaker in event.get('bookmakers', []):
-                    if bookmaker.get('key') == 'pinnacle':
-                        for market in bookmaker.get('markets', []):
-                            if market.get('key') == 'h2h':
-                                sharp = {"home": None, "draw": None, "away": None}
-                                for outcome in market.get('outcomes', []):
-                                    name = outcome.get('name', '').lower()
-                                    if ev_home in name: sharp['home'] = outcome.get('price')
-                                    elif ev_away in name: sharp['away'] = outcome.get('price')
-                                    elif 'draw' in name: sharp['draw'] = outcome.get('price')
-                                return sharp
-        
-        return {"home": None, "draw": None, "away": None}
+        index = await get_sharp_index_for_league(league)
+        prices, quality = index.lookup(home_team, away_team, kickoff)
+        if quality < SHARP_MIN_MATCH_QUALITY:
+            prices = {"home": None, "draw": None, "away": None}
+        return {**prices, "quality": quality}
 
     except Exception as e:
         logger.error(f"❌ Logic error in sharp odds lookup: {e}")
-        return {"home": None, "draw": None, "away": None}
+        return {"home": None, "draw": None, "away": None, "quality": 0.0}
+
+
+def resolve_event(match_data: Dict, bookmaker: str, league: str) -> str:
+    """Canonical event id for a scraped match (alias index first, then team names + kickoff)"""
+    return event_resolver.resolve(
+        bookmaker,
+        match_data.get('id'),
+        match_data.get('home_team', ''),
+        match_data.get('away_team', ''),
+        match_data.get('kickoff'),
+        league,
+    )
+
+
+async def ingest_match(match_data: Dict, soft_bookie: str, league: str):
+    """Resolve a scraped match to its canonical event, merge it into the board and sync it"""
+    started = time.perf_counter()
+    event_id = resolve_event(match_data, soft_bookie, league)
+    match_data["event_id"] = event_id
+    event = event_resolver.events.get(event_id)
+    odds_board.update(
+        event_id,
+        league,
+        match_data.get('home_team', ''),
+        match_data.get('away_team', ''),
+        event.kickoff_ts if event else None,
+        soft_bookie,
+        match_data.get('markets') or {"1x2": match_data.get('odds', {})},
+    )
+    STAGE_SECONDS.labels(soft_bookie.lower(), league, "resolve").observe(time.perf_counter() - started)
+    for row in event_resolver.drain_aliases():
+        await event_alias_writer.put(row)
+    await sync_to_supabase(match_data, soft_bookie, league)
+
+
+def _value_edges(odds: Dict, sharp_odds: Dict) -> Dict[str, float]:
+    """1X2 edge % of the soft price over the sharp price (same formula as upsert_value_bets)"""
+    return {
+        sel: round((odds[sel] / sharp_odds[sel] - 1.0) * 100, 2)
+        for sel in ("home", "draw", "away")
+        if odds.get(sel) and sharp_odds.get(sel)
+    }
+
+
+def _publish_odds_change(match_data: Dict, event_id: str, match_name: str, soft_bookie: str, league: str, delta, odds: Dict, sharp_odds: Dict):
+    """Push a price delta, plus any positive 1X2 edges it touched, to /stream/odds subscribers"""
+    edges = _value_edges(odds, sharp_odds)
+    best_edge = max(edges.values()) if edges else None
+    base = {
+        "event_id": event_id,
+        "league": league,
+        "bookmaker": soft_bookie,
+        "match_name": match_name,
+        "kickoff": match_data.get('kickoff'),
+    }
+    odds_stream.publish("odds", league, soft_bookie, {
+        **base,
+        "is_new": delta.is_new,
+        "changes": delta.as_dict()["changes"],
+        "best_edge": best_edge,
+    }, edge=best_edge)
+    for sel, edge in edges.items():
+        if edge <= 0:
+            continue
+        if delta.is_new or f"1x2:{sel}" in delta.changes or f"sharp_{sel}" in delta.changes:
+            odds_stream.publish("edge", league, soft_bookie, {
+                **base,
+                "selection": sel,
+                "soft_odds": odds.get(sel),
+                "sharp_odds": sharp_odds.get(sel),
+                "edge": edge,
+            }, edge=edge)
+
+
+def _index_opportunities(match_data: Dict, event_id: str, match_name: str, soft_bookie: str, league: str, odds: Dict, sharp_odds: Dict):
+    """Refresh this match's 1X2 entries in the opportunity index (raw edge as in value_opportunities, plus the de-vigged edge)"""
+    edges = _value_edges(odds, sharp_odds)
+    fair = {}
+    if all(sharp_odds.get(sel) for sel in edge_engine.SELECTIONS_1X2):
+        probs = edge_engine.devig_power(np.array([[sharp_odds[sel] for sel in edge_engine.SELECTIONS_1X2]]))[0]
+        fair = dict(zip(edge_engine.SELECTIONS_1X2, probs.tolist()))
+    event = event_resolver.events.get(event_id)
+    opportunity_index.set_prices(
+        event_id,
+        league,
+        soft_bookie,
+        "1x2",
+        event.kickoff_ts if event and event.kickoff_ts else kickoff_timestamp(match_data.get('kickoff')),
+        {
+            sel: (edge, {
+                "match_name": match_name,
+                "soft_odds": odds[sel],
+                "sharp_bookmaker": "Pinnacle",
+                "sharp_odds": sharp_odds[sel],
+                "fair_probability": round(fair[sel], 4) if sel in fair else None,
+                "true_edge_percent": round((odds[sel] * fair[sel] - 1) * 100, 2) if sel in fair else None,
+            })
+            for sel, edge in edges.items()
+        },
+    )
 
 
 async def sync_to_supabase(match_data: Dict, soft_bookie: str, league: str):
     """
-    Sync odds data to Supabase value_opportunities table via RPC
-    The "Logic-in-DB" Strategy - Upsert Engine
+    Queue odds data for the Supabase value_opportunities table
+    The "Logic-in-DB" Strategy - Upsert Engine (flushed in batches by value_bet_writer)
+    Price deltas also update the in-memory opportunity index and are pushed to /stream/odds subscribers
     """
-    if not supabase_client:
-        logger.debug("Supabase not configured, skipping sync")
-        return
+    writes_enabled = value_bet_writer.running
     
     try:
-        # Generate unique match ID: HomeTeam_AwayTeam_Date
-        date_str = datetime.now().strftime("%Y%m%d")
-        home = match_data.get('home_team', '').replace(' ', '')
-        away = match_data.get('away_team', '').replace(' ', '')
-        match_id = f"{home}_{away}_{date_str}"
+        # Canonical cross-bookmaker event (see events.py). The value_opportunities key
+        # carries the bookmaker too, so two soft books never overwrite each other
+        event_id = match_data.get('event_id') or resolve_event(match_data, soft_bookie, league)
+        match_id = f"{event_id}_{soft_bookie}"
         
-        # Get odds
+        # Get odds (1X2 on "odds", everything the decoder found on "markets")
         odds = match_data.get('odds', {})
+        markets = match_data.get('markets') or {"1x2": odds}
         
         # Fetch sharp odds from OddsAPI
+        started = time.perf_counter()
         sharp_odds = await fetch_sharp_odds(
             match_data.get('home_team', ''),
             match_data.get('away_team', ''),
-            league
+            league,
+            match_data.get('kickoff')
         )
+        sync_started = time.perf_counter()
+        STAGE_SECONDS.labels(soft_bookie.lower(), league, "sharp").observe(sync_started - started)
+        
+        # Skip the database entirely when no price moved since the last write
+        prices = flatten_markets(markets)
+        prices.update({
+            "sharp_home": sharp_odds.get('home'),
+            "sharp_draw": sharp_odds.get('draw'),
+            "sharp_away": sharp_odds.get('away'),
+        })
+        delta = delta_tracker.diff(soft_bookie, event_id, prices)
+        if delta is None:
+            return
+        
+        match_name = f"{match_data.get('home_team')} vs {match_data.get('away_team')}"
+        if delta.changes:
+            _index_opportunities(match_data, event_id, match_name, soft_bookie, league, odds, sharp_odds)
+            _publish_odds_change(match_data, event_id, match_name, soft_bookie, league, delta, odds, sharp_odds)
+        if not writes_enabled:
+            # Nothing is written yet (database still warming up): re-emit these prices in full once it is
+            delta_tracker.mark_unwritten(soft_bookie, event_id)
+            return
+        
+        # History is append-only: every price on a new (or never written) match, then only
+        # the soft prices that moved; heartbeats and sharp-only moves add nothing
+        if delta.full:
+            moved = markets
+        else:
+            moved = {}
+            for key in delta.changes:
+                market, _, selection = key.partition(":")
+                price = markets.get(market, {}).get(selection) if selection else None
+                if price:
+                    moved.setdefault(market, {})[selection] = price
+        if moved:
+            await odds_history.record_match(
+                event_id, match_name, league, match_data.get('kickoff'), soft_bookie, moved
+            )
         
         # Call the RPC function for atomic upsert
         # Ensure kickoff is valid timestamp or None
         kickoff_val = parse_kickoff(match_data.get('kickoff'))
 
-        supabase_client.rpc("upsert_value_bet", {
+        queued = await value_bet_writer.put({
             "p_match_id": match_id,
-            "p_match_name": f"{match_data.get('home_team')} vs {match_data.get('away_team')}",
+            "p_event_id": event_id,
+            "p_match_name": match_name,
             "p_league": league,
             "p_kickoff": kickoff_val,
             "p_sharp_odds_home": sharp_odds.get('home'),
@@ -348,21 +1142,67 @@ async def sync_to_supabase(match_data: Dict, soft_bookie: str, league: str):
             "p_soft_odds_home": odds.get('home'),
             "p_soft_odds_draw": odds.get('draw'),
             "p_soft_odds_away": odds.get('away')
-        }).execute()
+        })
+        if not queued:
+            delta_tracker.forget(soft_bookie, event_id)
+            return
         
-        logger.debug(f"✅ Synced to Supabase: {match_id}")
+        # Per-market rows: only markets that moved, or all of them on a new/unwritten/heartbeat emit
+        changed = {key.split(":", 1)[0] for key in delta.changes if ":" in key}
+        if any(key.startswith("sharp_") for key in delta.changes):
+            changed.add("1x2")
+        if delta.full or not delta.changes:
+            changed = set(markets)
+        rows = [
+            {
+                "p_match_id": match_id,
+                "p_event_id": event_id,
+                "p_match_name": match_name,
+                "p_league": league,
+                "p_kickoff": kickoff_val,
+                "p_soft_bookie": soft_bookie,
+                "p_market": market,
+                "p_selection": selection,
+                "p_soft_odds": price,
+                "p_sharp_odds": sharp_odds.get(selection) if market == "1x2" else None,
+            }
+            for market in changed
+            for selection, price in markets.get(market, {}).items()
+            if price
+        ]
+        if rows and market_odds_writer.running and await market_odds_writer.put_many(rows) < len(rows):
+            delta_tracker.forget(soft_bookie, event_id)
+        STAGE_SECONDS.labels(soft_bookie.lower(), league, "sync").observe(time.perf_counter() - sync_started)
+        
+        logger.debug(f"✅ Queued for Supabase: {match_id}")
         
     except Exception as e:
         logger.error(f"❌ Supabase sync error: {str(e)}")
 
 
-async def scrape_sportybet_json(league: str) -> List[Dict]:
-    """
-    Scrape SportyBet using their factsCenter/liveOrPrematchEvents API
-    """
+SPORTYBET_EVENTS_URL = "https://www.sportybet.com/api/ng/factsCenter/liveOrPrematchEvents"
+SPORTYBET_SPORT_ID = "sr:sport:1"
+
+# Map leagues to SportyBet Tournament IDs (SportRadar)
+SPORTYBET_TOURNAMENTS = {
+    "premierleague": ["sr:tournament:17"],
+    "laliga": ["sr:tournament:8"],
+    "seriea": ["sr:tournament:23"],
+    "bundesliga": ["sr:tournament:35"],
+    "ligue1": ["sr:tournament:34"],
+    "npfl": ["sr:tournament:266"],
+}
+
+# One all-football download serves every league inside this window (see feed_cache.py)
+sportybet_snapshots: FeedSnapshotCache[TournamentIndex] = FeedSnapshotCache(
+    "sportybet",
+    ttl=float(os.getenv("SPORTYBET_SNAPSHOT_TTL", 30))
+)
+
+
+async def _download_sportybet_feed(sport_id: str) -> TournamentIndex:
+    """Download SportyBet's whole-sport feed once and index it by tournament id"""
     # Confirmed working endpoint as of Jan 2026
-    url = "https://www.sportybet.com/api/ng/factsCenter/liveOrPrematchEvents"
-    
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept": "application/json, text/plain, */*",
@@ -370,108 +1210,79 @@ async def scrape_sportybet_json(league: str) -> List[Dict]:
         "clientid": "web",
         "platform": "web"
     }
-
-    # Map leagues to SportyBet Tournament IDs (SportRadar)
-    target_ids = []
-    if league == "premierleague": target_ids = ["sr:tournament:17"]
-    elif league == "laliga": target_ids = ["sr:tournament:8"]
-    elif league == "seriea": target_ids = ["sr:tournament:23"]
-    elif league == "bundesliga": target_ids = ["sr:tournament:35"]
-    elif league == "ligue1": target_ids = ["sr:tournament:34"]
-    elif league == "npfl": target_ids = ["sr:tournament:266"]
-    
     params = {
-        "sportId": "sr:sport:1",
+        "sportId": sport_id,
     }
 
+    # Failures propagate to scrape_sportybet_json, which records them as "down"
+    started = time.perf_counter()
+    response = await http_clients.get("sportybet", SPORTYBET_EVENTS_URL, headers=headers, params=params)
+    response.raise_for_status()
+    fetched = time.perf_counter()
+    # The feed covers every league, so it is timed under league="*"
+    STAGE_SECONDS.labels("sportybet", "*", "fetch").observe(fetched - started)
+
+    json_resp = fastjson.loads(response.content)
+    # Standard SportyBet response wrapper: { bizCode: 10000, data: [...] }
+    data = json_resp.get("data", [])
+    index = TournamentIndex(data if isinstance(data, list) else [])
+    STAGE_SECONDS.labels("sportybet", "*", "decode").observe(time.perf_counter() - fetched)
+    logger.info(f"✅ SportyBet: Received {len(index)} tournaments/groups")
+    return index
+
+
+async def scrape_sportybet_json(league: str) -> List[Dict]:
+    """
+    Scrape SportyBet using their factsCenter/liveOrPrematchEvents API
+    Served from the shared per-sport snapshot, so leagues don't re-download the feed
+    """
+    target_ids = SPORTYBET_TOURNAMENTS.get(league, [])
+
     # Start timer
     start_time = datetime.now()
+    started = time.perf_counter()
+    parse_s = 0.0
     
     try:
-        async with httpx.AsyncClient(http2=True, timeout=30.0) as client:
-            try:
-                response = await client.get(url, headers=headers, params=params)
-                response.raise_for_status()
-            except Exception as http_err:
-                 await log_scraper_health("sportybet", "down", 0, 0, 1, str(http_err))
-                 raise http_err
-
-            json_resp = response.json()
-            # Standard SportyBet response wrapper: { bizCode: 10000, data: [...] }
-            data = json_resp.get("data", [])
-            
-            matches = []
-            
-            # Data is list of tournaments
-            if isinstance(data, list):
-                logger.info(f"✅ SportyBet: Received {len(data)} tournaments/groups")
-                
-                for tournament in data:
-                    t_id = tournament.get("id", "")
-                    t_name = tournament.get("name", "").lower()
-                    
-                    # Filter by League/Tournament
-                    is_target = False
-                    if t_id in target_ids:
-                        is_target = True
-                    elif league in t_name.replace(" ", ""): # weak fuzzy match
-                        is_target = True
-                    
-                    # If we have specific target IDs, be strict, otherwise loose name match
-                    if target_ids and not is_target:
-                        continue
+        snapshot = await sportybet_snapshots.get(SPORTYBET_SPORT_ID, _download_sportybet_feed)
+        
+        matches = []
+        
+        # Data is indexed by tournament (strict id match when ids are known)
+        for tournament in snapshot.value.select(target_ids, league):
+            events = tournament.get("events", [])
+            for event in events:
+                try:
+                    # Every known market in one pass (see markets.py); 1X2 stays on "odds"
+                    parse_started = time.perf_counter()
+                    markets = decode_sportybet(event.get("markets") or [])
+                    match = MatchRecord(
+                        event.get("id") or event.get("eventId", ""),
+                        event.get("homeTeamName") or (event.get("home") or {}).get("name", ""),
+                        event.get("awayTeamName") or (event.get("away") or {}).get("name", ""),
+                        event.get("scheduledTime") or event.get("startTime", ""),
+                        markets.get("1x2", {}),
+                        markets,
+                    )
+                    parse_s += time.perf_counter() - parse_started
                     
-                    # If looking for NPFL specifically and no ID match, be careful
+                    if match.home_team and match.odds.get("home"):
+                        matches.append(match)
+                        await ingest_match(match, "SportyBet", league)
                     
-                    events = tournament.get("events", [])
-                    for event in events:
-                        try:
-                            match = {
-                                "id": event.get("id", event.get("eventId", "")),
-                                "home_team": event.get("homeTeamName", event.get("home", {}).get("name", "")),
-                                "away_team": event.get("awayTeamName", event.get("away", {}).get("name", "")),
-                                "kickoff": event.get("scheduledTime", event.get("startTime", "")),
-                                "odds": {}
-                            }
-                            
-                            markets = event.get("markets", [])
-                            for market in markets:
-                                # Market ID 1 is usually 1X2, but checks desc or name
-                                m_id = str(market.get("id", ""))
-                                m_name = market.get("name", "").lower()
-                                m_desc = market.get("desc", "").lower()
-                                
-                                if m_id == "1" or "1x2" in m_name or "1x2" in m_desc:
-                                    outcomes = market.get("outcomes", [])
-                                    for outcome in outcomes:
-                                        # Odds can be "2.55" string
-                                        try:
-                                            raw = outcome.get("odds", "0")
-                                            val = float(raw)
-                                        except:
-                                            val = 0.0
-                                            
-                                        # Outcome mapping
-                                        o_desc = outcome.get("desc", "").lower()
-                                        if o_desc in ["1", "home"]:
-                                            match["odds"]["home"] = val
-                                        elif o_desc in ["x", "draw"]:
-                                            match["odds"]["draw"] = val
-                                        elif o_desc in ["2", "away"]:
-                                            match["odds"]["away"] = val
-                            
-                            if match["home_team"] and match["odds"].get("home"):
-                                matches.append(match)
-                                await sync_to_supabase(match, "SportyBet", league)
-                            
-                        except Exception as e:
-                            continue
+                except Exception as e:
+                    continue
 
-            elapsed = int((datetime.now() - start_time).total_seconds() * 1000)
-            await log_scraper_health("sportybet", "healthy", elapsed, len(matches), 0)
-            logger.info(f"✅ SportyBet: Found {len(matches)} matches for {league}")
-            return matches
-            
+        STAGE_SECONDS.labels("sportybet", league, "parse").observe(parse_s)
+        STAGE_SECONDS.labels("sportybet", league, "total").observe(time.perf_counter() - started)
+        elapsed = int((datetime.now() - start_time).total_seconds() * 1000)
+        await log_scraper_health("sportybet", "healthy", elapsed, len(matches), 0)
+        logger.info(f"✅ SportyBet: Found {len(matches)} matches for {league}")
+        return matches
+        
+    except RateLimited:
+        # Our own pacing, not an upstream failure: leave health and the breaker alone
+        raise
     except Exception as e:
         await log_scraper_health("sportybet", "down", 0, 0, 1, str(e))
         logger.error(f"❌ SportyBet JSON error: {e}")
@@ -513,66 +1324,60 @@ async def scrape_bet9ja_json(league: str) -> List[Dict]:
     }
     
     try:
-        async with httpx.AsyncClient(http2=True, timeout=30.0) as client:
-            response = await client.get(url, headers=headers, params=params)
+        started = time.perf_counter()
+        response = await http_clients.get("bet9ja", url, headers=headers, params=params)
+        fetched = time.perf_counter()
+        STAGE_SECONDS.labels("bet9ja", league, "fetch").observe(fetched - started)
+        
+        if response.status_code == 200:
+            data = fastjson.loads(response.content)
+            STAGE_SECONDS.labels("bet9ja", league, "decode").observe(time.perf_counter() - fetched)
+            parse_s = 0.0
+            matches = []
             
-            if response.status_code == 200:
-                data = response.json()
-                matches = []
-                
-                # PalimpsestAjax structure: D.E (Events)
-                events = data.get("D", {}).get("E", [])
+            # PalimpsestAjax structure: D.E (Events)
+            events = data.get("D", {}).get("E", [])
+            
+            for event in events:
+                # IDs structure: ID (MatchId)
+                teams = event.get("DS", "").split(" - ")
+                match = MatchRecord(
+                    str(event.get("ID", "")),
+                    teams[0],
+                    teams[1] if len(teams) > 1 else "",
+                    str(event.get("START", "")),
+                )
                 
-                for event in events:
-                    # IDs structure: ID (MatchId)
-                    match = {
-                        "id": str(event.get("ID", "")),
-                        "home_team": event.get("DS", "").split(" - ")[0] if " - " in event.get("DS", "") else event.get("DS", ""),
-                        "away_team": event.get("DS", "").split(" - ")[1] if " - " in event.get("DS", "") else "",
-                        "kickoff": str(event.get("START", "")), 
-                        "odds": {}
-                    }
-                    
-                    # Odds are in O (Outcomes?) 
-                    # Structure usually involves iterating markets "M" -> outcomes "O"
-                    # But GetEventsInGroupV2 often returns flattened odds for main market
-                    
-                    # Parse odds from 'O' dictionary
-                    # keys: S_1X2_1 (Home), S_1X2_X (Draw), S_1X2_2 (Away)
-                    odds_data = event.get("O", {})
-                    
-                    if isinstance(odds_data, dict):
-                         # Extract Match Result (1X2)
-                         try:
-                             # Values are strings like "2.54"
-                             h_odd = odds_data.get("S_1X2_1")
-                             d_odd = odds_data.get("S_1X2_X")
-                             a_odd = odds_data.get("S_1X2_2")
-                             
-                             if h_odd and d_odd and a_odd:
-                                 match["odds"] = {
-                                     "home": float(h_odd),
-                                     "draw": float(d_odd),
-                                     "away": float(a_odd)
-                                 }
-                                 
-                         except Exception as parse_err:
-                             logger.warning(f"Error parsing odds for {match['home_team']}: {parse_err}")
-
-                    if match["home_team"] and match["odds"]:
-                        matches.append(match)
-                        await sync_to_supabase(match, "Bet9ja", league)
+                # Odds are in the flat 'O' dictionary (S_1X2_1, S_OU@2.5_O, S_GGNG_Y, ...)
+                odds_data = event.get("O", {})
+                if isinstance(odds_data, dict):
+                    parse_started = time.perf_counter()
+                    match.markets = decode_bet9ja(odds_data)
+                    one_x_two = match.markets.get("1x2", {})
+                    # Keep the old contract: only a complete 1X2 counts as a match
+                    if len(one_x_two) == 3:
+                        match.odds = one_x_two
+                    parse_s += time.perf_counter() - parse_started
 
-                elapsed = int((datetime.now() - start_time).total_seconds() * 1000)
-                await log_scraper_health("bet9ja", "healthy", elapsed, len(matches), 0)
-                logger.info(f"✅ Bet9ja V2 scrape found {len(matches)} matches")
-                return matches
+                if match.home_team and match.odds:
+                    matches.append(match)
+                    await ingest_match(match, "Bet9ja", league)
 
-            else:
-                await log_scraper_health("bet9ja", "degraded", 0, 0, 1, f"HTTP {response.status_code}")
-                logger.warning(f"Bet9ja API returned {response.status_code}")
-                return await scrape_bet9ja_simple(league)
-                
+            STAGE_SECONDS.labels("bet9ja", league, "parse").observe(parse_s)
+            STAGE_SECONDS.labels("bet9ja", league, "total").observe(time.perf_counter() - started)
+            elapsed = int((datetime.now() - start_time).total_seconds() * 1000)
+            await log_scraper_health("bet9ja", "healthy", elapsed, len(matches), 0)
+            logger.info(f"✅ Bet9ja V2 scrape found {len(matches)} matches")
+            return matches
+
+        else:
+            await log_scraper_health("bet9ja", "degraded", 0, 0, 1, f"HTTP {response.status_code}")
+            logger.warning(f"Bet9ja API returned {response.status_code}")
+            return await scrape_bet9ja_simple(league)
+            
+    except RateLimited:
+        # Our own pacing, not an upstream failure: leave health and the breaker alone
+        raise
     except Exception as e:
         await log_scraper_health("bet9ja", "degraded", 0, 0, 1, str(e))
         logger.error(f"❌ Bet9ja JSON error: {e}")
@@ -610,6 +1415,10 @@ def normalize_odds_data(raw_data: Any, bookmaker: str, league: str) -> Dict[str,
         if isinstance(raw_data, list):
             matches = []
             for item in raw_data:
+                # Scraper records are already normalized; share them instead of copying
+                if isinstance(item, MatchRecord):
+                    matches.append(item)
+                    continue
                 match = {
                     "id": item.get("id", f"match_{len(matches)}"),
                     "home_team": item.get("home_team", item.get("homeTeam", "")),
@@ -645,13 +1454,402 @@ def normalize_odds_data(raw_data: Any, bookmaker: str, league: str) -> Dict[str,
         }
 
 
-@app.get("/api/odds/bet9ja/{league}")
-async def get_bet9ja_odds(league: str):
+SCRAPERS = {
+    "bet9ja": scrape_bet9ja_json,
+    "betking": scrape_betking_json,
+    "sportybet": scrape_sportybet_json,
+}
+
+# Multi-worker mode: with SHARED_STORE set (a directory, ideally on tmpfs, or a
+# redis:// URL) only the worker holding LEADER_LOCK runs the scheduler and the
+# others serve its snapshots from the shared store
+SHARED_STORE = os.getenv("SHARED_STORE", "")
+shared_backend = open_backend(SHARED_STORE) if SHARED_STORE else None
+leader_election = LeaderElection(
+    os.getenv("LEADER_LOCK", os.path.join(
+        SHARED_STORE if isinstance(shared_backend, FileSnapshotBackend) else tempfile.gettempdir(),
+        "vantedge-bridge-leader.lock",
+    ))
+) if shared_backend else None
+
+
+def is_scrape_leader() -> bool:
+    return leader_election is None or leader_election.is_leader
+
+
+# Only the leader scrapes, so only its board and opportunity index fill up: it
+# publishes both to the shared store and followers serve reads from a copy
+SHARED_VIEW_INTERVAL = float(os.getenv("SHARED_VIEW_INTERVAL", 5))
+board_replica = SharedReplica(shared_backend, "board", odds_board, SHARED_VIEW_INTERVAL) if shared_backend else None
+opportunity_replica = SharedReplica(
+    shared_backend, "opportunities", opportunity_index, SHARED_VIEW_INTERVAL
+) if shared_backend else None
+follower_board = OddsBoard()
+follower_opportunities = OpportunityIndex(max_age=opportunity_index.max_age)
+
+
+def serves_leader_views() -> bool:
+    """True on a follower of a scheduling leader: board reads come from the leader's published copy"""
+    return SCHEDULER_ENABLED and board_replica is not None and not is_scrape_leader()
+
+
+def _leader_view(replica: SharedReplica, follower_copy):
+    if replica.refresh(follower_copy) is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Waiting for the scrape leader's first board",
+            headers={"Retry-After": str(int(SHARED_VIEW_INTERVAL) + 1)},
+        )
+    return follower_copy
+
+
+def current_board() -> OddsBoard:
+    return _leader_view(board_replica, follower_board) if serves_leader_views() else odds_board
+
+
+def current_opportunities() -> OpportunityIndex:
+    return _leader_view(opportunity_replica, follower_opportunities) if serves_leader_views() else opportunity_index
+
+
+async def _start_publishing_views():
+    """On election: pick up where the previous leader's published views left off, then publish ours"""
+    for replica, own in ((board_replica, odds_board), (opportunity_replica, opportunity_index)):
+        if not len(own) and replica.refresh(own) is not None:
+            logger.info(f"♻️ Adopted the previous leader's {replica.document.key} ({len(own)} entries)")
+        await replica.start()
+
+
+# Latest normalized payload per (bookmaker, league), kept warm by the scheduler
+odds_snapshots = OddsSnapshotStore(
+    default_stale_after=float(os.getenv("SNAPSHOT_STALE_AFTER", 300)),
+    backend=shared_backend,
+)
+
+# Last payload scraped while the bookmaker was healthy - served while its circuit is open
+last_good_snapshots = OddsSnapshotStore()
+
+# Warm restarts: snapshots and the sharp odds cache are checkpointed to a local
+# append-only log and reloaded at startup with their original fetch times (see checkpoint.py)
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "")
+CHECKPOINT_MAX_AGE = float(os.getenv("CHECKPOINT_MAX_AGE", 6 * 3600))
+
+
+def _checkpoint_records() -> Dict[str, Tuple[float, Any]]:
+    """Everything worth keeping across a restart, versioned by fetch time"""
+    records = {}
+    for prefix, store in (("odds", odds_snapshots), ("last_good", last_good_snapshots)):
+        for (bookmaker, league), snapshot in store.items():
+            records[f"{prefix}:{bookmaker}:{league}"] = (snapshot.fetched_at, {
+                "payload": snapshot.payload,
+                "fetched_at": snapshot.fetched_at,
+                "stale_after": snapshot.stale_after,
+            })
+    for league, entry in sharp_odds_cache.items():
+        records[f"sharp:{league}"] = (entry.fetched_at, {"events": entry.events, "fetched_at": entry.fetched_at})
+    return records
+
+
+def _apply_checkpoint(values: Dict[str, Any]) -> Dict[str, int]:
+    """Put checkpointed state back with its original fetch times, so TTLs and staleness carry on from there"""
+    cutoff = time.time() - CHECKPOINT_MAX_AGE
+    stores = {"odds": odds_snapshots, "last_good": last_good_snapshots}
+    restored = {"odds": 0, "last_good": 0, "sharp": 0}
+    for key, value in values.items():
+        kind, _, rest = key.partition(":")
+        if value["fetched_at"] < cutoff:
+            continue
+        if kind == "sharp":
+            restored["sharp"] += sharp_odds_cache.restore(rest, value["events"], value["fetched_at"])
+        elif kind in stores:
+            bookmaker, _, league = rest.partition(":")
+            current = stores[kind].get(bookmaker, league)
+            if current is None or current.fetched_at < value["fetched_at"]:
+                stores[kind].put(
+                    bookmaker, league, value["payload"],
+                    stale_in=value["stale_after"] - value["fetched_at"],
+                    fetched_at=value["fetched_at"],
+                )
+                restored[kind] += 1
+    return restored
+
+
+checkpointer = Checkpointer(
+    CheckpointLog(CHECKPOINT_PATH),
+    _checkpoint_records,
+    interval=float(os.getenv("CHECKPOINT_INTERVAL", 30)),
+) if CHECKPOINT_PATH else None
+
+# Closed/open/half-open breaker per scraper, fed by log_scraper_health (see resilience.py)
+scraper_breakers = {
+    name: CircuitBreaker(
+        name,
+        failure_threshold=int(os.getenv("BREAKER_FAILURE_THRESHOLD", 3)),
+        recovery_timeout=float(os.getenv("BREAKER_RECOVERY_TIMEOUT", 30)),
+        max_recovery_timeout=float(os.getenv("BREAKER_MAX_RECOVERY_TIMEOUT", 600)),
+    )
+    for name in SCRAPERS
+}
+
+
+async def poll_odds(bookmaker: str, league: str) -> Dict[str, Any]:
+    """
+    Scrape one bookmaker/league behind its circuit breaker and normalize it
+    (used by the scheduler and the odds endpoints). Raises CircuitOpenError while open.
+    """
+    breaker = scraper_breakers[bookmaker]
+    breaker.check()
+    try:
+        data = await SCRAPERS[bookmaker](league)
+    except RateLimited:
+        # Says nothing about the upstream: neither a failure nor a success
+        breaker.release()
+        raise
+    except Exception as e:
+        breaker.record_failure(str(e))
+        raise
+    result = normalize_odds_data(data, bookmaker, league)
+    if breaker.consecutive_failures == 0:
+        last_good_snapshots.put(bookmaker, league.lower(), result)
+    else:
+        # The scraper logged a failure and returned fallback data (e.g. scrape_bet9ja_simple)
+        result["degraded"] = True
+    return result
+
+
+def serve_last_good(bookmaker: str, league: str, error: Union[CircuitOpenError, RateLimited]) -> Dict[str, Any]:
+    """
+    Last healthy payload while a scraper's circuit is open or our rate limiter
+    holds its requests back; 503 if there has never been one
+    """
+    snapshot = last_good_snapshots.get(bookmaker, league.lower())
+    if snapshot is None:
+        raise HTTPException(
+            status_code=503,
+            detail=str(error),
+            headers={"Retry-After": str(int(error.retry_in) + 1)},
+        )
+    return {
+        **snapshot.as_response(),
+        "stale": True,
+        **({"circuit": CircuitBreaker.OPEN} if isinstance(error, CircuitOpenError) else {"rate_limited": True}),
+        "retry_in_s": round(error.retry_in, 1),
+    }
+
+
+def _env_list(name: str, default: str) -> List[str]:
+    return [v.strip().lower() for v in os.getenv(name, default).split(",") if v.strip()]
+
+
+odds_scheduler = PollScheduler(
+    odds_snapshots,
+    poll_odds,
+    pairs=[
+        (bookmaker, league)
+        for bookmaker in _env_list("SCHEDULER_BOOKMAKERS", "bet9ja,sportybet")
+        for league in _env_list("SCHEDULER_LEAGUES", "premierleague,laliga,seriea,bundesliga,ligue1,npfl")
+        if bookmaker in SCRAPERS and league in LEAGUE_MAP
+    ],
+    min_interval=float(os.getenv("SCHEDULER_MIN_INTERVAL", 30)),
+    base_interval=float(os.getenv("SCHEDULER_BASE_INTERVAL", 120)),
+    max_interval=float(os.getenv("SCHEDULER_MAX_INTERVAL", 900)),
+    jitter=float(os.getenv("SCHEDULER_JITTER", 0.15)),
+    max_concurrency=int(os.getenv("SCHEDULER_MAX_CONCURRENCY", 4)),
+)
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+
+
+def serve_odds_snapshot(bookmaker: str, league: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+    """Fresh in-memory snapshot for a bookmaker/league, or None to scrape inline"""
+    if SCHEDULER_ENABLED and not is_scrape_leader() and (bookmaker, league.lower()) in odds_scheduler.jobs:
+        # Followers never scrape a pair the leader polls: serve its latest snapshot, however old
+        snapshot = odds_snapshots.get(bookmaker, league.lower())
+        if snapshot is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Waiting for the scrape leader's first snapshot",
+                headers={"Retry-After": "5"},
+            )
+        return {**snapshot.as_response(), "stale": snapshot.is_stale()}
+    if refresh:
+        return None
+    snapshot = odds_snapshots.get(bookmaker, league.lower())
+    if snapshot and not snapshot.is_stale():
+        return snapshot.as_response()
+    return None
+
+
+@app.get("/api/scheduler/stats")
+async def scheduler_stats():
+    """Per bookmaker/league poll interval, timing and failure counts"""
+    return {
+        "enabled": SCHEDULER_ENABLED,
+        **odds_scheduler.stats()
+    }
+
+
+def _csv(value: Optional[str]) -> Optional[List[str]]:
+    items = [v.strip() for v in (value or "").split(",") if v.strip()]
+    return items or None
+
+
+@app.get("/stream/odds")
+async def stream_odds(
+    request: Request,
+    leagues: Optional[str] = Query(None, description="Comma-separated leagues (default: all)"),
+    bookmakers: Optional[str] = Query(None, description="Comma-separated bookmakers (default: all)"),
+    min_edge: Optional[float] = Query(None, description="Only messages carrying an edge of at least this %"),
+    types: Optional[str] = Query(None, description="odds,edge (default: both)"),
+):
+    """
+    Server-sent events stream of price deltas ("odds") and positive value edges ("edge")
+    as scrapes land. Slow consumers whose buffer fills up are sent a "dropped" event and disconnected.
+    """
+    if serves_leader_views():
+        # Deltas are broadcast in the process that scrapes them; a follower's stream would stay silent
+        raise HTTPException(
+            status_code=503,
+            detail="The odds stream is served by the scrape leader only; reconnect to reach it",
+            headers={"Retry-After": "1"},
+        )
+    subscriber = odds_stream.subscribe(_csv(leagues), _csv(bookmakers), _csv(types), min_edge)
+    if subscriber is None:
+        raise HTTPException(status_code=503, detail="Too many stream subscribers")
+    return StreamingResponse(
+        odds_stream.events(subscriber, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/board/event/{event_id}")
+async def get_board_event(event_id: str):
+    """Every bookmaker's prices and the best price per selection for one canonical event"""
+    event = current_board().get(event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail=f"Unknown event: {event_id}")
+    return event
+
+
+@app.get("/api/board/{league}")
+async def get_board(league: str):
+    """Merged cross-bookmaker board for a league, ordered by kickoff"""
+    board = current_board()
+    events = board.league(league.lower())
+    return {
+        "league": league,
+        "count": len(events),
+        "events": events,
+        "stats": board.stats()
+    }
+
+
+async def evaluate_league_edges(league: str, method: str = "power"):
+    """
+    Board events for a league plus one vectorized EdgeBatch over all of them:
+    de-vigged Pinnacle 1X2 vs every soft bookmaker, and cross-book surebets
+    """
+    selections = edge_engine.SELECTIONS_1X2
+    events, bookmakers, soft = current_board().price_matrix(league, "1x2", selections)
+    if not events:
+        return events, None
+    try:
+        index = await get_sharp_index_for_league(league)
+    except Exception as e:
+        raise RuntimeError(f"sharp odds could not be loaded ({e})") from e
+    sharp = np.full((len(events), len(selections)), np.nan)
+    for row, event in enumerate(events):
+        prices, quality = index.lookup(event.home_team, event.away_team, event.kickoff_ts)
+        if quality >= SHARP_MIN_MATCH_QUALITY:
+            sharp[row] = [prices.get(sel) or np.nan for sel in selections]
+    try:
+        return events, edge_engine.evaluate(soft, sharp, bookmakers, selections, method)
+    except Exception as e:
+        raise RuntimeError(f"edge engine failed ({e})") from e
+
+
+def _edge_event(event) -> Dict[str, Any]:
+    return {
+        "event_id": event.event_id,
+        "home_team": event.home_team,
+        "away_team": event.away_team,
+        "kickoff": datetime.fromtimestamp(event.kickoff_ts, timezone.utc).isoformat() if event.kickoff_ts else None,
+    }
+
+
+@app.get("/api/opportunities")
+async def get_opportunities(
+    min_edge: float = Query(2.0, description="Minimum edge in percent (soft/sharp - 1, as value_opportunities)"),
+    league: Optional[str] = Query(None, description="Comma-separated leagues"),
+    bookmaker: Optional[str] = Query(None, description="Comma-separated soft bookmakers"),
+    market: Optional[str] = Query(None, description="Comma-separated markets"),
+    limit: int = Query(20, ge=1, le=200),
+):
+    """Top current value opportunities from the in-memory index, best edge first, ending at kickoff"""
+    opportunities = current_opportunities().top(
+        limit,
+        min_edge=min_edge,
+        leagues=[l.lower() for l in _csv(league) or []],
+        markets=_csv(market),
+        bookmakers=_csv(bookmaker),
+    )
+    return {
+        "opportunities": opportunities,
+        "count": len(opportunities),
+        "filters": {"min_edge": min_edge, "league": league, "bookmaker": bookmaker, "market": market, "limit": limit},
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
+@app.get("/api/edges/{league}")
+async def get_league_edges(
+    league: str,
+    method: str = Query("power", description="Sharp de-vig method: multiplicative or power"),
+    min_edge: float = Query(0.0, description="Minimum true edge in percent"),
+):
+    """True (de-vigged) 1X2 edges for every soft price on the league board, plus cross-bookmaker surebets"""
+    if method not in edge_engine.DEVIG_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unknown method. Use one of: {list(edge_engine.DEVIG_METHODS)}")
+    started = time.perf_counter()
+    try:
+        events, batch = await evaluate_league_edges(league.lower(), method)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Edge evaluation failed for {league}: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail=f"Edges for {league} are unavailable: {e}",
+            headers={"Retry-After": "30"},
+        )
+    if batch is None:
+        return {"league": league, "method": method, "events": 0, "value_bets": [], "surebets": []}
+    value_bets = [
+        {**_edge_event(events[bet.pop("event")]), **bet, "edge": round(bet["edge"] * 100, 2)}
+        for bet in batch.value_bets(min_edge / 100)
+    ]
+    surebets = [
+        {**_edge_event(events[arb.pop("event")]), **arb, "margin": round(arb["margin"] * 100, 2)}
+        for arb in batch.surebets()
+    ]
+    return {
+        "league": league,
+        "method": method,
+        "events": len(events),
+        "bookmakers": batch.bookmakers,
+        "value_bets": value_bets,
+        "surebets": surebets,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+@odds_router.get("/api/odds/bet9ja/{league}")
+async def get_bet9ja_odds(league: str, refresh: bool = False):
     """
     Fetch Bet9ja odds for a specific league
     
     Args:
         league: League identifier (premierleague, laliga, npfl, etc.)
+        refresh: Skip the in-memory snapshot and scrape now
     
     Returns:
         JSON with matches and odds data
@@ -671,27 +1869,42 @@ async def get_bet9ja_odds(league: str):
                 detail=f"Unsupported league. Use one of: {list(LEAGUE_MAP.keys())}"
             )
         
+        cached = serve_odds_snapshot("bet9ja", league, refresh)
+        if cached:
+            return cached
+        
         logger.info(f"🟢 Scraping Bet9ja: {league}")
         
         # Use JSON API scraper
-        data = await scrape_bet9ja_json(league)
+        try:
+            result = await poll_odds("bet9ja", league)
+        except CircuitOpenError as e:
+            logger.warning(f"🔌 {e}, serving last good snapshot")
+            return serve_last_good("bet9ja", league, e)
+        except RateLimited as e:
+            logger.warning(f"⏳ {e}, serving last good snapshot")
+            return serve_last_good("bet9ja", league, e)
         
-        logger.info(f"✅ Bet9ja scrape complete: {len(data)} matches")
+        logger.info(f"✅ Bet9ja scrape complete: {result.get('count', 0)} matches")
         
-        return normalize_odds_data(data, "bet9ja", league)
+        odds_snapshots.put("bet9ja", league.lower(), result)
+        return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Bet9ja error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Bet9ja scraping failed: {str(e)}")
 
 
-@app.get("/api/odds/betking/{league}")
-async def get_betking_odds(league: str):
+@odds_router.get("/api/odds/betking/{league}")
+async def get_betking_odds(league: str, refresh: bool = False):
     """
     Fetch BetKing odds for a specific league (with Cloudflare bypass)
     
     Args:
         league: League identifier (premierleague, laliga, npfl, etc.)
+        refresh: Skip the in-memory snapshot and scrape now
     
     Returns:
         JSON with matches and odds data
@@ -710,26 +1923,41 @@ async def get_betking_odds(league: str):
                 detail=f"Unsupported league. Use one of: {list(LEAGUE_MAP.keys())}"
             )
         
+        cached = serve_odds_snapshot("betking", league, refresh)
+        if cached:
+            return cached
+        
         logger.info(f"🟠 Scraping BetKing: {league}")
         
         # Use JSON scraper
-        data = await scrape_betking_json(league)
+        try:
+            result = await poll_odds("betking", league)
+        except CircuitOpenError as e:
+            logger.warning(f"🔌 {e}, serving last good snapshot")
+            return serve_last_good("betking", league, e)
+        except RateLimited as e:
+            logger.warning(f"⏳ {e}, serving last good snapshot")
+            return serve_last_good("betking", league, e)
         
-        logger.info(f"✅ BetKing scrape complete: {len(data)} matches")
+        logger.info(f"✅ BetKing scrape complete: {result.get('count', 0)} matches")
         
-        return normalize_odds_data(data, "betking", league)
+        odds_snapshots.put("betking", league.lower(), result)
+        return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ BetKing error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"BetKing scraping failed: {str(e)}")
 
-@app.get("/api/odds/sportybet/{league}")
-async def get_sportybet_odds(league: str):
+@odds_router.get("/api/odds/sportybet/{league}")
+async def get_sportybet_odds(league: str, refresh: bool = False):
     """
     Fetch SportyBet odds for a specific league
     
     Args:
         league: League identifier (premierleague, laliga, npfl, etc.)
+        refresh: Skip the in-memory snapshot and scrape now
     
     Returns:
         JSON with matches and odds data
@@ -748,21 +1976,67 @@ async def get_sportybet_odds(league: str):
                 detail=f"Unsupported league. Use one of: {list(LEAGUE_MAP.keys())}"
             )
         
+        cached = serve_odds_snapshot("sportybet", league, refresh)
+        if cached:
+            return cached
+        
         logger.info(f"🔵 Scraping SportyBet: {league}")
         
         # Use JSON API scraper
-        data = await scrape_sportybet_json(league)
+        try:
+            result = await poll_odds("sportybet", league)
+        except CircuitOpenError as e:
+            logger.warning(f"🔌 {e}, serving last good snapshot")
+            return serve_last_good("sportybet", league, e)
+        except RateLimited as e:
+            logger.warning(f"⏳ {e}, serving last good snapshot")
+            return serve_last_good("sportybet", league, e)
         
-        logger.info(f"✅ SportyBet scrape complete: {len(data)} matches")
+        logger.info(f"✅ SportyBet scrape complete: {result.get('count', 0)} matches")
         
-        return normalize_odds_data(data, "sportybet", league)
+        odds_snapshots.put("sportybet", league.lower(), result)
+        return result
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ SportyBet error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"SportyBet scraping failed: {str(e)}")
 
 
-@app.get("/api/odds/all/{league}")
+BOOKMAKER_ENDPOINTS = {
+    "bet9ja": get_bet9ja_odds,
+    "betking": get_betking_odds,
+    "sportybet": get_sportybet_odds,
+}
+
+# Deadlines for /api/odds/all - keep REQUEST_DEADLINE under the Next.js proxy's 55s abort
+BOOKMAKER_DEADLINE = float(os.getenv("BOOKMAKER_DEADLINE", 20.0))
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", 45.0))
+
+
+def _fanout_to_bookmakers(results: Dict[str, Dict], keys: Dict[str, str]) -> Dict[str, Any]:
+    """Shape fan-out results for one league into the /api/odds/all response format"""
+    bookmakers = {}
+    timing = {}
+    for bookie_name, key in keys.items():
+        result = results[key]
+        timing[bookie_name] = {"status": result["status"], "elapsed_ms": result["elapsed_ms"]}
+        if result["status"] == "ok":
+            bookmakers[bookie_name] = result["data"]
+        else:
+            bookmakers[bookie_name] = {
+                "error": result["error"],
+                "status": "failed" if result["status"] == "failed" else "timeout"
+            }
+    return {
+        "bookmakers": bookmakers,
+        "timing": timing,
+        "partial": any(t["status"] != "ok" for t in timing.values())
+    }
+
+
+@odds_router.get("/api/odds/all/{league}")
 async def get_all_bookmakers(league: str):
     """
     Fetch odds from all Nigerian bookmakers in parallel
@@ -771,7 +2045,8 @@ async def get_all_bookmakers(league: str):
         league: League identifier (premierleague, laliga, npfl, etc.)
     
     Returns:
-        JSON with data from all bookmakers
+        JSON with data from all bookmakers, per-bookmaker timing and a
+        `partial` flag when any bookmaker missed its deadline
     """
     if not SCRAPER_AVAILABLE:
         raise HTTPException(
@@ -782,33 +2057,75 @@ async def get_all_bookmakers(league: str):
     results = {
         "league": league,
         "timestamp": datetime.now().isoformat(),
-        "bookmakers": {}
     }
     
-    # Fetch from all bookmakers in parallel
-    for bookie_name, endpoint_func in [
-        ("bet9ja", get_bet9ja_odds),
-        ("betking", get_betking_odds),
-        ("sportybet", get_sportybet_odds)
-    ]:
-        try:
-            data = await endpoint_func(league)
-            results["bookmakers"][bookie_name] = data
-        except Exception as e:
-            logger.error(f"Failed to fetch {bookie_name}: {e}")
-            results["bookmakers"][bookie_name] = {
-                "error": str(e),
-                "status": "failed"
-            }
+    fanout = await fan_out(
+        {name: (lambda func=func: func(league)) for name, func in BOOKMAKER_ENDPOINTS.items()},
+        source_timeout=BOOKMAKER_DEADLINE,
+        overall_timeout=REQUEST_DEADLINE
+    )
+    results.update(_fanout_to_bookmakers(fanout, {name: name for name in BOOKMAKER_ENDPOINTS}))
+    
+    return results
+
+
+@odds_router.get("/api/odds/all")
+async def get_all_bookmakers_multi(leagues: str = Query(..., description="Comma-separated leagues, e.g. premierleague,laliga")):
+    """
+    Fetch odds from all Nigerian bookmakers for several leagues in one call
+    
+    Every (league, bookmaker) pair is scraped concurrently under the same
+    per-bookmaker and overall deadlines as /api/odds/all/{league}.
+    """
+    if not SCRAPER_AVAILABLE:
+        raise HTTPException(
+            status_code=503,
+            detail="Scraper not available"
+        )
+    
+    league_list = [l.strip().lower() for l in leagues.split(",") if l.strip()]
+    unsupported = [l for l in league_list if l not in LEAGUE_MAP]
+    if not league_list or unsupported:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported league(s) {unsupported}. Use one of: {list(LEAGUE_MAP.keys())}"
+        )
+    
+    sources = {}
+    for league in league_list:
+        for name, func in BOOKMAKER_ENDPOINTS.items():
+            sources[f"{league}:{name}"] = (lambda func=func, league=league: func(league))
+    
+    fanout = await fan_out(
+        sources,
+        source_timeout=BOOKMAKER_DEADLINE,
+        overall_timeout=REQUEST_DEADLINE
+    )
+    
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "leagues": {}
+    }
+    for league in league_list:
+        results["leagues"][league] = _fanout_to_bookmakers(
+            fanout, {name: f"{league}:{name}" for name in BOOKMAKER_ENDPOINTS}
+        )
+    results["partial"] = any(l["partial"] for l in results["leagues"].values())
     
     return results
 
 
+app.include_router(odds_router)
+
+
 if __name__ == "__main__":
     import uvicorn
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", 8000)),
-        reload=True
+        workers=workers,
+        # --reload and --workers are mutually exclusive in uvicorn
+        reload=workers == 1 and os.getenv("BRIDGE_RELOAD", "true").lower() == "true"
     )
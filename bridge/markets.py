@@ -0,0 +1,169 @@
+"""
+Vantedge Naija Bridge - Multi-market Decoder
+Table-driven decoding of Bet9ja and SportyBet odds into one normalized market/selection structure
+
+Normalized shape (market keys follow bet9ja_structure.parse_bet9ja_odds):
+    {
+        "1x2":    {"home": 2.1, "draw": 3.3, "away": 3.5},
+        "dc":     {"1x": 1.3, "12": 1.4, "x2": 1.7},
+        "ou_2.5": {"over": 1.9, "under": 1.95},
+        "gg_ng":  {"yes": 1.7, "no": 2.0},
+        "1x2_h1": {...}, "1x2_h2": {...}, "dc_h1": {...},
+        "odd_even": {"odd": 1.9, "even": 1.9},
+    }
+"""
+
+from typing import Dict, Optional, Tuple
+
+Markets = Dict[str, Dict[str, float]]
+Spec = Optional[Tuple[str, str]]
+
+_MISSING = object()
+
+# Bet9ja "O" keys -> (market, selection). Mirrors BET9JA_ODDS_MAPPING in bet9ja_structure.py
+BET9JA_KEYS: Dict[str, Spec] = {
+    "S_1X2_1": ("1x2", "home"),
+    "S_1X2_X": ("1x2", "draw"),
+    "S_1X2_2": ("1x2", "away"),
+    "S_DC_1X": ("dc", "1x"),
+    "S_DC_12": ("dc", "12"),
+    "S_DC_X2": ("dc", "x2"),
+    "S_GGNG_Y": ("gg_ng", "yes"),
+    "S_GGNG_N": ("gg_ng", "no"),
+    "S_1X21_11": ("1x2_h1", "home"),
+    "S_1X21_X1": ("1x2_h1", "draw"),
+    "S_1X21_21": ("1x2_h1", "away"),
+    "S_1X22_12": ("1x2_h2", "home"),
+    "S_1X22_X2": ("1x2_h2", "draw"),
+    "S_1X22_22": ("1x2_h2", "away"),
+    "S_DC1T_1X": ("dc_h1", "1x"),
+    "S_DC1T_12": ("dc_h1", "12"),
+    "S_DC1T_X2": ("dc_h1", "x2"),
+    "S_OE_OD": ("odd_even", "odd"),
+    "S_OE_EV": ("odd_even", "even"),
+}
+
+_OU_SIDES = {"O": "over", "U": "under"}
+
+
+def _resolve_bet9ja_key(key: str) -> Spec:
+    """Decode a key not in the table yet (the S_OU@<line>_<O|U> family); None for unknown keys"""
+    if key.startswith("S_OU@"):
+        line, _, side = key[5:].rpartition("_")
+        if line and side in _OU_SIDES:
+            try:
+                return (f"ou_{float(line):g}", _OU_SIDES[side])
+            except ValueError:
+                pass
+    return None
+
+
+def decode_bet9ja(odds: Dict[str, str]) -> Markets:
+    """
+    Decode a Bet9ja event's "O" dictionary in one pass.
+
+    Every key is resolved at most once per process: resolved and unknown keys
+    are memoized in BET9JA_KEYS, so steady-state decoding is one dict probe
+    and one float() per price.
+    """
+    markets: Markets = {}
+    table = BET9JA_KEYS
+    for key, raw in odds.items():
+        spec = table.get(key, _MISSING)
+        if spec is _MISSING:
+            spec = table[key] = _resolve_bet9ja_key(key)
+        if spec is None:
+            continue
+        try:
+            price = float(raw)
+        except (TypeError, ValueError):
+            continue
+        if price <= 1.0:
+            continue
+        market, selection = spec
+        bucket = markets.get(market)
+        if bucket is None:
+            bucket = markets[market] = {}
+        bucket[selection] = price
+    return markets
+
+
+# SportyBet (SportRadar) market id -> (market prefix, outcome id -> selection)
+SPORTYBET_MARKETS: Dict[str, Tuple[str, Dict[str, str]]] = {
+    "1": ("1x2", {"1": "home", "2": "draw", "3": "away"}),
+    "10": ("dc", {"9": "1x", "10": "12", "11": "x2"}),
+    "18": ("ou", {"12": "over", "13": "under"}),
+    "29": ("gg_ng", {"74": "yes", "76": "no"}),
+    "60": ("1x2_h1", {"1": "home", "2": "draw", "3": "away"}),
+    "83": ("1x2_h2", {"1": "home", "2": "draw", "3": "away"}),
+    "63": ("dc_h1", {"9": "1x", "10": "12", "11": "x2"}),
+    "26": ("odd_even", {"70": "odd", "72": "even"}),
+}
+
+# Outcome descriptions used when an outcome has no id
+SPORTYBET_OUTCOME_DESC = {
+    "1": "home", "home": "home",
+    "x": "draw", "draw": "draw",
+    "2": "away", "away": "away",
+    "yes": "yes", "no": "no",
+    "odd": "odd", "even": "even",
+}
+
+# Memo of specifier strings ("total=2.5") -> market key suffix ("_2.5")
+_SPECIFIER_SUFFIX: Dict[str, str] = {"": ""}
+
+
+def _specifier_suffix(specifier: str) -> str:
+    suffix = _SPECIFIER_SUFFIX.get(specifier)
+    if suffix is None:
+        suffix = ""
+        for part in specifier.split("|"):
+            name, _, value = part.partition("=")
+            if name == "total":
+                try:
+                    suffix = f"_{float(value):g}"
+                except ValueError:
+                    pass
+        _SPECIFIER_SUFFIX[specifier] = suffix
+    return suffix
+
+
+def decode_sportybet(market_list) -> Markets:
+    """Decode a SportyBet event's `markets` list in one pass"""
+    markets: Markets = {}
+    for market in market_list or ():
+        m_id = str(market.get("id", ""))
+        spec = SPORTYBET_MARKETS.get(m_id)
+        if spec is None:
+            # Legacy fallback: a 1X2 market labelled by name rather than id
+            label = f"{market.get('name', '')} {market.get('desc', '')}".lower()
+            if "1x2" not in label:
+                continue
+            spec = SPORTYBET_MARKETS["1"]
+        prefix, outcome_ids = spec
+        key = prefix + _specifier_suffix(market.get("specifier", "")) if prefix == "ou" else prefix
+        if key == "ou":
+            continue
+
+        bucket = markets.get(key)
+        for outcome in market.get("outcomes", ()):
+            selection = outcome_ids.get(str(outcome.get("id", "")))
+            if selection is None:
+                selection = SPORTYBET_OUTCOME_DESC.get(outcome.get("desc", "").lower())
+                if selection is None:
+                    continue
+            try:
+                price = float(outcome.get("odds", 0))
+            except (TypeError, ValueError):
+                continue
+            if price <= 1.0:
+                continue
+            if bucket is None:
+                bucket = markets[key] = {}
+            bucket[selection] = price
+    return markets
+
+
+def flatten_markets(markets: Markets) -> Dict[str, float]:
+    """{"1x2:home": 2.1, "ou_2.5:over": 1.9, ...} - handy for fingerprints and diffs"""
+    return {f"{m}:{sel}": price for m, sels in markets.items() for sel, price in sels.items()}
@@ -0,0 +1,223 @@
+"""
+Vantedge Naija Bridge - Opportunity Index
+Current value opportunities per (league, market, bookmaker), ordered by edge, answered top-K in memory
+"""
+
+import heapq
+import math
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+BucketKey = Tuple[str, str, str]         # (league, market, bookmaker)
+EntryKey = Tuple[str, str, str, str]     # (event_id, bookmaker, market, selection)
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts is not None else None
+
+
+class Opportunity:
+    """One soft price with a sharp reference: the row value_opportunities would hold for it"""
+
+    __slots__ = ("key", "league", "edge", "fields", "kickoff_ts", "expires_at", "detected_at", "updated_at")
+
+    def __init__(self, key: EntryKey, league: str, edge: float, fields: Dict[str, Any], kickoff_ts: Optional[float], expires_at: float, detected_at: float):
+        self.key = key
+        self.league = league
+        self.edge = edge
+        self.fields = fields
+        self.kickoff_ts = kickoff_ts
+        self.expires_at = expires_at
+        self.detected_at = detected_at
+        self.updated_at = time.time()
+
+    @property
+    def bucket(self) -> BucketKey:
+        return (self.league, self.key[2], self.key[1])
+
+    def as_dict(self) -> Dict[str, Any]:
+        event_id, bookmaker, market, selection = self.key
+        return {
+            "match_id": f"{event_id}_{bookmaker}",
+            "event_id": event_id,
+            "league": self.league,
+            "kickoff_time": _iso(self.kickoff_ts),
+            "market": market,
+            "selection": selection,
+            "soft_bookmaker": bookmaker,
+            "edge_percent": self.edge,
+            **self.fields,
+            "detected_at": _iso(self.detected_at),
+            "updated_at": _iso(self.updated_at),
+        }
+
+
+class OpportunityIndex:
+    """
+    Incrementally maintained index of current opportunities.
+
+    Each (league, market, bookmaker) bucket is a list kept sorted by edge,
+    so top-K over any filter is a lazy k-way merge of the matching buckets
+    that stops after K entries or below `min_edge` - no scan, no Postgres.
+    `set_prices()` replaces one event/bookmaker/market at a time as scrapes
+    land. Entries leave at kickoff (or `max_age` seconds after their last
+    update when the kickoff is unknown) via an expiry heap drained on every
+    read and write.
+    """
+
+    def __init__(self, max_age: float = 3600.0):
+        self.max_age = max_age
+        self._entries: Dict[EntryKey, Opportunity] = {}
+        self._buckets: Dict[BucketKey, List[Tuple[float, EntryKey]]] = {}
+        self._by_quote: Dict[Tuple[str, str, str], Set[str]] = {}
+        self._expiry: List[Tuple[float, EntryKey]] = []
+        self.updates = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: EntryKey):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        bucket = self._buckets.get(entry.bucket)
+        if bucket is not None:
+            i = bisect_left(bucket, (-entry.edge, key))
+            if i < len(bucket) and bucket[i][1] == key:
+                del bucket[i]
+            if not bucket:
+                del self._buckets[entry.bucket]
+        selections = self._by_quote.get(key[:3])
+        if selections is not None:
+            selections.discard(key[3])
+            if not selections:
+                del self._by_quote[key[:3]]
+
+    def set_prices(
+        self,
+        event_id: str,
+        league: str,
+        bookmaker: str,
+        market: str,
+        kickoff_ts: Optional[float],
+        selections: Dict[str, Tuple[float, Dict[str, Any]]],
+    ):
+        """
+        Replace one bookmaker's opportunities on one event/market.
+        `selections` maps selection -> (edge percent, extra response fields);
+        selections left out (no longer priced, or no sharp line) are dropped.
+        """
+        now = time.time()
+        self._evict(now)
+        self.updates += 1
+        selections = {sel: value for sel, value in selections.items() if math.isfinite(value[0])}
+        quote = (event_id, bookmaker, market)
+        for selection in self._by_quote.get(quote, set()) - set(selections):
+            self._remove(quote + (selection,))
+        if kickoff_ts is not None and kickoff_ts <= now:
+            for selection in list(self._by_quote.get(quote, ())):
+                self._remove(quote + (selection,))
+            return
+
+        for selection, (edge, fields) in selections.items():
+            key = quote + (selection,)
+            previous = self._entries.get(key)
+            if previous is not None:
+                self._remove(key)
+            expires_at = kickoff_ts if kickoff_ts is not None else now + self.max_age
+            entry = Opportunity(
+                key, league, edge, fields, kickoff_ts, expires_at,
+                previous.detected_at if previous is not None else now,
+            )
+            self._entries[key] = entry
+            insort(self._buckets.setdefault(entry.bucket, []), (-edge, key))
+            self._by_quote.setdefault(quote, set()).add(selection)
+            if previous is None or previous.expires_at != expires_at:
+                heapq.heappush(self._expiry, (expires_at, key))
+        if len(self._expiry) > 4 * len(self._entries) + 1024:
+            # Drop superseded heap entries (unknown kickoffs push one per update)
+            self._expiry = [(e.expires_at, key) for key, e in self._entries.items()]
+            heapq.heapify(self._expiry)
+
+    def _evict(self, now: float):
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(expiry)
+            entry = self._entries.get(key)
+            # Heap entries are lazy: skip ones superseded by a later update
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                self.evicted += 1
+
+    def top(
+        self,
+        k: int = 20,
+        min_edge: float = float("-inf"),
+        leagues: Optional[Iterable[str]] = None,
+        markets: Optional[Iterable[str]] = None,
+        bookmakers: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Best `k` opportunities at or above `min_edge` percent, optionally filtered, best first"""
+        self._evict(time.time())
+        leagues = set(leagues) if leagues else None
+        markets = set(markets) if markets else None
+        bookmakers = {b.lower() for b in bookmakers} if bookmakers else None
+        lists = [
+            bucket
+            for (league, market, bookmaker), bucket in self._buckets.items()
+            if (leagues is None or league in leagues)
+            and (markets is None or market in markets)
+            and (bookmakers is None or bookmaker.lower() in bookmakers)
+        ]
+        results = []
+        for neg_edge, key in islice(heapq.merge(*lists), k):
+            if -neg_edge < min_edge:
+                break
+            results.append(self._entries[key].as_dict())
+        return results
+
+    def dump(self) -> Dict[str, Any]:
+        """Every entry as plain JSON, for followers to `load()` (see shared_store.SharedReplica)"""
+        return {
+            "updates": self.updates,
+            "evicted": self.evicted,
+            "entries": [
+                [list(e.key), e.league, e.edge, e.fields, e.kickoff_ts, e.expires_at, e.detected_at, e.updated_at]
+                for e in self._entries.values()
+            ],
+        }
+
+    def load(self, data: Dict[str, Any]):
+        """Replace the index with a `dump()`, keeping each entry's expiry"""
+        self._entries = {}
+        self._buckets = {}
+        self._by_quote = {}
+        for key, league, edge, fields, kickoff_ts, expires_at, detected_at, updated_at in data.get("entries", ()):
+            key = tuple(key)
+            entry = Opportunity(key, league, edge, fields, kickoff_ts, expires_at, detected_at)
+            entry.updated_at = updated_at
+            self._entries[key] = entry
+            self._buckets.setdefault(entry.bucket, []).append((-edge, key))
+            self._by_quote.setdefault(key[:3], set()).add(key[3])
+        for bucket in self._buckets.values():
+            bucket.sort()
+        self._expiry = [(e.expires_at, key) for key, e in self._entries.items()]
+        heapq.heapify(self._expiry)
+        self.updates = data.get("updates", 0)
+        self.evicted = data.get("evicted", 0)
+
+    def stats(self) -> Dict[str, Any]:
+        leagues: Dict[str, int] = {}
+        for (league, _, _), bucket in self._buckets.items():
+            leagues[league] = leagues.get(league, 0) + len(bucket)
+        return {
+            "entries": len(self._entries),
+            "buckets": len(self._buckets),
+            "leagues": leagues,
+            "updates": self.updates,
+            "evicted": self.evicted,
+        }
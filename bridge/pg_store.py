@@ -0,0 +1,209 @@
+"""
+Vantedge Naija Bridge - Direct Postgres Writes
+Optional asyncpg connection pool for the background writers; PostgREST (supabase client) remains the fallback
+"""
+
+import logging
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import fastjson
+
+logger = logging.getLogger(__name__)
+
+try:
+    import asyncpg
+    HAS_ASYNCPG = True
+except ImportError:  # optional dependency
+    asyncpg = None
+    HAS_ASYNCPG = False
+
+# Set-based RPCs shared with the PostgREST path (migrations/04_functions.sql), one round trip per batch
+UPSERT_VALUE_BETS = "SELECT public.upsert_value_bets($1::jsonb)"
+UPSERT_MARKET_ODDS = "SELECT public.upsert_market_odds($1::jsonb)"
+
+SCRAPER_HEALTH_COLUMNS = (
+    "bookmaker", "scraper_type", "status", "latency_ms", "success_rate",
+    "records_scraped", "error_count", "error_message", "last_successful_scrape",
+)
+ODDS_SNAPSHOT_COLUMNS = (
+    "match_id", "match_name", "sport", "league", "kickoff_time", "bookmaker",
+    "market", "selection", "odds", "is_sharp", "scraped_at",
+)
+PROXY_LOG_COLUMNS = (
+    "proxy_id", "bookmaker", "request_url", "response_code", "latency_ms", "was_blocked", "error_type", "created_at",
+)
+EVENT_ALIAS_COLUMNS = ("bookmaker", "native_id", "event_id", "home_team", "away_team", "league", "kickoff_time")
+PROXY_STATE_COLUMNS = (
+    "id", "provider", "ip_address", "port", "status", "success_count", "fail_count",
+    "last_used_at", "last_banned_at", "cooldown_until",
+)
+
+# Rows are built for PostgREST (ISO strings, floats); the binary protocol wants datetimes and Decimals
+TIMESTAMP_COLUMNS = frozenset({
+    "kickoff_time", "scraped_at", "created_at", "last_successful_scrape",
+    "last_used_at", "last_banned_at", "cooldown_until",
+})
+NUMERIC_COLUMNS = frozenset({"odds", "success_rate"})
+
+
+def _convert(column: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if column in TIMESTAMP_COLUMNS and isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if column in NUMERIC_COLUMNS and isinstance(value, float):
+        return Decimal(repr(value))
+    return value
+
+
+def to_records(rows: List[Dict[str, Any]], columns: Sequence[str]) -> List[Tuple]:
+    return [tuple(_convert(c, row.get(c)) for c in columns) for row in rows]
+
+
+class PostgresStore:
+    """
+    asyncpg pool used by the background writers instead of PostgREST.
+
+    - Statements are fixed strings, so asyncpg prepares each one once per
+      pooled connection and reuses it from its statement cache; the upsert
+      RPCs and the scraper_health insert skip parse/plan after the first call.
+    - Multi-row inserts use `executemany` (pipelined, one round trip); the
+      append-only tables (odds_snapshots, proxy_logs) use binary COPY.
+    - Nothing blocks the event loop and no row is JSON-encoded twice.
+
+    Point DATABASE_URL at the direct connection (port 5432) or a session-mode
+    pooler: transaction-mode poolers (pgbouncer on 6543) cannot keep prepared
+    statements - set PG_STATEMENT_CACHE_SIZE=0 there.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 5,
+        command_timeout: float = 30.0,
+        statement_cache_size: int = 100,
+    ):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.command_timeout = command_timeout
+        self.statement_cache_size = statement_cache_size
+        self.pool = None
+        self.last_error: Optional[str] = None
+        self.rows_written: Dict[str, int] = {}
+        self.write_seconds: Dict[str, float] = {}
+        self._insert_sql: Dict[Tuple, str] = {}
+
+    @property
+    def available(self) -> bool:
+        return self.pool is not None
+
+    async def start(self) -> bool:
+        """Open the pool; False (PostgREST stays in use) if asyncpg is missing or the database is unreachable"""
+        if not HAS_ASYNCPG:
+            logger.warning("⚠️ DATABASE_URL is set but asyncpg is not installed (pip install asyncpg); using PostgREST")
+            return False
+        try:
+            self.pool = await asyncpg.create_pool(
+                self.dsn,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                command_timeout=self.command_timeout,
+                statement_cache_size=self.statement_cache_size,
+            )
+        except Exception as e:
+            self.last_error = str(e)
+            logger.warning(f"⚠️ Direct Postgres connection failed, using PostgREST: {e}")
+            return False
+        logger.info(f"✅ Direct Postgres pool open ({self.min_size}-{self.max_size} connections)")
+        return True
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    def _count(self, table: str, rows: int, started: float):
+        self.rows_written[table] = self.rows_written.get(table, 0) + rows
+        self.write_seconds[table] = self.write_seconds.get(table, 0.0) + time.perf_counter() - started
+
+    async def call_batch_rpc(self, sql: str, table: str, rows: List[Dict[str, Any]]) -> int:
+        """Run a set-based upsert function with the whole batch as one jsonb parameter"""
+        started = time.perf_counter()
+        async with self.pool.acquire() as conn:
+            count = await conn.fetchval(sql, fastjson.dumps(rows).decode("utf-8"))
+        self._count(table, len(rows), started)
+        return count or 0
+
+    async def upsert_value_bets(self, rows: List[Dict[str, Any]]) -> int:
+        return await self.call_batch_rpc(UPSERT_VALUE_BETS, "value_opportunities", rows)
+
+    async def upsert_market_odds(self, rows: List[Dict[str, Any]]) -> int:
+        return await self.call_batch_rpc(UPSERT_MARKET_ODDS, "value_opportunity_markets", rows)
+
+    def insert_sql(self, table: str, columns: Sequence[str], conflict: Optional[Sequence[str]] = None) -> str:
+        """INSERT (optionally upserting on `conflict`) built once per table/columns, so it stays a cached statement"""
+        key = (table, tuple(columns), tuple(conflict or ()))
+        sql = self._insert_sql.get(key)
+        if sql is None:
+            placeholders = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+            sql = f"INSERT INTO public.{table} ({', '.join(columns)}) VALUES ({placeholders})"
+            if conflict:
+                updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c not in conflict)
+                sql += f" ON CONFLICT ({', '.join(conflict)}) DO UPDATE SET {updates}"
+            self._insert_sql[key] = sql
+        return sql
+
+    async def insert_many(self, table: str, columns: Sequence[str], rows: List[Dict[str, Any]], conflict: Optional[Sequence[str]] = None):
+        """Prepared multi-row INSERT/upsert via executemany (one transaction)"""
+        started = time.perf_counter()
+        async with self.pool.acquire() as conn:
+            await conn.executemany(self.insert_sql(table, columns, conflict), to_records(rows, columns))
+        self._count(table, len(rows), started)
+
+    async def copy_rows(self, table: str, columns: Sequence[str], rows: List[Dict[str, Any]]):
+        """Append rows with binary COPY - the fastest path for insert-only tables"""
+        started = time.perf_counter()
+        async with self.pool.acquire() as conn:
+            await conn.copy_records_to_table(
+                table, records=to_records(rows, columns), columns=list(columns), schema_name="public"
+            )
+        self._count(table, len(rows), started)
+
+    async def insert_scraper_health(self, rows: List[Dict[str, Any]]):
+        await self.insert_many("scraper_health", SCRAPER_HEALTH_COLUMNS, rows)
+
+    async def upsert_event_aliases(self, rows: List[Dict[str, Any]]):
+        await self.insert_many("event_aliases", EVENT_ALIAS_COLUMNS, rows, conflict=("bookmaker", "native_id"))
+
+    async def upsert_proxy_state(self, rows: List[Dict[str, Any]]):
+        latest = {row["id"]: row for row in rows}
+        await self.insert_many("proxy_pool", PROXY_STATE_COLUMNS, list(latest.values()), conflict=("id",))
+
+    async def copy_odds_snapshots(self, rows: List[Dict[str, Any]]):
+        await self.copy_rows("odds_snapshots", ODDS_SNAPSHOT_COLUMNS, rows)
+
+    async def copy_proxy_logs(self, rows: List[Dict[str, Any]]):
+        await self.copy_rows("proxy_logs", PROXY_LOG_COLUMNS, rows)
+
+    async def fetch(self, sql: str, *args) -> List[Dict[str, Any]]:
+        async with self.pool.acquire() as conn:
+            return [dict(record) for record in await conn.fetch(sql, *args)]
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.pool
+        return {
+            "available": self.available,
+            "pool_size": pool.get_size() if pool else 0,
+            "pool_idle": pool.get_idle_size() if pool else 0,
+            "rows_written": dict(self.rows_written),
+            "rows_per_sec": {
+                table: round(rows / self.write_seconds[table], 1) if self.write_seconds.get(table) else 0.0
+                for table, rows in self.rows_written.items()
+            },
+            "last_error": self.last_error,
+        }
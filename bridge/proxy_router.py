@@ -0,0 +1,412 @@
+"""
+Vantedge Naija Bridge - Proxy Router
+Spreads scraper requests over the proxy_pool by health score, cooling proxies down when bookmakers block them
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Bookmakers answer rate limits and IP bans with these
+BLOCK_STATUSES = frozenset({403, 429})
+
+# Pool rows in these states are never routed through (an admin has to reactivate them)
+_INACTIVE = frozenset({"banned", "retired"})
+
+# Weight of the newest outcome/latency in the moving averages
+_EWMA_ALPHA = 0.2
+
+
+def _parse_ts(value: Any) -> Optional[float]:
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat() if ts else None
+
+
+class NoProxyAvailable(Exception):
+    """Every proxy for a host is cooling down, banned or assigned elsewhere"""
+
+
+class ProxyEndpoint:
+    """One proxy_pool row plus its live health and its own pooled client"""
+
+    __slots__ = (
+        "id", "provider", "ip_address", "port", "status", "assigned_bookmaker",
+        "success_count", "fail_count", "last_used_at", "last_banned_at", "cooldown_until",
+        "consecutive_blocks", "consecutive_errors", "ewma_success", "ewma_latency_ms",
+        "in_flight", "headers", "client", "uses_since_sync",
+    )
+
+    def __init__(self, row: Dict[str, Any]):
+        self.id = str(row["id"])
+        self.ip_address = row["ip_address"]
+        self.port = int(row["port"])
+        self.client: Optional[httpx.AsyncClient] = None
+        self.headers: Dict[str, str] = {}
+        self.consecutive_blocks = 0
+        self.consecutive_errors = 0
+        self.in_flight = 0
+        self.uses_since_sync = 0
+        self.ewma_latency_ms = 0.0
+        self.update(row)
+        # Seed the moving average from the lifetime counts; untried proxies start optimistic so they get explored
+        total = self.success_count + self.fail_count
+        self.ewma_success = (self.success_count + 1) / (total + 2) if total else 1.0
+
+    def update(self, row: Dict[str, Any]):
+        """Refresh the admin-controlled fields from a (re)loaded pool row"""
+        self.provider = row.get("provider") or "techcenta"
+        self.status = row.get("status") or "active"
+        self.assigned_bookmaker = (row.get("assigned_bookmaker") or "").lower() or None
+        # Counters may be ahead of the last synced row; never move them backwards
+        self.success_count = max(int(row.get("success_count") or 0), getattr(self, "success_count", 0))
+        self.fail_count = max(int(row.get("fail_count") or 0), getattr(self, "fail_count", 0))
+        self.last_used_at = _parse_ts(row.get("last_used_at"))
+        self.last_banned_at = _parse_ts(row.get("last_banned_at"))
+        self.cooldown_until = _parse_ts(row.get("cooldown_until"))
+
+    def available(self, bookmaker: str, now: float) -> bool:
+        if self.status in _INACTIVE:
+            return False
+        if self.cooldown_until and self.cooldown_until > now:
+            return False
+        return self.assigned_bookmaker is None or self.assigned_bookmaker == bookmaker
+
+    def score(self, now: float, rest: float) -> float:
+        """
+        Higher is better: recent success rate, discounted by latency, current
+        load and how recently the exit was used (up to half until it has rested)
+        """
+        idle = now - self.last_used_at if self.last_used_at else rest
+        freshness = min(1.0, 0.5 + idle / (2 * rest)) if rest > 0 else 1.0
+        return self.ewma_success * freshness / (1.0 + self.ewma_latency_ms / 1000.0) / (1.0 + self.in_flight)
+
+    def state_row(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "provider": self.provider,
+            "ip_address": self.ip_address,
+            "port": self.port,
+            "status": self.status,
+            "success_count": self.success_count,
+            "fail_count": self.fail_count,
+            "last_used_at": _iso(self.last_used_at),
+            "last_banned_at": _iso(self.last_banned_at),
+            "cooldown_until": _iso(self.cooldown_until),
+        }
+
+
+class ProxyRouter:
+    """
+    Routes requests for selected upstream hosts through the proxy pool.
+
+    Each request goes to the healthier of two randomly sampled eligible
+    proxies (power of two choices); the score favours exits that have rested
+    for `rest` seconds, so load spreads across the pool while steering away
+    from slow or failing ones. A 403/429 puts the proxy into an
+    exponentially growing cooldown and the request is retried on another
+    proxy; `ban_after` consecutive blocks mark it banned. Every proxied request
+    becomes a proxy_logs row on `log_writer`, and proxy_pool counters/state
+    are queued on `state_writer` whenever they change status (and every
+    `state_every` uses otherwise).
+    """
+
+    def __init__(
+        self,
+        hosts: Iterable[str],
+        max_connections: int = 4,
+        keepalive_expiry: float = 60.0,
+        timeout: float = 30.0,
+        http2: bool = True,
+        scheme: str = "http",
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        cooldown: float = 300.0,
+        max_cooldown: float = 3600.0,
+        ban_after: int = 6,
+        error_threshold: int = 3,
+        error_cooldown: float = 60.0,
+        max_attempts: int = 2,
+        direct_fallback: bool = True,
+        state_every: int = 25,
+        rest: float = 5.0,
+        identity: Optional[Callable[[], Dict[str, str]]] = None,
+        log_writer=None,
+        state_writer=None,
+        transport_factory: Optional[Callable[[str], httpx.AsyncBaseTransport]] = None,
+    ):
+        self.hosts: Set[str] = set(hosts)
+        # Per proxy: a few warm connections per exit IP
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.http2 = http2
+        self.scheme = scheme
+        self.username = username
+        self.password = password
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.ban_after = ban_after
+        self.error_threshold = error_threshold
+        self.error_cooldown = error_cooldown
+        self.max_attempts = max_attempts
+        self.direct_fallback = direct_fallback
+        self.state_every = state_every
+        # Seconds after which a used exit counts as fully rested (spreads load over healthy proxies)
+        self.rest = rest
+        # Sticky per-proxy headers (one browser identity per exit IP)
+        self.identity = identity
+        self.log_writer = log_writer
+        self.state_writer = state_writer
+        # Test/replay hook: transport per proxy id instead of a real proxy connection
+        self.transport_factory = transport_factory
+        self._proxies: Dict[str, ProxyEndpoint] = {}
+        self._random = random.Random()
+        self._reload_task: Optional[asyncio.Task] = None
+
+        self.requests = 0
+        self.blocked = 0
+        self.errors = 0
+        self.retries = 0
+        self.direct_requests = 0
+
+    def __len__(self) -> int:
+        return len(self._proxies)
+
+    def routes(self, host: str) -> bool:
+        """True when requests to this upstream go through the pool"""
+        return host in self.hosts and bool(self._proxies)
+
+    async def load(self, rows: List[Dict[str, Any]]):
+        """Merge proxy_pool rows: keep clients of known proxies, close the ones that left or got banned"""
+        seen = set()
+        for row in rows:
+            if not row.get("id") or row.get("status") in _INACTIVE:
+                continue
+            proxy_id = str(row["id"])
+            seen.add(proxy_id)
+            proxy = self._proxies.get(proxy_id)
+            if proxy is None:
+                proxy = ProxyEndpoint(row)
+                if self.identity:
+                    proxy.headers = self.identity()
+                self._proxies[proxy_id] = proxy
+            else:
+                proxy.update(row)
+        for proxy_id in [p for p in self._proxies if p not in seen]:
+            await self._close(self._proxies.pop(proxy_id))
+        logger.info(f"🧭 Proxy pool loaded: {len(self._proxies)} usable proxies for {', '.join(sorted(self.hosts))}")
+
+    async def start(self, loader: Callable[[], Awaitable[List[Dict[str, Any]]]], interval: float = 300.0):
+        """Load the pool now and re-load it every `interval` seconds (admin changes, new proxies)"""
+        try:
+            await self.load(await loader())
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load proxy pool, requests go direct: {e}")
+
+        async def _reload():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.load(await loader())
+                except Exception as e:
+                    logger.warning(f"⚠️ Proxy pool reload failed: {e}")
+
+        if self._reload_task is None or self._reload_task.done():
+            self._reload_task = asyncio.create_task(_reload(), name="proxy-pool-reload")
+
+    async def aclose(self):
+        if self._reload_task:
+            self._reload_task.cancel()
+            try:
+                await self._reload_task
+            except asyncio.CancelledError:
+                pass
+            self._reload_task = None
+        for proxy in self._proxies.values():
+            await self._close(proxy)
+
+    async def _close(self, proxy: ProxyEndpoint):
+        if proxy.client is not None and not proxy.client.is_closed:
+            await proxy.client.aclose()
+        proxy.client = None
+
+    def proxy_url(self, proxy: ProxyEndpoint) -> str:
+        auth = f"{self.username}:{self.password}@" if self.username else ""
+        return f"{self.scheme}://{auth}{proxy.ip_address}:{proxy.port}"
+
+    def client(self, proxy: ProxyEndpoint) -> httpx.AsyncClient:
+        """The proxy's own pooled client, so connections through each exit IP are reused"""
+        if proxy.client is None or proxy.client.is_closed:
+            kwargs: Dict[str, Any] = {"timeout": self.timeout, "limits": self.limits}
+            if self.transport_factory:
+                kwargs["transport"] = self.transport_factory(proxy.id)
+            else:
+                kwargs["proxy"] = self.proxy_url(proxy)
+                kwargs["http2"] = self.http2
+            proxy.client = httpx.AsyncClient(**kwargs)
+        return proxy.client
+
+    def pick(self, bookmaker: str, exclude: Iterable[str] = ()) -> Optional[ProxyEndpoint]:
+        """Healthier of two random eligible proxies; None when none is eligible"""
+        now = time.time()
+        eligible = [
+            p for p in self._proxies.values()
+            if p.id not in exclude and p.available(bookmaker, now)
+        ]
+        if not eligible:
+            return None
+        if len(eligible) == 1:
+            return eligible[0]
+        a, b = self._random.sample(eligible, 2)
+        return a if a.score(now, self.rest) >= b.score(now, self.rest) else b
+
+    async def request(self, bookmaker: str, base_url: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """
+        Send through the pool, retrying blocked requests on another proxy.
+        Returns None when no proxy is eligible and direct fallback is allowed.
+        """
+        full_url = str(httpx.URL(base_url).join(url))
+        caller_headers = kwargs.pop("headers", None) or {}
+        tried: Set[str] = set()
+        response: Optional[httpx.Response] = None
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.max_attempts):
+            proxy = self.pick(bookmaker, tried)
+            if proxy is None:
+                break
+            if attempt:
+                self.retries += 1
+            tried.add(proxy.id)
+            headers = {**proxy.headers, **caller_headers}
+            if "User-Agent" in proxy.headers:
+                headers["User-Agent"] = proxy.headers["User-Agent"]
+
+            proxy.in_flight += 1
+            started = time.perf_counter()
+            try:
+                response = await self.client(proxy).request(method, full_url, headers=headers, **kwargs)
+            except httpx.TransportError as e:
+                last_error = e
+                await self._record(proxy, bookmaker, full_url, None, started, type(e).__name__)
+                continue
+            finally:
+                proxy.in_flight -= 1
+            await self._record(proxy, bookmaker, full_url, response.status_code, started, None)
+            if response.status_code not in BLOCK_STATUSES:
+                return response
+
+        if response is not None:
+            return response
+        if last_error is not None:
+            raise last_error
+        if self.direct_fallback:
+            self.direct_requests += 1
+            return None
+        raise NoProxyAvailable(f"No proxy available for {bookmaker}")
+
+    async def _record(self, proxy: ProxyEndpoint, bookmaker: str, url: str, status: Optional[int], started: float, error: Optional[str]):
+        now = time.time()
+        latency_ms = (time.perf_counter() - started) * 1000
+        blocked = status in BLOCK_STATUSES
+        ok = error is None and not blocked and status is not None and status < 500
+        status_before = proxy.status
+
+        self.requests += 1
+        proxy.last_used_at = now
+        proxy.uses_since_sync += 1
+        proxy.ewma_success += _EWMA_ALPHA * ((1.0 if ok else 0.0) - proxy.ewma_success)
+        proxy.ewma_latency_ms += _EWMA_ALPHA * (latency_ms - proxy.ewma_latency_ms)
+
+        if ok:
+            proxy.success_count += 1
+            proxy.consecutive_blocks = 0
+            proxy.consecutive_errors = 0
+            proxy.status = "active"
+        elif blocked:
+            self.blocked += 1
+            proxy.fail_count += 1
+            proxy.consecutive_blocks += 1
+            proxy.last_banned_at = now
+            if proxy.consecutive_blocks >= self.ban_after:
+                proxy.status = "banned"
+                logger.warning(f"🚫 Proxy {proxy.ip_address}:{proxy.port} banned after {proxy.consecutive_blocks} blocks from {bookmaker}")
+            else:
+                wait = min(self.max_cooldown, self.cooldown * 2 ** (proxy.consecutive_blocks - 1))
+                proxy.cooldown_until = now + wait
+                proxy.status = "cooling"
+                logger.warning(f"🧊 Proxy {proxy.ip_address}:{proxy.port} got {status} from {bookmaker}, cooling {wait:.0f}s")
+        else:
+            self.errors += 1
+            proxy.fail_count += 1
+            proxy.consecutive_errors += 1
+            if proxy.consecutive_errors >= self.error_threshold:
+                proxy.cooldown_until = now + self.error_cooldown
+                proxy.status = "cooling"
+                proxy.consecutive_errors = 0
+
+        if self.log_writer is not None:
+            await self.log_writer.put({
+                "proxy_id": proxy.id,
+                "bookmaker": bookmaker,
+                "request_url": url.split("?", 1)[0],
+                "response_code": status,
+                "latency_ms": int(latency_ms),
+                "was_blocked": blocked,
+                "error_type": error,
+                "created_at": _iso(now),
+            })
+        changed = blocked or proxy.status != status_before
+        if self.state_writer is not None and (changed or proxy.uses_since_sync >= self.state_every):
+            proxy.uses_since_sync = 0
+            await self.state_writer.put(proxy.state_row())
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        by_status: Dict[str, int] = {}
+        for proxy in self._proxies.values():
+            state = "cooling" if proxy.cooldown_until and proxy.cooldown_until > now else proxy.status
+            by_status[state] = by_status.get(state, 0) + 1
+        best = sorted(self._proxies.values(), key=lambda p: p.score(now, self.rest), reverse=True)[:5]
+        return {
+            "hosts": sorted(self.hosts),
+            "proxies": len(self._proxies),
+            "by_status": by_status,
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "errors": self.errors,
+            "retries": self.retries,
+            "direct_requests": self.direct_requests,
+            "top": [
+                {
+                    "proxy": f"{p.ip_address}:{p.port}",
+                    "score": round(p.score(now, self.rest), 3),
+                    "success_rate": round(p.ewma_success, 3),
+                    "latency_ms": round(p.ewma_latency_ms, 1),
+                }
+                for p in best
+            ],
+        }
@@ -0,0 +1,70 @@
+"""
+Vantedge Naija Bridge - Match Records
+Slotted per-match record the scrapers build once and every later stage shares
+"""
+
+from typing import Any, Dict, Iterator, Optional
+
+# Fields a match serializes with (the /api/odds/* contract); markets/event_id stay internal
+PUBLIC_FIELDS = ("id", "home_team", "away_team", "kickoff", "odds")
+
+
+class MatchRecord:
+    """
+    One scraped match. Replaces the per-match dicts: no per-instance __dict__,
+    no copy in normalize_odds_data, and written straight to JSON by
+    fastjson.dumps. The read-only mapping methods keep `match.get("odds")`
+    style callers (ingest, scheduler fingerprints, jsonable_encoder) working.
+    """
+
+    __slots__ = ("id", "home_team", "away_team", "kickoff", "odds", "markets", "event_id")
+
+    def __init__(
+        self,
+        id: str,
+        home_team: str,
+        away_team: str,
+        kickoff: Any,
+        odds: Optional[Dict[str, float]] = None,
+        markets: Optional[Dict[str, Dict[str, float]]] = None,
+        event_id: Optional[str] = None,
+    ):
+        self.id = id
+        self.home_team = home_team
+        self.away_team = away_team
+        self.kickoff = kickoff
+        self.odds = odds if odds is not None else {}
+        self.markets = markets
+        self.event_id = event_id
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def keys(self) -> Iterator[str]:
+        return iter(PUBLIC_FIELDS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "home_team": self.home_team,
+            "away_team": self.away_team,
+            "kickoff": self.kickoff,
+            "odds": self.odds,
+        }
+
+    def __repr__(self) -> str:
+        return f"MatchRecord({self.id!r}, {self.home_team!r} vs {self.away_team!r})"
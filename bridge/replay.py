@@ -0,0 +1,223 @@
+"""
+Vantedge Naija Bridge - Record/Replay Transports
+Capture raw upstream responses to disk and serve them back offline with simulated latency and errors
+
+Plugs into ClientRegistry.transport_factory:
+    CAPTURE_DIR=captures uvicorn main:app        # record while scraping live
+    http_clients.transport_factory = replay_factory("captures", latency=0.05)
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that don't identify the resource (secrets, cache busters)
+VOLATILE_PARAMS = frozenset({"apiKey", "_", "t", "timestamp"})
+
+# Headers that describe the wire encoding rather than the (already decoded) body
+_DROP_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9]+")
+
+
+def request_key(method: str, url: httpx.URL) -> str:
+    """Stable identity for a request: method, path and non-volatile query params"""
+    params = sorted((k, v) for k, v in url.params.multi_items() if k not in VOLATILE_PARAMS)
+    query = "&".join(f"{k}={v}" for k, v in params)
+    return f"{method.upper()} {url.path}?{query}"
+
+
+def _file_name(key: str) -> str:
+    method, _, rest = key.partition(" ")
+    path = rest.split("?", 1)[0]
+    digest = hashlib.sha1(key.encode()).hexdigest()[:10]
+    return f"{method}_{_UNSAFE.sub('_', path).strip('_')[-60:]}_{digest}.json"
+
+
+class CaptureTransport(httpx.AsyncBaseTransport):
+    """Pass-through transport that writes every response (decoded body) under `directory/host/`"""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, directory: str, host: str):
+        self.inner = inner
+        self.directory = os.path.join(directory, host)
+        self.host = host
+        self.captured = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        wire = httpx.Response(response.status_code, headers=response.headers, stream=response.stream, request=request)
+        body = await wire.aread()
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        headers = {k: v for k, v in wire.headers.items() if k.lower() not in _DROP_HEADERS}
+        key = request_key(request.method, request.url)
+        record: Dict[str, Any] = {
+            "key": key,
+            "host": self.host,
+            "method": request.method,
+            "path": request.url.path,
+            "status": wire.status_code,
+            "headers": headers,
+            "elapsed_ms": elapsed_ms,
+            "captured_at": time.time(),
+        }
+        try:
+            record["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            record["body_b64"] = base64.b64encode(body).decode()
+
+        path = os.path.join(self.directory, _file_name(key))
+        await asyncio.to_thread(self._write, path, record)
+        self.captured += 1
+        return httpx.Response(wire.status_code, headers=headers, content=body, request=request)
+
+    @staticmethod
+    def _write(path: str, record: Dict[str, Any]):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp, path)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serves captured responses for one host.
+
+    Requests are matched on their full key first, then on method + path (so a
+    capture of one league can stand in for another). `latency` (+/- `jitter`)
+    seconds are slept per request; with probability `error_rate` the request
+    fails with a connection error, or with HTTP `error_status` when given.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        host: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        self.host = host
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._by_key: Dict[str, Dict[str, Any]] = {}
+        self._by_path: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.served = 0
+        self.misses = 0
+        self.errors = 0
+
+        host_dir = os.path.join(directory, host)
+        if os.path.isdir(host_dir):
+            for name in sorted(os.listdir(host_dir)):
+                if not name.endswith(".json"):
+                    continue
+                with open(os.path.join(host_dir, name)) as f:
+                    record = json.load(f)
+                self.add(record)
+
+    def add(self, record: Dict[str, Any]):
+        """Register a capture record (also used to build synthetic fixtures in memory)"""
+        if "body_b64" in record:
+            record["_content"] = base64.b64decode(record["body_b64"])
+        else:
+            record["_content"] = record.get("body", "").encode("utf-8")
+        self._by_key[record["key"]] = record
+        self._by_path.setdefault((record["method"], record["path"]), record)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency or self.jitter:
+            delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+            await asyncio.sleep(max(0.0, delay))
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            if self.error_status:
+                return httpx.Response(self.error_status, content=b"replayed error", request=request)
+            raise httpx.ConnectError(f"Replayed connection error for {self.host}", request=request)
+
+        record = self._by_key.get(request_key(request.method, request.url))
+        if record is None:
+            record = self._by_path.get((request.method, request.url.path))
+        if record is None:
+            self.misses += 1
+            return httpx.Response(404, content=b"no capture", request=request)
+
+        self.served += 1
+        return httpx.Response(record["status"], headers=record.get("headers"), content=record["_content"], request=request)
+
+
+def capture_factory(directory: str, limits: httpx.Limits, http2: bool = True) -> Callable[[str], httpx.AsyncBaseTransport]:
+    """transport_factory that records live traffic while keeping the registry's pool limits"""
+    def factory(host: str) -> httpx.AsyncBaseTransport:
+        return CaptureTransport(httpx.AsyncHTTPTransport(http2=http2, limits=limits), directory, host)
+    return factory
+
+
+def replay_factory(directory: str, **options) -> Callable[[str], ReplayTransport]:
+    """transport_factory that serves captures from `directory` (see ReplayTransport for options)"""
+    def factory(host: str) -> ReplayTransport:
+        return ReplayTransport(directory, host, **options)
+    return factory
+
+
+def write_capture(directory: str, host: str, method: str, url: str, payload: Any, status: int = 200) -> str:
+    """Write a capture file by hand (synthetic fixtures for benchmarks)"""
+    request_url = httpx.URL(url)
+    key = request_key(method, request_url)
+    record = {
+        "key": key,
+        "host": host,
+        "method": method.upper(),
+        "path": request_url.path,
+        "status": status,
+        "headers": {"content-type": "application/json"},
+        "body": json.dumps(payload),
+        "captured_at": time.time(),
+    }
+    os.makedirs(os.path.join(directory, host), exist_ok=True)
+    path = os.path.join(directory, host, _file_name(key))
+    with open(path, "w") as f:
+        json.dump(record, f)
+    return path
+
+
+def list_captures(directory: str) -> Dict[str, List[str]]:
+    """{host: [request keys]} for everything captured under `directory`"""
+    result: Dict[str, List[str]] = {}
+    if not os.path.isdir(directory):
+        return result
+    for host in sorted(os.listdir(directory)):
+        host_dir = os.path.join(directory, host)
+        if not os.path.isdir(host_dir):
+            continue
+        keys = []
+        for name in sorted(os.listdir(host_dir)):
+            if name.endswith(".json"):
+                with open(os.path.join(host_dir, name)) as f:
+                    keys.append(json.load(f).get("key", name))
+        result[host] = keys
+    return result
@@ -0,0 +1,245 @@
+"""
+Vantedge Naija Bridge - Rate Limiting & Circuit Breaking
+Adaptive (AIMD) token buckets per upstream host and closed/open/half-open breakers per scraper
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean "slow down" rather than "broken"
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class RateLimited(Exception):
+    """The host's token bucket can't grant a request within the caller's wait budget"""
+
+    def __init__(self, message: str, retry_in: float):
+        super().__init__(message)
+        self.retry_in = retry_in
+
+
+class CircuitOpenError(Exception):
+    """The scraper's breaker is open; fail fast instead of calling the upstream"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit open, retry in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate follows AIMD.
+
+    Each fast, successful response adds `increase` req/s (up to `max_rate`);
+    a 429/503 halves the rate (times `decrease`) and honours Retry-After,
+    and a response slower than `latency_target` trims it gently. Decreases
+    are applied at most once per `decrease_interval` so one burst of
+    rejections doesn't collapse the rate to the floor.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float = 5.0,
+        burst: int = 5,
+        min_rate: float = 0.2,
+        max_rate: float = 20.0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        latency_target: float = 5.0,
+        decrease_interval: float = 2.0,
+        max_wait: float = 10.0,
+    ):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.decrease_interval = decrease_interval
+        self.max_wait = max_wait
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+
+        self.granted = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.waited_s = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, max_wait: Optional[float] = None):
+        """Wait for a token; raise RateLimited if that would take longer than `max_wait`"""
+        budget = self.max_wait if max_wait is None else max_wait
+        now = time.monotonic()
+        self._refill(now)
+        wait = max(0.0, self._paused_until - now)
+        if self._tokens < 1:
+            wait = max(wait, (1 - self._tokens) / self.rate)
+        if wait > budget:
+            self.rejected += 1
+            raise RateLimited(f"{self.name} rate limited ({self.rate:.2f} req/s), next slot in {wait:.1f}s", wait)
+        # Reserve the token before sleeping (the balance may go negative), so later callers queue behind
+        self._tokens -= 1
+        self.granted += 1
+        if wait > 0:
+            self.waited_s += wait
+            await asyncio.sleep(wait)
+
+    def on_response(self, status: Optional[int], latency: float, retry_after: Optional[float] = None):
+        """Adjust the rate from one response (status None = transport error, left to the breaker)"""
+        if status is None:
+            return
+        now = time.monotonic()
+        if status in THROTTLE_STATUSES:
+            self.throttled += 1
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            self._cut(now, self.decrease)
+        elif latency > self.latency_target:
+            self._cut(now, 0.9)
+        elif status < 400:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def _cut(self, now: float, factor: float):
+        if now - self._last_decrease < self.decrease_interval:
+            return
+        self._last_decrease = now
+        previous = self.rate
+        self.rate = max(self.min_rate, self.rate * factor)
+        if self.rate < previous:
+            logger.info(f"🐢 {self.name} rate {previous:.2f} -> {self.rate:.2f} req/s")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": round(self.rate, 3),
+            "burst": self.burst,
+            "tokens": round(min(self.burst, self._tokens + (time.monotonic() - self._updated) * self.rate), 2),
+            "paused_s": round(max(0.0, self._paused_until - time.monotonic()), 1),
+            "granted": self.granted,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "waited_s": round(self.waited_s, 2),
+        }
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures.
+    open -> half_open once `recovery_timeout` has passed; one trial call is let through.
+    half_open -> closed on success, or back to open with the timeout doubled
+    (up to `max_recovery_timeout`) on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        max_recovery_timeout: float = 600.0,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_recovery_timeout = recovery_timeout
+        self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max_recovery_timeout
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_started: Optional[float] = None
+
+        self.short_circuited = 0
+        self.times_opened = 0
+        self.last_failure: Optional[str] = None
+        self.last_state_change = time.time()
+
+    def retry_in(self, now: Optional[float] = None) -> float:
+        if self.state != self.OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_timeout - (now or time.time()))
+
+    def allow(self) -> bool:
+        """True if a call may go to the upstream now"""
+        now = time.time()
+        if self.state == self.OPEN:
+            if self.retry_in(now) > 0:
+                self.short_circuited += 1
+                return False
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN:
+            # One trial at a time; a trial that never reported back expires after the timeout
+            if self._trial_started is not None and now - self._trial_started < self.recovery_timeout:
+                self.short_circuited += 1
+                return False
+            self._trial_started = now
+        return True
+
+    def check(self):
+        """allow() that raises CircuitOpenError instead of returning False"""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in() or self.recovery_timeout)
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self._trial_started = None
+        if self.state != self.CLOSED:
+            self.recovery_timeout = self.base_recovery_timeout
+            self._transition(self.CLOSED)
+
+    def release(self):
+        """
+        End a call with no verdict on the upstream (e.g. rate limited locally):
+        a half-open trial frees its slot so the next call can be the trial
+        """
+        self._trial_started = None
+
+    def record_failure(self, error: Optional[str] = None):
+        self.consecutive_failures += 1
+        self.last_failure = error
+        self._trial_started = None
+        if self.state == self.HALF_OPEN:
+            self.recovery_timeout = min(self.max_recovery_timeout, self.recovery_timeout * 2)
+            self._open()
+        elif self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self.opened_at = time.time()
+        self.times_opened += 1
+        self._transition(self.OPEN)
+        logger.warning(f"🔌 {self.name} circuit open for {self.recovery_timeout:.0f}s after {self.consecutive_failures} failures ({self.last_failure})")
+
+    def _transition(self, state: str):
+        if state != self.state:
+            self.state = state
+            self.last_state_change = time.time()
+            if state == self.CLOSED:
+                logger.info(f"✅ {self.name} circuit closed")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_s": round(self.retry_in(), 1),
+            "recovery_timeout_s": self.recovery_timeout,
+            "times_opened": self.times_opened,
+            "short_circuited": self.short_circuited,
+            "last_failure": self.last_failure,
+        }
@@ -0,0 +1,318 @@
+"""
+Vantedge Naija Bridge - Background Poll Scheduler
+Polls every (bookmaker, league) pair on its own adaptive interval and keeps the
+latest normalized snapshot in memory for the GET endpoints
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from shared_store import SharedDocument
+from sharp_matcher import kickoff_timestamp
+
+logger = logging.getLogger(__name__)
+
+PairKey = Tuple[str, str]
+PollFunc = Callable[[str, str], Awaitable[Dict[str, Any]]]
+
+
+class OddsSnapshot:
+    """Latest normalized payload for one (bookmaker, league) pair"""
+
+    __slots__ = ("bookmaker", "league", "payload", "fetched_at", "stale_after", "fingerprint")
+
+    def __init__(self, bookmaker: str, league: str, payload: Dict[str, Any], fetched_at: float, stale_after: float):
+        self.bookmaker = bookmaker
+        self.league = league
+        self.payload = payload
+        self.fetched_at = fetched_at
+        self.stale_after = stale_after
+        self.fingerprint = odds_fingerprint(payload)
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) >= self.stale_after
+
+    def as_response(self) -> Dict[str, Any]:
+        """Payload annotated with snapshot freshness"""
+        now = time.time()
+        return {
+            **self.payload,
+            "cached": True,
+            "age_s": round(now - self.fetched_at, 1),
+            "stale_after": datetime.fromtimestamp(self.stale_after, timezone.utc).isoformat(),
+            "stale": self.is_stale(now),
+        }
+
+
+def odds_fingerprint(payload: Dict[str, Any]) -> str:
+    """Hash of the matches and prices only (ignores timestamps)"""
+    matches = payload.get("matches", [])
+    body = json.dumps(
+        [(m.get("id"), m.get("kickoff"), m.get("odds")) for m in matches],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(body.encode(), digest_size=12).hexdigest()
+
+
+class OddsSnapshotStore:
+    """
+    In-memory latest snapshot per (bookmaker, league).
+
+    With a shared `backend` (see shared_store.py) every put is also published
+    there, and get() picks up a newer snapshot written by another worker.
+    """
+
+    def __init__(self, default_stale_after: float = 300.0, backend=None):
+        self.default_stale_after = default_stale_after
+        self.backend = backend
+        self._snapshots: Dict[PairKey, OddsSnapshot] = {}
+        self._shared: Dict[PairKey, SharedDocument] = {}
+
+    def _document(self, bookmaker: str, league: str) -> SharedDocument:
+        doc = self._shared.get((bookmaker, league))
+        if doc is None:
+            doc = self._shared[(bookmaker, league)] = SharedDocument(self.backend, f"odds:{bookmaker}:{league}")
+        return doc
+
+    def get(self, bookmaker: str, league: str) -> Optional[OddsSnapshot]:
+        snapshot = self._snapshots.get((bookmaker, league))
+        if self.backend is not None:
+            shared = self._document(bookmaker, league).read()
+            if shared and (snapshot is None or shared["fetched_at"] > snapshot.fetched_at):
+                snapshot = OddsSnapshot(bookmaker, league, shared["payload"], shared["fetched_at"], shared["stale_after"])
+                self._snapshots[(bookmaker, league)] = snapshot
+        return snapshot
+
+    def put(
+        self,
+        bookmaker: str,
+        league: str,
+        payload: Dict[str, Any],
+        stale_in: Optional[float] = None,
+        fetched_at: Optional[float] = None,
+    ) -> OddsSnapshot:
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        snapshot = OddsSnapshot(
+            bookmaker,
+            league,
+            payload,
+            fetched_at,
+            fetched_at + (stale_in if stale_in is not None else self.default_stale_after),
+        )
+        self._snapshots[(bookmaker, league)] = snapshot
+        if self.backend is not None:
+            try:
+                self._document(bookmaker, league).write({
+                    "payload": payload,
+                    "fetched_at": snapshot.fetched_at,
+                    "stale_after": snapshot.stale_after,
+                })
+            except Exception as e:
+                logger.warning(f"⚠️ Could not publish {bookmaker}/{league} snapshot to the shared store: {e}")
+        return snapshot
+
+    def items(self) -> Iterable[Tuple[PairKey, OddsSnapshot]]:
+        return self._snapshots.items()
+
+    def clear(self):
+        self._snapshots.clear()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+
+class PollJob:
+    """Scheduling state for one (bookmaker, league) pair"""
+
+    def __init__(self, bookmaker: str, league: str, interval: float):
+        self.bookmaker = bookmaker
+        self.league = league
+        self.interval = interval
+        self.next_run = 0.0
+        self.runs = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.quiet_streak = 0
+        self.last_duration_ms = 0
+        self.last_error: Optional[str] = None
+        self.last_fingerprint: Optional[str] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "interval_s": round(self.interval, 1),
+            "next_run_in_s": round(max(0.0, self.next_run - time.time()), 1),
+            "runs": self.runs,
+            "failures": self.failures,
+            "quiet_streak": self.quiet_streak,
+            "last_duration_ms": self.last_duration_ms,
+            "last_error": self.last_error,
+        }
+
+
+class PollScheduler:
+    """
+    Runs one polling loop per (bookmaker, league) pair.
+
+    Intervals adapt per pair:
+    - kickoff within `near_kickoff` seconds -> `min_interval`
+    - kickoff within a day -> `base_interval`
+    - nothing upcoming -> `max_interval`
+    - unchanged results stretch the interval (quiet league), failures back off
+    - a payload flagged `degraded` or carrying an `error` counts as a failure
+      and is not stored, so readers keep the previous good snapshot
+    Every interval gets +/- `jitter` randomization, and at most
+    `max_concurrency` polls run at once.
+    """
+
+    def __init__(
+        self,
+        store: OddsSnapshotStore,
+        poll_func: PollFunc,
+        pairs: List[PairKey],
+        min_interval: float = 30.0,
+        base_interval: float = 120.0,
+        max_interval: float = 900.0,
+        near_kickoff: float = 2 * 3600,
+        jitter: float = 0.15,
+        max_concurrency: int = 4,
+    ):
+        self.store = store
+        self.poll_func = poll_func
+        self.min_interval = min_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.near_kickoff = near_kickoff
+        self.jitter = jitter
+        self.max_concurrency = max_concurrency
+
+        self.jobs: Dict[PairKey, PollJob] = {pair: PollJob(*pair, base_interval) for pair in pairs}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return any(not t.done() for t in self._tasks)
+
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def next_interval(self, job: PollJob, payload: Dict[str, Any]) -> float:
+        """Interval until the next poll, from kickoff proximity and how quiet the pair is"""
+        now = time.time()
+        upcoming = [
+            ts - now
+            for ts in (kickoff_timestamp(m.get("kickoff")) for m in payload.get("matches", []))
+            if ts is not None and ts > now - 2 * 3600
+        ]
+        if not upcoming:
+            interval = self.max_interval
+        else:
+            nearest = min(upcoming)
+            if nearest <= self.near_kickoff:
+                interval = self.min_interval
+            elif nearest <= 24 * 3600:
+                interval = self.base_interval
+            else:
+                interval = self.base_interval * 2
+
+        fingerprint = odds_fingerprint(payload)
+        job.quiet_streak = job.quiet_streak + 1 if fingerprint == job.last_fingerprint else 0
+        job.last_fingerprint = fingerprint
+
+        interval *= 1.5 ** min(job.quiet_streak, 4)
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    @staticmethod
+    def failed_payload(payload: Dict[str, Any]) -> Optional[str]:
+        """Why a poll result must not replace the stored snapshot, or None when it is good"""
+        if payload.get("error"):
+            return str(payload["error"])
+        if payload.get("degraded"):
+            return "degraded scrape (fallback data)"
+        return None
+
+    async def run_once(self, job: PollJob) -> Optional[OddsSnapshot]:
+        """Poll a pair now and store the result"""
+        start = time.perf_counter()
+        job.runs += 1
+        try:
+            async with self._semaphore:
+                payload = await self.poll_func(job.bookmaker, job.league)
+            reason = self.failed_payload(payload)
+            if reason:
+                raise RuntimeError(reason)
+            job.interval = self.next_interval(job, payload)
+            job.consecutive_failures = 0
+            job.last_error = None
+            # Readers treat data as stale after two missed polls
+            return self.store.put(job.bookmaker, job.league, payload, stale_in=job.interval * 2)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.failures += 1
+            job.consecutive_failures += 1
+            job.last_error = str(e)
+            job.interval = min(self.max_interval, self.base_interval * 2 ** job.consecutive_failures)
+            logger.error(f"❌ Poll {job.bookmaker}/{job.league} failed: {e}")
+            return None
+        finally:
+            job.last_duration_ms = int((time.perf_counter() - start) * 1000)
+
+    async def _loop(self, job: PollJob, initial_delay: float):
+        job.next_run = time.time() + initial_delay
+        await asyncio.sleep(initial_delay)
+        while True:
+            await self.run_once(job)
+            delay = self._jittered(job.interval)
+            job.next_run = time.time() + delay
+            await asyncio.sleep(delay)
+
+    def _initial_delay(self, job: PollJob) -> float:
+        """
+        Staggered start, or - when the store already holds a snapshot (restored
+        from a checkpoint, or published by a previous leader) - the time its
+        next poll was due, so a restart doesn't re-scrape fresh pairs at once
+        """
+        stagger = random.uniform(0, min(5.0, self.min_interval))
+        snapshot = self.store.get(job.bookmaker, job.league)
+        if snapshot is None:
+            return stagger
+        # Snapshots are stored with stale_in = 2 x the poll interval
+        job.interval = min(self.max_interval, max(self.min_interval, (snapshot.stale_after - snapshot.fetched_at) / 2))
+        job.last_fingerprint = snapshot.fingerprint
+        return max(stagger, snapshot.fetched_at + job.interval - time.time())
+
+    async def start(self):
+        """Start one polling loop per pair, staggered so they don't fire together"""
+        if self.running:
+            return
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._tasks = [
+            asyncio.create_task(
+                self._loop(job, self._initial_delay(job)),
+                name=f"poll-{job.bookmaker}-{job.league}",
+            )
+            for job in self.jobs.values()
+        ]
+        logger.info(f"✅ Poll scheduler started for {len(self.jobs)} bookmaker/league pairs")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("🛑 Poll scheduler stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "max_concurrency": self.max_concurrency,
+            "jobs": {f"{b}/{l}": job.stats() for (b, l), job in self.jobs.items()},
+        }
@@ -0,0 +1,280 @@
+"""
+Vantedge Naija Bridge - Multi-Worker Coordination
+File-lock leader election and a snapshot store shared by every worker process
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import fastjson
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, every process acts alone
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElection:
+    """
+    One leader per host, chosen with an exclusive non-blocking flock on
+    `lock_path`. The kernel drops the lock when the leader exits or crashes,
+    and followers retry every `retry_interval` seconds, so a restarted or
+    killed leader is replaced without coordination.
+    """
+
+    def __init__(self, lock_path: str, retry_interval: float = 5.0):
+        self.lock_path = lock_path
+        self.retry_interval = retry_interval
+        self.is_leader = False
+        self.elected_at: Optional[float] = None
+        self._fd: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._on_elected: List[Callable[[], Awaitable[None]]] = []
+
+    def on_elected(self, callback: Callable[[], Awaitable[None]]):
+        """Run `callback` once this process becomes leader"""
+        self._on_elected.append(callback)
+
+    def try_acquire(self) -> bool:
+        if self.is_leader:
+            return True
+        if fcntl is None:
+            self.is_leader = True
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self.lock_path)), exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode())
+            self._fd = fd
+            self.is_leader = True
+        self.elected_at = time.time()
+        logger.info(f"👑 Worker {os.getpid()} is the scrape leader")
+        return True
+
+    def leader_pid(self) -> Optional[int]:
+        try:
+            with open(self.lock_path) as f:
+                return int(f.read().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    async def _run(self):
+        while not self.is_leader:
+            if self.try_acquire():
+                break
+            await asyncio.sleep(self.retry_interval)
+        for callback in self._on_elected:
+            try:
+                await callback()
+            except Exception as e:
+                logger.error(f"❌ Leader start-up step failed: {e}")
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="leader-election")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self.is_leader = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "role": "leader" if self.is_leader else "follower",
+            "pid": os.getpid(),
+            "leader_pid": os.getpid() if self.is_leader else self.leader_pid(),
+            "elected_at": self.elected_at,
+            "lock_path": self.lock_path,
+        }
+
+
+class FileSnapshotBackend:
+    """
+    One file per key under `directory` (tmpfs such as /dev/shm keeps it in memory).
+
+    Writers replace files atomically (write + rename), so readers never see a
+    half-written snapshot; readers re-read only when the file's mtime/size changed.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key.replace("/", "_") + ".json")
+
+    def set(self, key: str, value: bytes):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(value)
+        os.replace(tmp, path)
+
+    def version(self, key: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self._path(key))
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+class KeyValueSnapshotBackend:
+    """
+    Backend over any client with get/set (redis-py, or a local stand-in for tests).
+    Each value carries its own version, so readers compare a short version key first.
+    """
+
+    def __init__(self, client, prefix: str = "bridge:snapshot:"):
+        self.client = client
+        self.prefix = prefix
+
+    def set(self, key: str, value: bytes):
+        self.client.set(f"{self.prefix}{key}", value)
+        self.client.set(f"{self.prefix}{key}:v", str(time.time_ns()))
+
+    def version(self, key: str) -> Optional[Any]:
+        return self.client.get(f"{self.prefix}{key}:v")
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(f"{self.prefix}{key}")
+
+
+def open_backend(url: str):
+    """`redis://...` for a Redis (or compatible) server, anything else is a directory"""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        import redis  # optional dependency, only needed for this backend
+        return KeyValueSnapshotBackend(redis.Redis.from_url(url))
+    return FileSnapshotBackend(url)
+
+
+class SharedDocument:
+    """
+    A JSON document (payload + metadata) in a shared backend, decoded at most
+    once per version per process.
+    """
+
+    def __init__(self, backend, key: str):
+        self.backend = backend
+        self.key = key
+        self._version: Any = None
+        self._value: Any = None
+
+    def write(self, value: Any):
+        self.backend.set(self.key, fastjson.dumps(value))
+        # The writer already holds the value; don't decode our own write back
+        self._version = self.backend.version(self.key)
+        self._value = value
+
+    def read(self) -> Any:
+        version = self.backend.version(self.key)
+        if version is None:
+            return None
+        if version != self._version:
+            raw = self.backend.get(self.key)
+            self._value = fastjson.loads(raw) if raw else None
+            self._version = version
+        return self._value
+
+
+class SharedReplica:
+    """
+    Leader-to-follower copy of an in-memory structure that has an `updates`
+    counter, `dump()` and `load()` (the merged board, the opportunity index).
+
+    The leader publishes a dump every `interval` seconds when `updates` moved;
+    followers `refresh()` their own instance, once per published version,
+    before serving a read from it.
+    """
+
+    def __init__(self, backend, key: str, source, interval: float = 5.0):
+        self.document = SharedDocument(backend, key)
+        self.source = source
+        self.interval = interval
+        self._published_updates: Optional[int] = None
+        self._loaded: Any = None
+        self._task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.published_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def publish(self) -> bool:
+        if self.source.updates == self._published_updates:
+            return False
+        self.document.write({"published_at": time.time(), "data": self.source.dump()})
+        self._published_updates = self.source.updates
+        self.published += 1
+        self.published_at = time.time()
+        return True
+
+    def refresh(self, replica) -> Optional[float]:
+        """Load the latest publication into `replica` if it changed; when it was published (None if never)"""
+        value = self.document.read()
+        if value is None:
+            return None
+        if value is not self._loaded:
+            replica.load(value["data"])
+            self._loaded = value
+        return value["published_at"]
+
+    async def _run(self):
+        while True:
+            try:
+                self.publish()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"⚠️ Publishing {self.document.key} failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"publish-{self.document.key}")
+
+    async def stop(self):
+        """Stop publishing and publish once more (only on the leader, which started it)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            self.publish()
+        except Exception as e:
+            logger.warning(f"⚠️ Final publish of {self.document.key} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "publishing": self._task is not None and not self._task.done(),
+            "published": self.published,
+            "published_at": self.published_at,
+            "last_error": self.last_error,
+        }
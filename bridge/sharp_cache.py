@@ -0,0 +1,209 @@
+"""
+Vantedge Naija Bridge - Sharp Odds Cache
+Single-flight, stale-while-revalidate LRU cache for per-league OddsAPI responses
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sharp_matcher import SharpOddsIndex, kickoff_timestamp
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[str], Awaitable[Optional[List[Dict]]]]
+
+
+class SharpCacheEntry:
+    """One league's sharp events plus the matcher index built from them"""
+
+    __slots__ = ("league", "events", "index", "fetched_at", "ttl")
+
+    def __init__(self, league: str, events: List[Dict], fetched_at: float, ttl: float):
+        self.league = league
+        self.events = events
+        self.index = SharpOddsIndex(events)
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+
+    def age(self, now: float) -> float:
+        return now - self.fetched_at
+
+
+class SharpOddsCache:
+    """
+    Per-league cache in front of the OddsAPI.
+
+    - Fresh entries are served directly.
+    - Stale entries (older than their TTL but younger than `max_stale`) are
+      served immediately while a background refresh runs.
+    - Concurrent refreshes for the same league share one upstream request.
+    - TTLs shrink as the league's next kickoff approaches.
+    - At most `max_entries` leagues are kept, least recently used evicted first.
+    - A failed load is remembered per league and not retried for
+      `negative_ttl * 2**failures` seconds (capped at `base_ttl`), so a
+      league the OddsAPI keeps rejecting does not burn quota on every lookup.
+    """
+
+    def __init__(
+        self,
+        base_ttl: float = 900.0,
+        min_ttl: float = 120.0,
+        max_stale: float = 3600.0,
+        max_entries: int = 32,
+        negative_ttl: float = 60.0,
+    ):
+        self.base_ttl = base_ttl
+        self.min_ttl = min_ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.negative_ttl = negative_ttl
+
+        self._entries: "OrderedDict[str, SharpCacheEntry]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._background: set = set()
+        # league -> (consecutive failed loads, no reload before this time)
+        self._failed: Dict[str, tuple] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.evictions = 0
+
+    def ttl_for(self, events: List[Dict], now: float) -> float:
+        """Shorter TTL the closer the league's next kickoff is"""
+        upcoming = [
+            ts - now
+            for ts in (kickoff_timestamp(e.get("commence_time")) for e in events)
+            if ts is not None and ts > now - 7200  # include games in play
+        ]
+        if not upcoming:
+            return self.base_ttl * 2
+        nearest = min(upcoming)
+        if nearest <= 3600:
+            ttl = self.base_ttl / 6
+        elif nearest <= 6 * 3600:
+            ttl = self.base_ttl / 3
+        elif nearest <= 24 * 3600:
+            ttl = self.base_ttl
+        else:
+            ttl = self.base_ttl * 2
+        return max(self.min_ttl, ttl)
+
+    def peek(self, league: str) -> Optional[SharpCacheEntry]:
+        """Entry for a league without touching counters or LRU order"""
+        return self._entries.get(league)
+
+    def clear(self):
+        """Drop every league so the next get() is a miss"""
+        self._entries.clear()
+        self._failed.clear()
+
+    def items(self):
+        return self._entries.items()
+
+    def restore(self, league: str, events: List[Dict], fetched_at: float) -> bool:
+        """Re-insert a league fetched at `fetched_at` (a checkpoint) unless it is too old to serve even stale"""
+        now = time.time()
+        if now - fetched_at >= self.ttl_for(events, now) + self.max_stale:
+            return False
+        self.put(league, events, fetched_at)
+        return True
+
+    def put(self, league: str, events: List[Dict], fetched_at: Optional[float] = None) -> SharpCacheEntry:
+        """Insert or replace a league's events, evicting the LRU entry if full"""
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+        entry = SharpCacheEntry(league, events, fetched_at, self.ttl_for(events, time.time()))
+        self._entries[league] = entry
+        self._entries.move_to_end(league)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            logger.debug(f"Evicted sharp odds for {evicted}")
+        return entry
+
+    async def _refresh(self, league: str, loader: Loader) -> Optional[SharpCacheEntry]:
+        self.refreshes += 1
+        try:
+            events = await loader(league)
+        except Exception as e:
+            logger.error(f"❌ Sharp odds refresh failed for {league}: {e}")
+            events = None
+        if events is None:
+            self.refresh_failures += 1
+            failures, _ = self._failed.get(league, (0, 0.0))
+            backoff = min(self.base_ttl, self.negative_ttl * 2 ** failures)
+            self._failed[league] = (failures + 1, time.time() + backoff)
+            logger.warning(f"⏳ Not reloading sharp odds for {league} for {backoff:.0f}s")
+            # Keep serving whatever we had
+            return self._entries.get(league)
+        self._failed.pop(league, None)
+        return self.put(league, events)
+
+    def _backing_off(self, league: str, now: float) -> bool:
+        failed = self._failed.get(league)
+        return failed is not None and now < failed[1]
+
+    def _refresh_in_background(self, league: str, loader: Loader):
+        if self._flight.in_flight(league):
+            return
+        task = self._flight.start(league, lambda: self._refresh(league, loader))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get(self, league: str, loader: Loader) -> Optional[SharpCacheEntry]:
+        """Cached entry for a league, loading/refreshing through `loader` as needed"""
+        now = time.time()
+        entry = self._entries.get(league)
+
+        if entry is not None:
+            age = entry.age(now)
+            self._entries.move_to_end(league)
+            if age < entry.ttl:
+                self.hits += 1
+                return entry
+            if age < entry.ttl + self.max_stale:
+                self.stale_hits += 1
+                if not self._backing_off(league, now):
+                    self._refresh_in_background(league, loader)
+                return entry
+
+        if self._backing_off(league, now):
+            self.negative_hits += 1
+            return None
+
+        self.misses += 1
+        return await self._flight.do(league, lambda: self._refresh(league, loader))
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus per-league age/TTL"""
+        now = time.time()
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "coalesced_refreshes": self._flight.coalesced,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "backing_off": sorted(league for league in self._failed if self._backing_off(league, now)),
+            "max_entries": self.max_entries,
+            "leagues": {
+                league: {
+                    "events": len(entry.events),
+                    "age_s": round(entry.age(now), 1),
+                    "ttl_s": round(entry.ttl, 1),
+                }
+                for league, entry in self._entries.items()
+            },
+        }
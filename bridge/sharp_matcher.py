@@ -0,0 +1,265 @@
+"""
+Vantedge Naija Bridge - Indexed Sharp Odds Matcher
+Matches soft-book fixtures to OddsAPI (Pinnacle) events through a precomputed index
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from datetime import datetime, timezone
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+# Whole-name aliases, applied after normalization
+TEAM_ALIASES = {
+    "man utd": "manchester united",
+    "man united": "manchester united",
+    "manchester utd": "manchester united",
+    "man city": "manchester city",
+    "spurs": "tottenham hotspur",
+    "tottenham": "tottenham hotspur",
+    "wolves": "wolverhampton wanderers",
+    "nottm forest": "nottingham forest",
+    "nottingham": "nottingham forest",
+    "newcastle": "newcastle united",
+    "west ham": "west ham united",
+    "brighton": "brighton and hove albion",
+    "brighton hove albion": "brighton and hove albion",
+    "leicester": "leicester city",
+    "psg": "paris saint germain",
+    "paris sg": "paris saint germain",
+    "inter": "inter milan",
+    "internazionale": "inter milan",
+    "ac milan": "milan",
+    "atletico": "atletico madrid",
+    "atl madrid": "atletico madrid",
+    "athletic bilbao": "athletic club",
+    "betis": "real betis",
+    "bayern": "bayern munich",
+    "bayern munchen": "bayern munich",
+    "gladbach": "borussia monchengladbach",
+    "b monchengladbach": "borussia monchengladbach",
+    "dortmund": "borussia dortmund",
+    "leverkusen": "bayer leverkusen",
+    "koln": "fc koln",
+    "cologne": "fc koln",
+}
+
+# Token-level rewrites and filler tokens that carry no identity
+TOKEN_ALIASES = {
+    "utd": "united",
+    "st": "saint",
+    "munchen": "munich",
+}
+STOP_TOKENS = frozenset({"fc", "cf", "afc", "sc", "ac", "the", "de", "club", "calcio", "ssc", "as"})
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+
+# Kickoffs further apart than this are not the same fixture
+MAX_KICKOFF_DRIFT_SECONDS = 36 * 3600
+# A shortened name ("Tottenham" / "Tottenham Hotspur") only matches when the kickoffs agree this closely
+CONFIRM_KICKOFF_SECONDS = 3 * 3600
+# Name score when one name's tokens are all contained in the other's
+CONTAINED_NAME_QUALITY = 0.9
+# Quality multiplier when either kickoff is unknown, so nothing unconfirmed scores 1.0
+UNKNOWN_KICKOFF_FACTOR = 0.8
+MIN_MATCH_QUALITY = 0.75
+
+
+@lru_cache(maxsize=4096)
+def normalize_team(name: str) -> str:
+    """Lowercase, strip accents/punctuation and resolve known aliases"""
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = text.replace("'", "").replace("\u2019", "").replace("&", " and ")
+    text = _NON_ALNUM.sub(" ", text)
+    tokens = [TOKEN_ALIASES.get(t, t) for t in text.split()]
+    normalized = " ".join(tokens)
+    normalized = TEAM_ALIASES.get(normalized, normalized)
+    # Drop filler tokens unless that would leave nothing (e.g. "AS Roma" -> "roma")
+    kept = [t for t in normalized.split() if t not in STOP_TOKENS]
+    normalized = " ".join(kept) if kept else normalized
+    return TEAM_ALIASES.get(normalized, normalized)
+
+
+def team_tokens(normalized: str) -> FrozenSet[str]:
+    return frozenset(normalized.split())
+
+
+def name_similarity(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """
+    1.0 for the same tokens, CONTAINED_NAME_QUALITY when every token of one
+    name is in the other ('Tottenham' / 'Tottenham Hotspur'), 0.0 otherwise:
+    a partial overlap ('Manchester City' / 'Manchester United') is another team
+    """
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    return CONTAINED_NAME_QUALITY if a <= b or b <= a else 0.0
+
+
+def kickoff_timestamp(value: Any) -> Optional[float]:
+    """Best-effort conversion of a kickoff value (ISO string or epoch) to epoch seconds"""
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, (int, float)) or (isinstance(value, str) and value.strip().isdigit()):
+            ts = float(value)
+            return ts / 1000 if ts > 10_000_000_000 else ts
+        dt = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    except (ValueError, TypeError):
+        return None
+
+
+class SharpEntry:
+    """Pinnacle 1X2 prices for one OddsAPI event, extracted once at index time"""
+
+    __slots__ = ("home_team", "away_team", "home_tokens", "away_tokens", "commence_ts", "prices")
+
+    def __init__(self, home_team: str, away_team: str, commence_ts: Optional[float], prices: Dict[str, Optional[float]]):
+        self.home_team = home_team
+        self.away_team = away_team
+        self.home_tokens = team_tokens(home_team)
+        self.away_tokens = team_tokens(away_team)
+        self.commence_ts = commence_ts
+        self.prices = prices
+
+
+def extract_pinnacle_h2h(event: Dict) -> Optional[Dict[str, Optional[float]]]:
+    """Pull Pinnacle's home/draw/away prices out of an OddsAPI event"""
+    home = event.get("home_team", "")
+    away = event.get("away_team", "")
+    for bookmaker in event.get("bookmakers", []):
+        if bookmaker.get("key") != "pinnacle":
+            continue
+        for market in bookmaker.get("markets", []):
+            if market.get("key") != "h2h":
+                continue
+            prices = {"home": None, "draw": None, "away": None}
+            for outcome in market.get("outcomes", []):
+                name = outcome.get("name", "")
+                if name == home:
+                    prices["home"] = outcome.get("price")
+                elif name == away:
+                    prices["away"] = outcome.get("price")
+                elif name.lower() == "draw":
+                    prices["draw"] = outcome.get("price")
+            return prices
+    return None
+
+
+class SharpOddsIndex:
+    """
+    Precomputed lookup over one league's OddsAPI events.
+
+    Built once per cache refresh. Lookups are an O(1) probe on the normalized
+    (home, away) pair, falling back to a token-index candidate probe scored by
+    name similarity and ranked by kickoff proximity.
+    """
+
+    def __init__(self, events: List[Dict]):
+        self.entries: List[SharpEntry] = []
+        self._by_pair: Dict[Tuple[str, str], List[int]] = {}
+        self._home_tokens: Dict[str, List[int]] = {}
+        self._away_tokens: Dict[str, List[int]] = {}
+        self._memo: Dict[Tuple[str, str, Optional[float]], Tuple[Dict, float]] = {}
+
+        for event in events or []:
+            prices = extract_pinnacle_h2h(event)
+            if prices is None:
+                continue
+            entry = SharpEntry(
+                normalize_team(event.get("home_team", "")),
+                normalize_team(event.get("away_team", "")),
+                kickoff_timestamp(event.get("commence_time")),
+                prices,
+            )
+            idx = len(self.entries)
+            self.entries.append(entry)
+            self._by_pair.setdefault((entry.home_team, entry.away_team), []).append(idx)
+            for token in entry.home_tokens:
+                self._home_tokens.setdefault(token, []).append(idx)
+            for token in entry.away_tokens:
+                self._away_tokens.setdefault(token, []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _kickoff_factor(self, entry: SharpEntry, kickoff_ts: Optional[float], confirm: bool) -> Optional[float]:
+        """
+        1.0 for the same kickoff, decaying with drift; UNKNOWN_KICKOFF_FACTOR when
+        either is unknown; None when too far apart, or when `confirm` (a fuzzy
+        name match) needs both kickoffs within CONFIRM_KICKOFF_SECONDS
+        """
+        if kickoff_ts is None or entry.commence_ts is None:
+            return None if confirm else UNKNOWN_KICKOFF_FACTOR
+        drift = abs(entry.commence_ts - kickoff_ts)
+        if drift > (CONFIRM_KICKOFF_SECONDS if confirm else MAX_KICKOFF_DRIFT_SECONDS):
+            return None
+        return 1.0 - 0.25 * (drift / MAX_KICKOFF_DRIFT_SECONDS)
+
+    def lookup(self, home_team: str, away_team: str, kickoff: Any = None) -> Tuple[Dict[str, Optional[float]], float]:
+        """
+        Find Pinnacle prices for a soft-book fixture.
+
+        Returns (prices, quality) where quality is 1.0 for an exact normalized
+        match at a confirmed kickoff and lower for shortened names, drifted or
+        unknown kickoffs; (all-None, 0.0) when nothing clears MIN_MATCH_QUALITY
+        or two fixtures fit a shortened name equally well.
+        """
+        kickoff_ts = kickoff_timestamp(kickoff)
+        home = normalize_team(home_team)
+        away = normalize_team(away_team)
+        memo_key = (home, away, kickoff_ts)
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            return cached
+
+        best: Optional[SharpEntry] = None
+        best_score = 0.0
+        best_drift = float("inf")
+        ambiguous = False
+
+        exact = self._by_pair.get((home, away))
+        if exact:
+            candidates = [(i, 1.0) for i in exact]
+        else:
+            home_tokens = team_tokens(home)
+            away_tokens = team_tokens(away)
+            home_hits = {i for t in home_tokens for i in self._home_tokens.get(t, ())}
+            away_hits = {i for t in away_tokens for i in self._away_tokens.get(t, ())}
+            candidates = []
+            for i in home_hits & away_hits:
+                entry = self.entries[i]
+                similarity = (
+                    name_similarity(home_tokens, entry.home_tokens)
+                    * name_similarity(away_tokens, entry.away_tokens)
+                )
+                if similarity > 0:
+                    candidates.append((i, similarity))
+
+        for i, similarity in candidates:
+            entry = self.entries[i]
+            factor = self._kickoff_factor(entry, kickoff_ts, confirm=similarity < 1.0)
+            if factor is None:
+                continue
+            score = similarity * factor
+            drift = abs(entry.commence_ts - kickoff_ts) if kickoff_ts and entry.commence_ts else 0.0
+            if score > best_score or (score == best_score and drift < best_drift):
+                best, best_score, best_drift = entry, score, drift
+                ambiguous = False
+            elif score == best_score and drift == best_drift and similarity < 1.0:
+                # "Manchester" fits City and United alike: no match rather than a guess
+                ambiguous = True
+
+        if best is None or ambiguous or best_score < MIN_MATCH_QUALITY:
+            result = ({"home": None, "draw": None, "away": None}, 0.0)
+        else:
+            result = (dict(best.prices), round(best_score, 3))
+        self._memo[memo_key] = result
+        return result
@@ -0,0 +1,42 @@
+"""
+Vantedge Naija Bridge - Single-flight
+Collapses concurrent calls for the same key into one in-flight coroutine
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent work per key.
+
+    The first caller for a key starts the coroutine; everyone else arriving
+    while it is running awaits the same result instead of starting their own.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._inflight
+
+    def start(self, key: str, func: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Return the running task for key, starting one if needed (non-blocking)"""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+
+        self.calls += 1
+        task = asyncio.create_task(func())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _t, key=key: self._inflight.pop(key, None))
+        return task
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Run func once for all concurrent callers of key and return its result"""
+        # shield so one caller being cancelled doesn't cancel the shared work
+        return await asyncio.shield(self.start(key, func))
@@ -0,0 +1,145 @@
+"""
+Vantedge Naija Bridge - Startup
+Deferred imports and the warm-up readiness state served at /ready
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING, RETRYING, READY, FAILED, SKIPPED = "pending", "retrying", "ready", "failed", "skipped"
+
+
+class LazyModule:
+    """
+    A module imported on first attribute access instead of at startup.
+    `load()` lets the warm-up import it off the request path (in a worker
+    thread) before the first request needs it.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+
+class Component:
+    __slots__ = ("name", "required", "status", "seconds", "error", "attempts")
+
+    def __init__(self, name: str, required: bool):
+        self.name = name
+        self.required = required
+        self.status = PENDING
+        self.seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.attempts = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "required": self.required,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+            "attempts": self.attempts,
+            "error": self.error,
+        }
+
+
+class Readiness:
+    """
+    Warm-up status per component, distinct from liveness (/health).
+
+    The service is ready once every component has finished and no required
+    one failed. Optional components (cache warming) that fail leave it ready
+    but degraded: those caches simply fill on first use. Steps run with
+    `retry` (the database) are retried with backoff until they succeed
+    instead of failing for the life of the process.
+    """
+
+    def __init__(self):
+        self.created_at = time.perf_counter()
+        self.ready_after: Optional[float] = None
+        self.components: Dict[str, Component] = {}
+
+    def add(self, name: str, required: bool = True) -> Component:
+        component = self.components[name] = Component(name, required)
+        return component
+
+    def skip(self, name: str, reason: str):
+        component = self.add(name, required=False)
+        component.status = SKIPPED
+        component.error = reason
+
+    async def run(
+        self,
+        name: str,
+        step: Callable[[], Awaitable[Any]],
+        required: bool = True,
+        retry: bool = False,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ) -> bool:
+        """Run one warm-up step, recording how long it took and why it failed"""
+        component = self.components.get(name) or self.add(name, required)
+        started = time.perf_counter()
+        while True:
+            component.attempts += 1
+            try:
+                await step()
+            except Exception as e:
+                component.error = f"{type(e).__name__}: {e}"
+                log = logger.error if required else logger.warning
+                if retry:
+                    component.status = RETRYING
+                    log(f"{'❌' if required else '⚠️'} Warm-up step {name} failed (attempt {component.attempts}, retrying in {backoff:g}s): {component.error}")
+                    await asyncio.sleep(backoff)
+                    backoff = min(max_backoff, backoff * 2)
+                    continue
+                component.status = FAILED
+                log(f"{'❌' if required else '⚠️'} Warm-up step {name} failed: {component.error}")
+            else:
+                component.status = READY
+                component.error = None
+            break
+        component.seconds = time.perf_counter() - started
+        self._check()
+        return component.status == READY
+
+    def _check(self):
+        if self.ready_after is None and self.ready:
+            self.ready_after = time.perf_counter() - self.created_at
+            logger.info(f"✅ Ready {self.ready_after:.2f}s after start-up began")
+
+    @property
+    def ready(self) -> bool:
+        return all(
+            c.status not in (PENDING, RETRYING) and not (c.required and c.status == FAILED)
+            for c in self.components.values()
+        )
+
+    @property
+    def degraded(self) -> bool:
+        return any(c.status in (FAILED, RETRYING) for c in self.components.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "degraded": self.degraded,
+            "ready_after_s": round(self.ready_after, 3) if self.ready_after is not None else None,
+            "uptime_s": round(time.perf_counter() - self.created_at, 3),
+            "components": {name: c.as_dict() for name, c in self.components.items()},
+        }
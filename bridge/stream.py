@@ -0,0 +1,171 @@
+"""
+Vantedge Naija Bridge - Odds Push Stream
+Broadcasts price deltas and value edges to server-sent-event subscribers as scrapes land
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+_ALL = "*"
+
+
+class Subscriber:
+    """One connected client: its filters and a bounded buffer of encoded messages"""
+
+    __slots__ = ("id", "leagues", "bookmakers", "types", "min_edge", "queue", "dropped", "connected_at", "delivered")
+
+    def __init__(
+        self,
+        sub_id: int,
+        leagues: Optional[Set[str]],
+        bookmakers: Optional[Set[str]],
+        types: Optional[Set[str]],
+        min_edge: Optional[float],
+        max_queue: int,
+    ):
+        self.id = sub_id
+        self.leagues = leagues
+        self.bookmakers = bookmakers
+        self.types = types
+        self.min_edge = min_edge
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = False
+        self.connected_at = time.time()
+        self.delivered = 0
+
+    def wants(self, event_type: str, bookmaker: str, edge: Optional[float]) -> bool:
+        if self.types is not None and event_type not in self.types:
+            return False
+        if self.bookmakers is not None and bookmaker not in self.bookmakers:
+            return False
+        if self.min_edge is not None and (edge is None or edge < self.min_edge):
+            return False
+        return True
+
+
+class OddsBroadcaster:
+    """
+    In-process pub/sub for odds changes.
+
+    Each message is serialized once and the same bytes are queued for every
+    matching subscriber, so one scrape fans out without re-scraping or
+    re-encoding. Subscribers are indexed by league. A subscriber whose buffer
+    fills up (a slow consumer) is dropped instead of slowing the publisher.
+    """
+
+    def __init__(self, max_queue: int = 256, max_subscribers: int = 5000, heartbeat: float = 15.0):
+        self.max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self.heartbeat = heartbeat
+        self._subscribers: Dict[int, Subscriber] = {}
+        # league (or "*") -> subscriber ids
+        self._by_league: Dict[str, Set[int]] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count(1)
+
+        self.published = 0
+        self.deliveries = 0
+        self.dropped_subscribers = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(
+        self,
+        leagues: Optional[Iterable[str]] = None,
+        bookmakers: Optional[Iterable[str]] = None,
+        types: Optional[Iterable[str]] = None,
+        min_edge: Optional[float] = None,
+    ) -> Optional[Subscriber]:
+        """Register a subscriber; None when the subscriber limit is reached"""
+        if len(self._subscribers) >= self.max_subscribers:
+            return None
+        league_set = {l.lower() for l in leagues} if leagues else None
+        sub = Subscriber(
+            next(self._ids),
+            league_set,
+            {b.lower() for b in bookmakers} if bookmakers else None,
+            set(types) if types else None,
+            min_edge,
+            self.max_queue,
+        )
+        self._subscribers[sub.id] = sub
+        for league in league_set or (_ALL,):
+            self._by_league.setdefault(league, set()).add(sub.id)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        if self._subscribers.pop(sub.id, None) is None:
+            return
+        for league in sub.leagues or (_ALL,):
+            ids = self._by_league.get(league)
+            if ids is not None:
+                ids.discard(sub.id)
+                if not ids:
+                    del self._by_league[league]
+
+    def _drop(self, sub: Subscriber):
+        sub.dropped = True
+        self.dropped_subscribers += 1
+        self.unsubscribe(sub)
+        logger.warning(f"⚠️ Dropped slow stream subscriber #{sub.id} (buffer of {self.max_queue} full)")
+
+    def publish(self, event_type: str, league: str, bookmaker: str, payload: Dict[str, Any], edge: Optional[float] = None) -> int:
+        """Queue a message for every matching subscriber; returns how many received it"""
+        candidates = self._by_league.get(league.lower(), set()) | self._by_league.get(_ALL, set())
+        if not candidates:
+            return 0
+        bookmaker = bookmaker.lower()
+        message: Optional[bytes] = None
+        delivered = 0
+        for sub_id in candidates:
+            sub = self._subscribers.get(sub_id)
+            if sub is None or not sub.wants(event_type, bookmaker, edge):
+                continue
+            if message is None:
+                seq = next(self._seq)
+                body = json.dumps({"type": event_type, **payload}, default=str)
+                message = f"id: {seq}\nevent: {event_type}\ndata: {body}\n\n".encode()
+            try:
+                sub.queue.put_nowait(message)
+                sub.delivered += 1
+                delivered += 1
+            except asyncio.QueueFull:
+                self._drop(sub)
+        if message is not None:
+            self.published += 1
+            self.deliveries += delivered
+        return delivered
+
+    async def events(self, sub: Subscriber, is_disconnected=None) -> AsyncIterator[bytes]:
+        """SSE byte stream for one subscriber, with comment heartbeats while idle"""
+        try:
+            yield b"retry: 5000\n\n"
+            while not sub.dropped:
+                try:
+                    yield await asyncio.wait_for(sub.queue.get(), timeout=self.heartbeat)
+                except asyncio.TimeoutError:
+                    if is_disconnected is not None and await is_disconnected():
+                        break
+                    yield b": keep-alive\n\n"
+            if sub.dropped:
+                yield b"event: dropped\ndata: {\"reason\": \"slow consumer\"}\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "max_queue": self.max_queue,
+            "published": self.published,
+            "deliveries": self.deliveries,
+            "dropped_subscribers": self.dropped_subscribers,
+            "buffered": sum(s.queue.qsize() for s in self._subscribers.values()),
+        }
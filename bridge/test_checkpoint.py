@@ -0,0 +1,91 @@
+"""
+Unit tests for the append-only checkpoint log
+Run: python -m pytest test_checkpoint.py
+"""
+
+import asyncio
+import os
+
+from checkpoint import MAGIC, CheckpointLog, Checkpointer
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "odds.ckpt")
+    log = CheckpointLog(path)
+    assert log.load() == {}
+    log.write({"odds:bet9ja:epl": {"count": 2}, "odds:sportybet:epl": {"count": 3}})
+    log.write({"odds:bet9ja:epl": {"count": 4}}, removed=["odds:sportybet:epl"])
+    assert CheckpointLog(path).load() == {"odds:bet9ja:epl": {"count": 4}}
+
+
+def test_truncated_tail_is_dropped(tmp_path):
+    path = str(tmp_path / "odds.ckpt")
+    log = CheckpointLog(path)
+    log.load()
+    log.write({"a": 1})
+    intact = os.path.getsize(path)
+    log.write({"b": list(range(100))})
+    torn = os.path.getsize(path) - 5
+    with open(path, "r+b") as f:
+        f.truncate(torn)
+
+    reloaded = CheckpointLog(path)
+    assert reloaded.load() == {"a": 1}
+    assert reloaded.torn_bytes == torn - intact
+    assert os.path.getsize(path) == intact
+    # Appends after the cut stay readable
+    reloaded.write({"c": 3})
+    assert CheckpointLog(path).load() == {"a": 1, "c": 3}
+
+
+def test_corrupt_frame_is_dropped(tmp_path):
+    path = str(tmp_path / "odds.ckpt")
+    log = CheckpointLog(path)
+    log.load()
+    log.write({"a": 1})
+    log.write({"b": 2})
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    assert CheckpointLog(path).load() == {"a": 1}
+
+
+def test_foreign_file_is_replaced(tmp_path):
+    path = str(tmp_path / "odds.ckpt")
+    with open(path, "wb") as f:
+        f.write(b"not a checkpoint")
+    log = CheckpointLog(path)
+    assert log.load() == {}
+    with open(path, "rb") as f:
+        assert f.read() == MAGIC
+
+
+def test_compaction_keeps_live_values(tmp_path):
+    path = str(tmp_path / "odds.ckpt")
+    log = CheckpointLog(path, compact_ratio=2.0, min_compact_bytes=0)
+    log.load()
+    for version in range(10):
+        log.write({"a": version, "b": -version})
+    assert log.compactions > 0
+    assert os.path.getsize(path) <= 2 * log.live_bytes
+    assert CheckpointLog(path).load() == {"a": 9, "b": -9}
+
+
+def test_checkpointer_writes_only_changed_versions(tmp_path):
+    path = str(tmp_path / "odds.ckpt")
+    records = {}
+    checkpointer = Checkpointer(CheckpointLog(path), lambda: dict(records))
+
+    async def run():
+        await checkpointer.restore(lambda values: None)
+        records.update({"a": (1.0, {"v": 1}), "b": (1.0, {"v": 2})})
+        assert await checkpointer.checkpoint() == 2
+        assert await checkpointer.checkpoint() == 0
+        records["a"] = (2.0, {"v": 3})
+        del records["b"]
+        assert await checkpointer.checkpoint() == 1
+
+    asyncio.run(run())
+    assert CheckpointLog(path).load() == {"a": {"v": 3}}
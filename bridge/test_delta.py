@@ -0,0 +1,66 @@
+"""
+Unit tests for price delta detection
+Run: python -m pytest test_delta.py
+"""
+
+import time
+
+from delta import DeltaTracker
+
+PRICES = {"1x2:home": 2.1, "1x2:draw": 3.3, "1x2:away": 3.6, "sharp_home": 2.0}
+
+
+def test_new_match_emits_every_price():
+    tracker = DeltaTracker()
+    delta = tracker.diff("bet9ja", "A_B", PRICES)
+    assert delta.is_new and delta.full
+    assert delta.changes == {sel: (None, price) for sel, price in PRICES.items()}
+
+
+def test_unchanged_prices_are_suppressed():
+    tracker = DeltaTracker()
+    tracker.diff("bet9ja", "A_B", PRICES)
+    assert tracker.diff("bet9ja", "A_B", dict(PRICES)) is None
+    assert tracker.stats()["suppressed"] == 1
+
+
+def test_only_moved_prices_are_reported():
+    tracker = DeltaTracker()
+    tracker.diff("bet9ja", "A_B", PRICES)
+    delta = tracker.diff("bet9ja", "A_B", {**PRICES, "1x2:draw": 3.4})
+    assert delta.changes == {"1x2:draw": (3.3, 3.4)}
+    assert not delta.is_new and not delta.full
+
+
+def test_bookmakers_are_tracked_separately():
+    tracker = DeltaTracker()
+    tracker.diff("bet9ja", "A_B", PRICES)
+    assert tracker.diff("sportybet", "A_B", PRICES).is_new
+
+
+def test_quiet_match_is_re_emitted_as_a_heartbeat():
+    tracker = DeltaTracker(refresh_after=0.05)
+    tracker.diff("bet9ja", "A_B", PRICES)
+    assert tracker.diff("bet9ja", "A_B", PRICES) is None
+    time.sleep(0.1)
+    heartbeat = tracker.diff("bet9ja", "A_B", PRICES)
+    assert heartbeat is not None and heartbeat.changes == {} and not heartbeat.full
+    assert tracker.diff("bet9ja", "A_B", PRICES) is None
+    assert tracker.stats()["refreshed"] == 1
+
+
+def test_unwritten_prices_are_re_emitted_in_full():
+    tracker = DeltaTracker()
+    tracker.diff("bet9ja", "A_B", PRICES)
+    tracker.mark_unwritten("bet9ja", "A_B")
+    delta = tracker.diff("bet9ja", "A_B", PRICES)
+    assert delta is not None and delta.full and not delta.is_new
+    assert delta.changes == {}
+    assert tracker.diff("bet9ja", "A_B", PRICES) is None
+
+
+def test_forget_re_emits_as_new():
+    tracker = DeltaTracker()
+    tracker.diff("bet9ja", "A_B", PRICES)
+    tracker.forget("bet9ja", "A_B")
+    assert tracker.diff("bet9ja", "A_B", PRICES).is_new
@@ -0,0 +1,65 @@
+"""
+Unit tests for the vectorized de-vig, edge and surebet engine
+Run: python -m pytest test_edge_engine.py
+"""
+
+import numpy as np
+import pytest
+
+from edge_engine import devig, evaluate, overround
+
+# Pinnacle-like 1X2 lines: a favourite, a close match and a heavy longshot
+SHARP = np.array([
+    [1.40, 5.00, 7.50],
+    [2.60, 3.30, 2.80],
+    [1.08, 12.0, 26.0],
+])
+
+
+@pytest.mark.parametrize("method", ["multiplicative", "power"])
+def test_devig_sums_to_one(method):
+    fair = devig(SHARP, method)
+    assert np.allclose(fair.sum(axis=-1), 1.0, atol=1e-9)
+    assert (fair > 0).all()
+
+
+def test_power_shrinks_longshots_more():
+    multiplicative, power = devig(SHARP, "multiplicative"), devig(SHARP, "power")
+    assert power[2, 2] < multiplicative[2, 2]
+    assert power[2, 0] > multiplicative[2, 0]
+
+
+def test_missing_sharp_price_leaves_row_unpriced():
+    fair = devig(np.array([[2.0, np.nan, 3.0]]), "power")
+    assert np.isnan(fair).all()
+
+
+def test_unknown_method_rejected():
+    with pytest.raises(ValueError):
+        devig(SHARP, "shin")
+
+
+def test_value_bets_best_first():
+    sharp = np.array([[2.0, 3.5, 4.0]])
+    soft = np.array([[[2.3, 3.4, 4.0], [2.0, 3.9, np.nan]]])
+    batch = evaluate(soft, sharp, ["bet9ja", "sportybet"], method="multiplicative")
+    bets = batch.value_bets()
+    assert [(b["bookmaker"], b["selection"]) for b in bets] == [("bet9ja", "home"), ("sportybet", "draw")]
+    assert bets[0]["edge"] > bets[1]["edge"] > 0
+    fair_home = bets[0]["fair_probability"]
+    assert bets[0]["edge"] == pytest.approx(2.3 * fair_home - 1)
+
+
+def test_surebet_stakes_equalize_payout():
+    soft = np.array([[[2.2, 3.1, 4.5], [1.9, 3.9, 4.0]]])
+    batch = evaluate(soft, None, ["bet9ja", "sportybet"])
+    (arb,) = batch.surebets()
+    assert arb["margin"] == pytest.approx(1 - (1 / 2.2 + 1 / 3.9 + 1 / 4.5))
+    assert [leg["bookmaker"] for leg in arb["legs"]] == ["bet9ja", "sportybet", "bet9ja"]
+    payouts = [leg["stake"] * leg["price"] for leg in arb["legs"]]
+    assert sum(leg["stake"] for leg in arb["legs"]) == pytest.approx(1.0)
+    assert max(payouts) == pytest.approx(min(payouts))
+
+
+def test_overround_of_fair_line_is_zero():
+    assert overround(1 / devig(SHARP, "power")) == pytest.approx(np.zeros(3), abs=1e-9)
@@ -0,0 +1,70 @@
+"""
+Unit tests for the in-memory opportunity index
+Run: python -m pytest test_opportunities.py
+"""
+
+import time
+
+from opportunities import OpportunityIndex
+
+LATER = time.time() + 3600
+
+
+def edges(index):
+    return [(o["event_id"], o["soft_bookmaker"], o["selection"], o["edge_percent"]) for o in index.top(50)]
+
+
+def test_top_k_orders_by_edge_across_buckets():
+    index = OpportunityIndex()
+    index.set_prices("A", "epl", "bet9ja", "1x2", LATER, {"home": (3.0, {}), "away": (7.5, {})})
+    index.set_prices("B", "laliga", "sportybet", "1x2", LATER, {"draw": (5.0, {})})
+    index.set_prices("C", "epl", "sportybet", "1x2", LATER, {"home": (1.0, {})})
+    assert [o["edge_percent"] for o in index.top(3)] == [7.5, 5.0, 3.0]
+    assert [o["edge_percent"] for o in index.top(10, min_edge=2.0)] == [7.5, 5.0, 3.0]
+    assert [o["event_id"] for o in index.top(10, leagues=["epl"], bookmakers=["SportyBet"])] == ["C"]
+
+
+def test_set_prices_replaces_the_quote():
+    index = OpportunityIndex()
+    index.set_prices("A", "epl", "bet9ja", "1x2", LATER, {"home": (3.0, {}), "away": (7.5, {})})
+    detected = index.top(1)[0]["detected_at"]
+    index.set_prices("A", "epl", "bet9ja", "1x2", LATER, {"away": (1.5, {"odds": 4.1})})
+    assert edges(index) == [("A", "bet9ja", "away", 1.5)]
+    assert index.top(1)[0]["odds"] == 4.1
+    assert index.top(1)[0]["detected_at"] == detected
+
+
+def test_entries_leave_at_kickoff():
+    index = OpportunityIndex()
+    index.set_prices("A", "epl", "bet9ja", "1x2", time.time() + 0.05, {"home": (4.0, {})})
+    index.set_prices("B", "epl", "bet9ja", "1x2", LATER, {"home": (2.0, {})})
+    time.sleep(0.1)
+    assert edges(index) == [("B", "bet9ja", "home", 2.0)]
+    assert index.evicted == 1
+
+
+def test_unknown_kickoff_expires_after_max_age():
+    index = OpportunityIndex(max_age=0.05)
+    index.set_prices("A", "epl", "bet9ja", "1x2", None, {"home": (4.0, {})})
+    assert len(index) == 1
+    time.sleep(0.1)
+    assert index.top(5) == []
+    assert len(index) == 0
+
+
+def test_started_match_is_dropped():
+    index = OpportunityIndex()
+    index.set_prices("A", "epl", "bet9ja", "1x2", LATER, {"home": (4.0, {})})
+    index.set_prices("A", "epl", "bet9ja", "1x2", time.time() - 60, {"home": (4.0, {})})
+    assert index.top(5) == []
+
+
+def test_dump_and_load_keep_order_and_expiry():
+    index = OpportunityIndex()
+    index.set_prices("A", "epl", "bet9ja", "1x2", LATER, {"home": (3.0, {"odds": 2.2})})
+    index.set_prices("B", "epl", "sportybet", "1x2", time.time() + 0.05, {"draw": (6.0, {})})
+    copy = OpportunityIndex()
+    copy.load(index.dump())
+    assert edges(copy) == edges(index)
+    time.sleep(0.1)
+    assert edges(copy) == [("A", "bet9ja", "home", 3.0)]
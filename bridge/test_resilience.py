@@ -0,0 +1,42 @@
+"""
+Unit tests for the circuit breaker
+Run: python -m pytest test_resilience.py
+"""
+
+import time
+
+from resilience import CircuitBreaker
+
+
+def open_breaker():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure("down")
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+    return breaker
+
+
+def test_half_open_allows_one_trial():
+    breaker = open_breaker()
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+
+def test_released_trial_frees_the_slot():
+    breaker = open_breaker()
+    assert breaker.allow()
+    # Rate limited before reaching the upstream: no verdict either way
+    breaker.release()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_trial_reopens_with_longer_timeout():
+    breaker = open_breaker()
+    assert breaker.allow()
+    breaker.record_failure("still down")
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.recovery_timeout == 0.1
@@ -0,0 +1,34 @@
+"""
+Unit tests for the adaptive poll scheduler
+Run: python -m pytest test_scheduler.py
+"""
+
+import asyncio
+
+import pytest
+
+from scheduler import OddsSnapshotStore, PollScheduler
+
+GOOD = {"matches": [{"home": "A", "away": "B", "kickoff": "2030-01-05T15:00:00Z", "odds": {"home": 2.1}}]}
+
+
+@pytest.mark.parametrize("bad", [{**GOOD, "degraded": True}, {"error": "Failed to parse", "matches": []}])
+def test_degraded_poll_keeps_the_last_good_snapshot(bad):
+    payloads = [GOOD, bad]
+
+    async def poll(bookmaker, league):
+        return payloads.pop(0)
+
+    async def run():
+        store = OddsSnapshotStore()
+        scheduler = PollScheduler(store, poll, [("bet9ja", "epl")], base_interval=60.0)
+        scheduler._semaphore = asyncio.Semaphore(1)
+        job = scheduler.jobs[("bet9ja", "epl")]
+        assert await scheduler.run_once(job) is not None
+        assert await scheduler.run_once(job) is None
+        return store.get("bet9ja", "epl"), job
+
+    snapshot, job = asyncio.run(run())
+    assert snapshot.payload == GOOD
+    assert job.failures == 1 and job.consecutive_failures == 1
+    assert job.interval == 120.0 and job.last_error
@@ -0,0 +1,53 @@
+"""
+Unit tests for the per-league sharp odds cache
+Run: python -m pytest test_sharp_cache.py
+"""
+
+import asyncio
+
+from sharp_cache import SharpOddsCache
+
+
+def test_failed_load_backs_off_before_retrying():
+    calls = []
+
+    async def loader(league):
+        calls.append(league)
+        return None
+
+    async def run():
+        cache = SharpOddsCache(negative_ttl=60.0)
+        assert await cache.get("epl", loader) is None
+        assert await cache.get("epl", loader) is None
+        assert await cache.get("epl", loader) is None
+        return cache
+
+    cache = asyncio.run(run())
+    assert calls == ["epl"]
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["negative_hits"] == 2
+    assert stats["backing_off"] == ["epl"]
+
+
+def test_backoff_grows_and_clears_on_success():
+    events = []
+
+    async def loader(league):
+        return events.pop() if events else None
+
+    async def run():
+        cache = SharpOddsCache(base_ttl=900.0, negative_ttl=0.05)
+        assert await cache.get("epl", loader) is None
+        await asyncio.sleep(0.06)
+        assert await cache.get("epl", loader) is None
+        # Second failure doubles the wait
+        await asyncio.sleep(0.06)
+        assert await cache.get("epl", loader) is None
+        await asyncio.sleep(0.05)
+        events.append([])
+        assert await cache.get("epl", loader) is not None
+        return cache
+
+    cache = asyncio.run(run())
+    assert cache.refresh_failures == 2 and cache.negative_hits == 1
+    assert cache.stats()["backing_off"] == []
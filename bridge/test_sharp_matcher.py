@@ -0,0 +1,74 @@
+"""
+Unit tests for the sharp odds matcher and canonical event resolution
+Run: python -m pytest test_sharp_matcher.py
+"""
+
+from sharp_matcher import SharpOddsIndex, name_similarity, normalize_team, team_tokens
+from events import EventResolver
+
+KICKOFF = "2030-01-05T15:00:00Z"
+
+
+def oddsapi_event(home, away, prices, commence_time=KICKOFF):
+    return {
+        "home_team": home,
+        "away_team": away,
+        "commence_time": commence_time,
+        "bookmakers": [{
+            "key": "pinnacle",
+            "markets": [{"key": "h2h", "outcomes": [
+                {"name": home, "price": prices[0]},
+                {"name": "Draw", "price": prices[1]},
+                {"name": away, "price": prices[2]},
+            ]}],
+        }],
+    }
+
+
+CITY_VILLA = oddsapi_event("Manchester City", "Aston Villa", (1.4, 5.0, 7.0))
+
+
+def test_partial_overlap_is_another_team():
+    city, united = team_tokens(normalize_team("Manchester City")), team_tokens(normalize_team("Manchester United"))
+    assert name_similarity(city, united) == 0.0
+
+
+def test_city_prices_never_priced_for_united():
+    index = SharpOddsIndex([CITY_VILLA])
+    assert index.lookup("Manchester United", "Aston Villa", KICKOFF) == ({"home": None, "draw": None, "away": None}, 0.0)
+    assert index.lookup("Man Utd", "Aston Villa FC", KICKOFF)[1] == 0.0
+    assert index.lookup("Man Utd", "Aston Villa FC")[1] == 0.0
+
+
+def test_exact_match_at_confirmed_kickoff():
+    prices, quality = SharpOddsIndex([CITY_VILLA]).lookup("Man City", "Aston Villa FC", KICKOFF)
+    assert prices == {"home": 1.4, "draw": 5.0, "away": 7.0}
+    assert quality == 1.0
+
+
+def test_unknown_kickoff_is_penalised():
+    _, quality = SharpOddsIndex([CITY_VILLA]).lookup("Manchester City", "Aston Villa")
+    assert 0 < quality < 1.0
+
+
+def test_shortened_name_needs_a_confirming_kickoff():
+    index = SharpOddsIndex([oddsapi_event("Crystal Palace", "Fulham", (2.1, 3.4, 3.5))])
+    assert index.lookup("Palace", "Fulham", KICKOFF)[1] >= 0.8
+    assert index.lookup("Palace", "Fulham")[1] == 0.0
+    assert index.lookup("Palace", "Fulham", "2030-01-06T15:00:00Z")[1] == 0.0
+
+
+def test_ambiguous_shortened_name_is_no_match():
+    index = SharpOddsIndex([
+        CITY_VILLA,
+        oddsapi_event("Manchester United", "Aston Villa", (2.0, 3.5, 3.8)),
+    ])
+    assert index.lookup("Manchester", "Aston Villa", KICKOFF)[1] == 0.0
+
+
+def test_resolver_keeps_city_and_united_apart():
+    resolver = EventResolver()
+    city = resolver.resolve("bet9ja", "1", "Manchester City", "Aston Villa", KICKOFF)
+    united = resolver.resolve("sportybet", "2", "Manchester United", "Aston Villa", KICKOFF)
+    assert city != united
+    assert resolver.resolve("sportybet", "3", "Man City", "Aston Villa FC", KICKOFF) == city
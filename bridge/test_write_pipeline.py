@@ -0,0 +1,168 @@
+"""
+Unit tests for the background batch writer
+Run: python -m pytest test_write_pipeline.py
+"""
+
+import asyncio
+
+from write_pipeline import BatchWriter
+
+
+def rows(n):
+    return [{"p_match_id": f"m{i}"} for i in range(n)]
+
+
+def test_flushes_full_batches():
+    batches = []
+
+    async def flush(batch):
+        batches.append(batch)
+
+    async def run():
+        writer = BatchWriter("test", flush, batch_size=3, flush_interval=10.0)
+        await writer.start()
+        assert await writer.put_many(rows(6)) == 6
+        for _ in range(100):
+            if len(batches) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await writer.stop()
+
+    asyncio.run(run())
+    assert [len(b) for b in batches] == [3, 3]
+
+
+def test_flushes_partial_batch_after_interval():
+    batches = []
+
+    async def run():
+        writer = BatchWriter("test", batches.append, batch_size=50, flush_interval=0.05)
+        await writer.start()
+        await writer.put_many(rows(2))
+        await asyncio.sleep(0.2)
+        assert [len(b) for b in batches] == [2]
+        await writer.stop()
+
+    asyncio.run(run())
+
+
+def test_stop_drains_everything_queued():
+    flushed = []
+
+    async def slow_flush(batch):
+        await asyncio.sleep(0.01)
+        flushed.extend(batch)
+
+    async def run():
+        writer = BatchWriter("test", slow_flush, batch_size=4, flush_interval=10.0, max_queue=100)
+        await writer.start()
+        await writer.put_many(rows(10))
+        await writer.stop()
+        assert not writer.running
+        return writer.stats()
+
+    stats = asyncio.run(run())
+    assert sorted(r["p_match_id"] for r in flushed) == sorted(r["p_match_id"] for r in rows(10))
+    assert stats["rows_flushed"] == 10 and stats["queue_depth"] == 0
+
+
+def test_put_before_start_is_refused():
+    async def run():
+        writer = BatchWriter("test", lambda batch: None)
+        return await writer.put({"p_match_id": "m0"})
+
+    assert asyncio.run(run()) is False
+
+
+def test_full_queue_drops_after_timeout():
+    async def never(batch):
+        await asyncio.sleep(10)
+
+    async def run():
+        writer = BatchWriter("test", never, batch_size=1, max_queue=2, put_timeout=0.05)
+        await writer.start()
+        accepted = await writer.put_many(rows(5))
+        return accepted, writer.rows_dropped
+
+    accepted, dropped = asyncio.run(run())
+    assert accepted < 5 and accepted + dropped == 5
+
+
+def test_failed_flush_reaches_on_failure():
+    failed = []
+
+    def broken(batch):
+        raise RuntimeError("database down")
+
+    async def run():
+        writer = BatchWriter("test", broken, batch_size=2, flush_interval=10.0, on_failure=failed.extend)
+        await writer.start()
+        await writer.put_many(rows(2))
+        await writer.stop()
+        return writer.stats()
+
+    stats = asyncio.run(run())
+    assert len(failed) == 2
+    assert stats["rows_failed"] == 2 and stats["last_error"] == "database down"
+
+
+def test_stop_during_flush_keeps_the_in_flight_batch():
+    flushed = []
+    started = asyncio.Event()
+
+    async def slow_flush(batch):
+        started.set()
+        await asyncio.sleep(0.1)
+        flushed.extend(batch)
+
+    async def run():
+        writer = BatchWriter("test", slow_flush, batch_size=4, flush_interval=10.0)
+        await writer.start()
+        await writer.put_many(rows(10))
+        await started.wait()
+        await writer.stop()
+        return writer.stats()
+
+    stats = asyncio.run(run())
+    assert sorted(r["p_match_id"] for r in flushed) == sorted(r["p_match_id"] for r in rows(10))
+    assert stats["rows_flushed"] == 10 and stats["rows_failed"] == 0
+
+
+def test_failed_batch_is_retried_row_by_row():
+    flushed, failed = [], []
+
+    def picky(batch):
+        if any(row["p_match_id"] == "m2" for row in batch):
+            raise ValueError("invalid input syntax for type timestamp")
+        flushed.extend(batch)
+
+    async def run():
+        writer = BatchWriter("test", picky, batch_size=5, flush_interval=10.0, on_failure=failed.extend, split_failed=True)
+        await writer.start()
+        await writer.put_many(rows(5))
+        await writer.stop()
+        return writer.stats()
+
+    stats = asyncio.run(run())
+    assert [r["p_match_id"] for r in failed] == ["m2"]
+    assert len(flushed) == 4
+    assert stats["rows_flushed"] == 4 and stats["rows_failed"] == 1 and stats["batches_split"] == 1
+
+
+def test_row_retry_gives_up_when_everything_fails():
+    calls = []
+
+    def down(batch):
+        calls.append(len(batch))
+        raise RuntimeError("database down")
+
+    async def run():
+        writer = BatchWriter("test", down, batch_size=10, flush_interval=10.0, split_failed=True)
+        await writer.start()
+        await writer.put_many(rows(10))
+        await writer.stop()
+        return writer.stats()
+
+    stats = asyncio.run(run())
+    assert calls == [10] + [1] * BatchWriter.SPLIT_GIVE_UP
+    assert stats["rows_failed"] == 10
@@ -0,0 +1,257 @@
+"""
+Vantedge Naija Bridge - Background Write Pipeline
+Collects rows on an asyncio queue and flushes them to the database in batches
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+FlushFunc = Callable[[List[Dict[str, Any]]], Union[Any, Awaitable[Any]]]
+
+# Queued by stop(): the flush task finishes its current batch and exits
+_STOP = object()
+
+
+class BatchWriter:
+    """
+    Bounded queue drained by a single background task.
+
+    Rows are flushed when `batch_size` rows are waiting or `flush_interval`
+    seconds have passed since the first row of the batch arrived, whichever
+    comes first. Synchronous flush functions (the supabase client) run in a
+    worker thread so the event loop never blocks on a database round trip.
+
+    With `split_failed`, a failed batch is retried once row by row so a single
+    malformed row only costs itself; the retry gives up after
+    `SPLIT_GIVE_UP` consecutive row failures, which means the database itself
+    is failing rather than the data.
+    """
+
+    SPLIT_GIVE_UP = 3
+
+    def __init__(
+        self,
+        name: str,
+        flush_func: FlushFunc,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        max_queue: int = 5000,
+        put_timeout: float = 2.0,
+        on_failure: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        split_failed: bool = False,
+    ):
+        self.name = name
+        self.split_failed = split_failed
+        self.flush_func = flush_func
+        self.on_failure = on_failure
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.put_timeout = put_timeout
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Rows taken off the queue but not yet flushed
+        self._current: List[Dict[str, Any]] = []
+
+        # Stats
+        self.rows_enqueued = 0
+        self.rows_flushed = 0
+        self.rows_dropped = 0
+        self.rows_failed = 0
+        self.batches_flushed = 0
+        self.flush_attempts = 0
+        self.batches_split = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+        self.last_flush_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def start(self):
+        """Start the background flush task"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run(), name=f"batch-writer-{self.name}")
+        logger.info(f"✅ {self.name} writer started (batch={self.batch_size}, window={self.flush_interval}s)")
+
+    async def stop(self, timeout: float = 30.0):
+        """
+        Let the flush task finish the batch it holds, flush whatever is still
+        queued and stop. A flush still hanging after `timeout` seconds is
+        cancelled and its rows are counted as failed.
+        """
+        if not self._task:
+            return
+        if not self._task.done():
+            await self._queue.put(_STOP)
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        except Exception as e:
+            logger.error(f"❌ {self.name} writer task failed: {e}")
+        self._task = None
+        if self._current:
+            lost, self._current = self._current, []
+            self._record_failure(lost, f"writer stopped during a flush after {timeout:g}s")
+
+        # Drain leftovers so a clean shutdown loses nothing
+        leftovers = []
+        while self._queue and not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is not _STOP:
+                leftovers.append(row)
+        for i in range(0, len(leftovers), self.batch_size):
+            await self._flush(leftovers[i:i + self.batch_size])
+        logger.info(f"🛑 {self.name} writer stopped")
+
+    async def put_many(self, rows: List[Dict[str, Any]]) -> int:
+        """Enqueue several rows, returning how many were accepted"""
+        accepted = 0
+        for row in rows:
+            if await self.put(row):
+                accepted += 1
+        return accepted
+
+    async def put(self, row: Dict[str, Any]) -> bool:
+        """
+        Enqueue a row. Returns immediately while there is room; when the queue
+        is full the caller waits up to `put_timeout` (backpressure) before the
+        row is dropped.
+        """
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(self._queue.put(row), timeout=self.put_timeout)
+            except asyncio.TimeoutError:
+                self.rows_dropped += 1
+                logger.warning(f"⚠️ {self.name} queue full ({self.max_queue}), dropping row")
+                return False
+        self.rows_enqueued += 1
+        return True
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            row = await self._queue.get()
+            if row is _STOP:
+                return
+            # Kept on self until flushed, so stop() can account for it
+            self._current = batch = [row]
+            deadline = loop.time() + self.flush_interval
+            stopping = False
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._flush(batch)
+            self._current = []
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+        start = time.perf_counter()
+        try:
+            await self._call(batch)
+            self.rows_flushed += len(batch)
+            self.batches_flushed += 1
+        except Exception as e:
+            if self.split_failed and len(batch) > 1:
+                await self._flush_rows(batch, str(e))
+            else:
+                self._record_failure(batch, str(e))
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.flush_attempts += 1
+            self.last_flush_ms = elapsed
+            self.max_flush_ms = max(self.max_flush_ms, elapsed)
+            self.total_flush_ms += elapsed
+            self.last_flush_at = time.time()
+
+    async def _call(self, batch: List[Dict[str, Any]]):
+        if asyncio.iscoroutinefunction(self.flush_func):
+            await self.flush_func(batch)
+        else:
+            await asyncio.to_thread(self.flush_func, batch)
+
+    async def _flush_rows(self, batch: List[Dict[str, Any]], error: str):
+        """Retry a failed batch one row at a time, failing only the rows that still fail"""
+        self.batches_split += 1
+        logger.warning(f"⚠️ {self.name} flush of {len(batch)} rows failed ({error}), retrying row by row")
+        failed: List[Dict[str, Any]] = []
+        streak = 0
+        for i, row in enumerate(batch):
+            if streak >= self.SPLIT_GIVE_UP:
+                failed.extend(batch[i:])
+                break
+            try:
+                await self._call([row])
+                self.rows_flushed += 1
+                streak = 0
+            except Exception as e:
+                failed.append(row)
+                error = str(e)
+                streak += 1
+        if len(failed) < len(batch):
+            self.batches_flushed += 1
+        if failed:
+            self._record_failure(failed, error)
+
+    def _record_failure(self, batch: List[Dict[str, Any]], error: str):
+        self.rows_failed += len(batch)
+        self.last_error = error
+        logger.error(f"❌ {self.name} flush of {len(batch)} rows failed: {error}")
+        if self.on_failure:
+            self.on_failure(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and flush latency"""
+        return {
+            "running": self.running,
+            "queue_depth": self.depth,
+            "max_queue": self.max_queue,
+            "rows_enqueued": self.rows_enqueued,
+            "rows_flushed": self.rows_flushed,
+            "rows_dropped": self.rows_dropped,
+            "rows_failed": self.rows_failed,
+            "batches_flushed": self.batches_flushed,
+            "batches_split": self.batches_split,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+            "avg_flush_ms": round(self.total_flush_ms / self.flush_attempts, 2) if self.flush_attempts else 0.0,
+            "rows_per_sec": round(self.rows_flushed / (self.total_flush_ms / 1000), 1) if self.total_flush_ms else 0.0,
+            "last_error": self.last_error,
+        }
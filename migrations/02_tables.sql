@@ -205,6 +205,7 @@ CREATE TABLE IF NOT EXISTS public.alert_log (
 -- Value opportunities
 CREATE TABLE IF NOT EXISTS public.value_opportunities (
     match_id TEXT PRIMARY KEY,
+    event_id TEXT,
     match_name TEXT NOT NULL,
     league_name TEXT,
     kickoff_time TIMESTAMPTZ,
@@ -225,6 +226,8 @@ CREATE TABLE IF NOT EXISTS public.value_opportunities (
     updated_at TIMESTAMPTZ DEFAULT now(),
     created_at TIMESTAMPTZ DEFAULT now()
 );
+-- Canonical cross-bookmaker event id (match_id is <event_id>_<soft_bookie>)
+ALTER TABLE public.value_opportunities ADD COLUMN IF NOT EXISTS event_id TEXT;
 
 -- Odds snapshots
 CREATE TABLE IF NOT EXISTS public.odds_snapshots (
@@ -242,6 +245,37 @@ CREATE TABLE IF NOT EXISTS public.odds_snapshots (
     scraped_at TIMESTAMPTZ DEFAULT now()
 );
 
+-- Per-market soft/sharp prices (every market beyond 1X2, one row per selection)
+CREATE TABLE IF NOT EXISTS public.value_opportunity_markets (
+    match_id TEXT NOT NULL,
+    event_id TEXT,
+    soft_bookie TEXT NOT NULL,
+    market TEXT NOT NULL,
+    selection TEXT NOT NULL,
+    match_name TEXT NOT NULL,
+    league_name TEXT,
+    kickoff_time TIMESTAMPTZ,
+    soft_odds NUMERIC NOT NULL,
+    sharp_odds NUMERIC,
+    edge_percent NUMERIC,
+    updated_at TIMESTAMPTZ DEFAULT now(),
+    created_at TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (match_id, soft_bookie, market, selection)
+);
+
+-- Bookmaker native event ids -> canonical cross-bookmaker event id
+CREATE TABLE IF NOT EXISTS public.event_aliases (
+    bookmaker TEXT NOT NULL,
+    native_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    home_team TEXT,
+    away_team TEXT,
+    league TEXT,
+    kickoff_time TIMESTAMPTZ,
+    created_at TIMESTAMPTZ DEFAULT now(),
+    PRIMARY KEY (bookmaker, native_id)
+);
+
 -- Scraper health
 CREATE TABLE IF NOT EXISTS public.scraper_health (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -60,6 +60,11 @@ CREATE INDEX IF NOT EXISTS idx_user_clv_top ON public.user_clv_daily(date, avg_c
 CREATE INDEX IF NOT EXISTS idx_value_opps_edge ON public.value_opportunities(best_edge_percent DESC) WHERE best_edge_percent >= 3.0;
 CREATE INDEX IF NOT EXISTS idx_value_opps_kickoff ON public.value_opportunities(kickoff_time);
 CREATE INDEX IF NOT EXISTS idx_value_opps_updated ON public.value_opportunities(updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_value_opps_event ON public.value_opportunities(event_id);
+CREATE INDEX IF NOT EXISTS idx_value_markets_edge ON public.value_opportunity_markets(edge_percent DESC) WHERE edge_percent >= 3.0;
+CREATE INDEX IF NOT EXISTS idx_value_markets_kickoff ON public.value_opportunity_markets(kickoff_time);
+CREATE INDEX IF NOT EXISTS idx_event_aliases_event ON public.event_aliases(event_id);
+CREATE INDEX IF NOT EXISTS idx_event_aliases_kickoff ON public.event_aliases(kickoff_time);
 
 -- Verify indexes created
 SELECT indexname FROM pg_indexes WHERE schemaname = 'public' ORDER BY indexname;
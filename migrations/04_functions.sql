@@ -437,5 +437,180 @@ BEGIN
 END;
 $$;
 
+-- Lenient casts for batch upserts: a malformed value becomes NULL instead of failing the whole batch
+CREATE OR REPLACE FUNCTION public.try_timestamptz(p_value text)
+RETURNS timestamptz
+LANGUAGE plpgsql
+STABLE
+SET search_path TO 'public'
+AS $$
+BEGIN
+  RETURN NULLIF(p_value, '')::timestamptz;
+EXCEPTION WHEN OTHERS THEN
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.try_numeric(p_value text)
+RETURNS numeric
+LANGUAGE plpgsql
+IMMUTABLE
+SET search_path TO 'public'
+AS $$
+BEGIN
+  RETURN NULLIF(p_value, '')::numeric;
+EXCEPTION WHEN OTHERS THEN
+  RETURN NULL;
+END;
+$$;
+
+-- Batch upsert value bets function (set-based counterpart of upsert_value_bet)
+-- p_rows is a JSON array of objects keyed like upsert_value_bet's parameters
+CREATE OR REPLACE FUNCTION public.upsert_value_bets(p_rows jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    WITH incoming AS (
+        -- Last row wins when a batch carries the same match twice
+        SELECT DISTINCT ON (e.item->>'p_match_id')
+            e.item->>'p_match_id' AS match_id,
+            e.item->>'p_event_id' AS event_id,
+            e.item->>'p_match_name' AS match_name,
+            e.item->>'p_league' AS league,
+            public.try_timestamptz(e.item->>'p_kickoff') AS kickoff,
+            public.try_numeric(e.item->>'p_sharp_odds_home') AS sharp_home,
+            public.try_numeric(e.item->>'p_sharp_odds_draw') AS sharp_draw,
+            public.try_numeric(e.item->>'p_sharp_odds_away') AS sharp_away,
+            e.item->>'p_soft_bookie' AS soft_bookie,
+            public.try_numeric(e.item->>'p_soft_odds_home') AS soft_home,
+            public.try_numeric(e.item->>'p_soft_odds_draw') AS soft_draw,
+            public.try_numeric(e.item->>'p_soft_odds_away') AS soft_away
+        FROM jsonb_array_elements(p_rows) WITH ORDINALITY AS e(item, ord)
+        WHERE e.item->>'p_match_id' IS NOT NULL
+        ORDER BY e.item->>'p_match_id', e.ord DESC
+    ),
+    edges AS (
+        SELECT
+            i.*,
+            CASE WHEN i.sharp_home > 0 AND i.soft_home IS NOT NULL
+                 THEN ((i.soft_home / i.sharp_home - 1.0) * 100) END AS edge_home,
+            CASE WHEN i.sharp_draw > 0 AND i.soft_draw IS NOT NULL
+                 THEN ((i.soft_draw / i.sharp_draw - 1.0) * 100) END AS edge_draw,
+            CASE WHEN i.sharp_away > 0 AND i.soft_away IS NOT NULL
+                 THEN ((i.soft_away / i.sharp_away - 1.0) * 100) END AS edge_away
+        FROM incoming i
+    ),
+    best AS (
+        SELECT
+            e.*,
+            GREATEST(COALESCE(e.edge_home, 0), COALESCE(e.edge_draw, 0), COALESCE(e.edge_away, 0)) AS best_edge
+        FROM edges e
+    )
+    INSERT INTO public.value_opportunities (
+        match_id, event_id, match_name, league_name, kickoff_time,
+        sharp_odds_home, sharp_odds_draw, sharp_odds_away,
+        soft_bookie, soft_odds_home, soft_odds_draw, soft_odds_away,
+        edge_home_percent, edge_draw_percent, edge_away_percent,
+        best_edge_percent, best_edge_market,
+        updated_at
+    )
+    SELECT
+        b.match_id, b.event_id, b.match_name, b.league, b.kickoff,
+        b.sharp_home, b.sharp_draw, b.sharp_away,
+        b.soft_bookie, b.soft_home, b.soft_draw, b.soft_away,
+        b.edge_home, b.edge_draw, b.edge_away,
+        b.best_edge,
+        CASE
+            WHEN b.edge_home = b.best_edge THEN 'home'
+            WHEN b.edge_draw = b.best_edge THEN 'draw'
+            ELSE 'away'
+        END,
+        NOW()
+    FROM best b
+    ON CONFLICT (match_id) DO UPDATE SET
+        sharp_odds_home = EXCLUDED.sharp_odds_home,
+        sharp_odds_draw = EXCLUDED.sharp_odds_draw,
+        sharp_odds_away = EXCLUDED.sharp_odds_away,
+        soft_odds_home = EXCLUDED.soft_odds_home,
+        soft_odds_draw = EXCLUDED.soft_odds_draw,
+        soft_odds_away = EXCLUDED.soft_odds_away,
+        edge_home_percent = EXCLUDED.edge_home_percent,
+        edge_draw_percent = EXCLUDED.edge_draw_percent,
+        edge_away_percent = EXCLUDED.edge_away_percent,
+        best_edge_percent = EXCLUDED.best_edge_percent,
+        best_edge_market = EXCLUDED.best_edge_market,
+        kickoff_time = EXCLUDED.kickoff_time,
+        event_id = COALESCE(EXCLUDED.event_id, value_opportunities.event_id),
+        updated_at = NOW();
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$;
+
+-- Batch upsert per-market odds (multi-market counterpart of upsert_value_bets)
+-- p_rows is a JSON array of {p_match_id, p_event_id, p_match_name, p_league, p_kickoff, p_soft_bookie,
+-- p_market, p_selection, p_soft_odds, p_sharp_odds}; edge is computed when a sharp price exists
+CREATE OR REPLACE FUNCTION public.upsert_market_odds(p_rows jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    WITH incoming AS (
+        -- Last row wins when a batch carries the same selection twice
+        SELECT DISTINCT ON (
+            e.item->>'p_match_id', e.item->>'p_soft_bookie', e.item->>'p_market', e.item->>'p_selection'
+        )
+            e.item->>'p_match_id' AS match_id,
+            e.item->>'p_event_id' AS event_id,
+            e.item->>'p_match_name' AS match_name,
+            e.item->>'p_league' AS league,
+            public.try_timestamptz(e.item->>'p_kickoff') AS kickoff,
+            e.item->>'p_soft_bookie' AS soft_bookie,
+            e.item->>'p_market' AS market,
+            e.item->>'p_selection' AS selection,
+            public.try_numeric(e.item->>'p_soft_odds') AS soft_odds,
+            public.try_numeric(e.item->>'p_sharp_odds') AS sharp_odds
+        FROM jsonb_array_elements(p_rows) WITH ORDINALITY AS e(item, ord)
+        WHERE e.item->>'p_match_id' IS NOT NULL
+          AND e.item->>'p_soft_odds' IS NOT NULL
+        ORDER BY e.item->>'p_match_id', e.item->>'p_soft_bookie', e.item->>'p_market',
+                 e.item->>'p_selection', e.ord DESC
+    )
+    INSERT INTO public.value_opportunity_markets (
+        match_id, soft_bookie, market, selection,
+        event_id, match_name, league_name, kickoff_time,
+        soft_odds, sharp_odds, edge_percent,
+        updated_at
+    )
+    SELECT
+        i.match_id, i.soft_bookie, i.market, i.selection,
+        i.event_id, i.match_name, i.league, i.kickoff,
+        i.soft_odds, i.sharp_odds,
+        CASE WHEN i.sharp_odds IS NOT NULL AND i.sharp_odds > 0
+             THEN ((i.soft_odds / i.sharp_odds - 1.0) * 100) END,
+        NOW()
+    FROM incoming i
+    WHERE i.soft_odds IS NOT NULL
+    ON CONFLICT (match_id, soft_bookie, market, selection) DO UPDATE SET
+        soft_odds = EXCLUDED.soft_odds,
+        sharp_odds = EXCLUDED.sharp_odds,
+        edge_percent = EXCLUDED.edge_percent,
+        kickoff_time = EXCLUDED.kickoff_time,
+        event_id = COALESCE(EXCLUDED.event_id, value_opportunity_markets.event_id),
+        updated_at = NOW();
+
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$;
+
 -- Verify functions created
 SELECT proname FROM pg_proc WHERE pronamespace = 'public'::regnamespace ORDER BY proname;
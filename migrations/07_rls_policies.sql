@@ -19,6 +19,8 @@ ALTER TABLE public.bankrolls ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.user_clv_daily ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.alert_log ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.value_opportunities ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.value_opportunity_markets ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.event_aliases ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.odds_snapshots ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.scraper_health ENABLE ROW LEVEL SECURITY;
 ALTER TABLE public.proxy_pool ENABLE ROW LEVEL SECURITY;
@@ -133,6 +135,24 @@ DROP POLICY IF EXISTS "Allow service upsert" ON public.value_opportunities;
 CREATE POLICY "Allow service upsert" ON public.value_opportunities
   FOR ALL USING (auth.role() = 'service_role');
 
+-- Per-market opportunities policies
+DROP POLICY IF EXISTS "Public view market opportunities" ON public.value_opportunity_markets;
+CREATE POLICY "Public view market opportunities" ON public.value_opportunity_markets
+  FOR SELECT USING (true);
+
+DROP POLICY IF EXISTS "Allow service market upsert" ON public.value_opportunity_markets;
+CREATE POLICY "Allow service market upsert" ON public.value_opportunity_markets
+  FOR ALL USING (auth.role() = 'service_role');
+
+-- Event alias policies
+DROP POLICY IF EXISTS "Public view event aliases" ON public.event_aliases;
+CREATE POLICY "Public view event aliases" ON public.event_aliases
+  FOR SELECT USING (true);
+
+DROP POLICY IF EXISTS "Allow service alias upsert" ON public.event_aliases;
+CREATE POLICY "Allow service alias upsert" ON public.event_aliases
+  FOR ALL USING (auth.role() = 'service_role');
+
 -- Odds snapshots policies
 DROP POLICY IF EXISTS "Authenticated users can read odds snapshots" ON public.odds_snapshots;
 CREATE POLICY "Authenticated users can read odds snapshots" ON public.odds_snapshots